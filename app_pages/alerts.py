@@ -0,0 +1,68 @@
+import streamlit as st
+from datetime import datetime
+
+from utils.alert_store import get_alert_id
+from utils.alerts import generate_alerts, get_unseen_alerts_count, mark_alert_as_seen, mark_all_alerts_as_seen
+from utils.app_cache import get_profile
+
+# Resolved and checked by the shell (Dashboard.py)
+user_id = st.session_state.active_user_id
+
+st.session_state.show_notifications = False
+st.title("Alerts & Notifications")
+
+profile = get_profile(user_id)
+if profile:
+    alerts = generate_alerts(profile, user_id)
+
+    if alerts:
+        unseen_count = get_unseen_alerts_count(user_id)
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.metric("Unseen Alerts", unseen_count)
+        with col2:
+            if st.button("Mark All as Read"):
+                mark_all_alerts_as_seen(user_id)
+                st.success("All alerts marked as read!")
+                st.rerun()
+
+        st.markdown("---")
+
+        alerts_sorted = sorted(alerts, key=lambda x: (
+            0 if x.get('type') == 'error' else 1 if x.get('type') == 'warning' else 2,
+            x.get('timestamp', '')
+        ), reverse=True)
+
+        for idx, alert in enumerate(alerts_sorted):
+            alert_type = alert.get('type', 'info')
+            is_seen = alert.get('seen', False)
+            message = alert.get('message', '')
+            timestamp = alert.get('timestamp', '')
+
+            if timestamp:
+                try:
+                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                    time_str = dt.strftime('%Y-%m-%d %H:%M')
+                except:
+                    time_str = timestamp
+            else:
+                time_str = ""
+
+            col1, col2 = st.columns([10, 1])
+            with col1:
+                if alert_type == 'warning':
+                    st.warning(f"⚠️ {message} {f'({time_str})' if time_str else ''}")
+                elif alert_type == 'error':
+                    st.error(f"❌ {message} {f'({time_str})' if time_str else ''}")
+                else:
+                    st.info(f"ℹ️ {message} {f'({time_str})' if time_str else ''}")
+
+            with col2:
+                alert_id = get_alert_id(alert)
+                if not is_seen and st.button("✓", key=f"mark_seen_{alert_id}"):
+                    mark_alert_as_seen(alert_id, user_id)
+                    st.rerun()
+    else:
+        st.success("✅ No active alerts. Your financial health looks good!")
+else:
+    st.warning("⚠️ Please set up your profile first to see alerts")
@@ -0,0 +1,47 @@
+import streamlit as st
+
+from utils.app_cache import credit_health, get_profile
+
+# Resolved and checked by the shell (Dashboard.py)
+user_id = st.session_state.active_user_id
+
+st.title("Credit Health Analysis")
+st.markdown("AI-powered credit health assessment")
+
+profile = get_profile(user_id)
+if profile:
+    try:
+        eligibility, risk_category = credit_health(user_id, profile)
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.metric("Loan Eligibility Probability", f"{eligibility:.1f}%")
+            if eligibility >= 70:
+                st.success("✅ High eligibility")
+            elif eligibility >= 40:
+                st.warning("⚠️ Moderate eligibility")
+            else:
+                st.error("❌ Low eligibility")
+
+        with col2:
+            st.metric("Risk Category", risk_category)
+            if risk_category == "Low":
+                st.success("✅ Low risk profile")
+            elif risk_category == "Medium":
+                st.warning("⚠️ Medium risk profile")
+            else:
+                st.error("❌ High risk profile")
+
+        st.markdown("---")
+        st.subheader("Recommendations")
+        if eligibility < 40:
+            st.info("💡 Consider improving your credit score and reducing existing debt")
+        elif risk_category == "High":
+            st.info("💡 Focus on reducing credit utilization and paying bills on time")
+        else:
+            st.success("💡 Your credit health looks good! Maintain good financial habits.")
+    except Exception as e:
+        st.error(f"Error in credit health analysis: {e}")
+else:
+    st.warning("⚠️ Please set up your profile first")
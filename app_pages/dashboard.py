@@ -0,0 +1,157 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+
+from utils.app_cache import get_profile, loans_table, score_history
+
+# Resolved and checked by the shell (Dashboard.py)
+user_id = st.session_state.active_user_id
+
+st.title("Financial Dashboard")
+st.markdown("Welcome to your financial command center")
+
+profile = get_profile(user_id)
+if profile:
+    st.session_state.user_profile = profile
+
+    # Key Metrics
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        credit_score = profile.get('credit_score', 0)
+        st.metric("Credit Score", f"{credit_score}", delta=None)
+
+    with col2:
+        monthly_income = profile.get('monthly_income', 0)
+        monthly_expense = profile.get('monthly_expense', 0)
+        total_emi = sum([loan.get('emi', 0) for loan in profile.get('current_loans', [])])
+        monthly_savings = monthly_income - monthly_expense - total_emi
+        st.metric("Monthly Savings", f"₹{monthly_savings:,}", delta=None)
+
+    with col3:
+        st.metric("Total EMI", f"₹{total_emi:,}", delta=None)
+
+    with col4:
+        credit_utilization = profile.get('credit_utilization', 0)
+        st.metric("Credit Utilization", f"{credit_utilization}%", delta=None)
+
+    st.markdown("---")
+
+    # Visualizations
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Income vs Expenses")
+        income_expense_data = pd.DataFrame({
+            'Category': ['Income', 'Expenses', 'EMI', 'Savings'],
+            'Amount': [monthly_income, monthly_expense, total_emi, monthly_savings]
+        })
+        st.bar_chart(income_expense_data.set_index('Category'))
+
+    with col2:
+        st.subheader("Expense Breakdown")
+        if monthly_expense > 0:
+            expense_categories = {
+                'Food & Groceries': monthly_expense * 0.3,
+                'Transportation': monthly_expense * 0.2,
+                'Utilities': monthly_expense * 0.15,
+                'Entertainment': monthly_expense * 0.1,
+                'Shopping': monthly_expense * 0.15,
+                'Others': monthly_expense * 0.1
+            }
+            expense_df = pd.DataFrame({
+                'Category': list(expense_categories.keys()),
+                'Amount': list(expense_categories.values())
+            })
+            st.bar_chart(expense_df.set_index('Category'))
+
+    st.markdown("---")
+
+    # Credit Score Trend
+    st.subheader("Credit Score Trend")
+    history = score_history(user_id)
+    if history is not None:
+        st.line_chart(history['chart']['Credit Score'])
+    else:
+        current_date = datetime.now().strftime('%Y-%m-%d')
+        score_df = pd.DataFrame({
+            'date': [current_date],
+            'credit_score': [credit_score]
+        })
+        score_df['date'] = pd.to_datetime(score_df['date'], errors='coerce')
+        st.line_chart(score_df.set_index('date')['credit_score'])
+        st.info("Start tracking your credit score history by updating your profile regularly.")
+
+    st.markdown("---")
+
+    # Current Loans Summary
+    st.subheader("Current Loans Summary")
+    current_loans = profile.get('current_loans', [])
+    if current_loans:
+        st.dataframe(loans_table(user_id, profile), use_container_width=True, hide_index=True)
+    else:
+        st.info("No active loans")
+
+    # Credit Card Utilization
+    st.markdown("---")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Credit Utilization")
+
+        utilization = credit_utilization
+        if utilization <= 30:
+            st.success(f"✅ Good utilization: {utilization}%")
+        elif utilization <= 60:
+            st.warning(f"⚠️ Moderate utilization: {utilization}%")
+        else:
+            st.error(f"❌ High utilization: {utilization}%")
+
+        util_data = pd.DataFrame({
+            'Status': ['Used', 'Available'],
+            'Percentage': [utilization, max(0, 100 - utilization)]
+        })
+        st.bar_chart(util_data.set_index('Status'))
+
+    with col2:
+        st.subheader("Financial Health Score")
+        health_score = 0
+        if credit_score >= 750:
+            health_score += 30
+        elif credit_score >= 650:
+            health_score += 20
+        elif credit_score >= 550:
+            health_score += 10
+
+        if credit_utilization <= 30:
+            health_score += 25
+        elif credit_utilization <= 60:
+            health_score += 15
+        else:
+            health_score += 5
+
+        if monthly_savings > 0:
+            savings_rate = (monthly_savings / monthly_income * 100) if monthly_income > 0 else 0
+            if savings_rate >= 20:
+                health_score += 25
+            elif savings_rate >= 10:
+                health_score += 15
+            else:
+                health_score += 10
+
+        debt_to_income = (total_emi / monthly_income * 100) if monthly_income > 0 else 0
+        if debt_to_income <= 30:
+            health_score += 20
+        elif debt_to_income <= 40:
+            health_score += 10
+        else:
+            health_score += 5
+
+        st.metric("Health Score", f"{health_score}/100")
+        if health_score >= 75:
+            st.success("Excellent financial health!")
+        elif health_score >= 60:
+            st.info("Good financial health")
+        else:
+            st.warning("Room for improvement")
+else:
+    st.warning("⚠️ Please set up your profile first in the Profile section")
@@ -0,0 +1,107 @@
+import streamlit as st
+import pandas as pd
+
+from utils.app_cache import debt_payoff, get_profile
+from utils.calculators import calculate_emi, check_affordability
+
+# Resolved and checked by the shell (Dashboard.py)
+user_id = st.session_state.active_user_id
+
+st.title("EMI Calculator & Tools")
+
+tab1, tab2, tab3 = st.tabs(["EMI Calculator", "Affordability Calculator", "Debt Payoff Planner"])
+
+with tab1:
+    st.subheader("Calculate Your EMI")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        principal = st.number_input("Loan Amount (₹)", min_value=0, value=100000, step=10000)
+        rate = st.number_input("Interest Rate (% per annum)", min_value=0.0, value=10.0, step=0.1)
+
+    with col2:
+        tenure_years = st.number_input("Loan Tenure (Years)", min_value=1, value=5, step=1)
+        tenure_months = tenure_years * 12
+
+    if st.button("Calculate EMI"):
+        emi, total_interest, total_amount = calculate_emi(principal, rate, tenure_months)
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Monthly EMI", f"₹{emi:,.2f}")
+        with col2:
+            st.metric("Total Interest", f"₹{total_interest:,.2f}")
+        with col3:
+            st.metric("Total Amount", f"₹{total_amount:,.2f}")
+
+with tab2:
+    st.subheader("Check Affordability")
+    profile = get_profile(user_id)
+
+    if profile:
+        new_loan_amount = st.number_input("New Loan Amount (₹)", min_value=0, value=50000, step=10000)
+        new_rate = st.number_input("Interest Rate (% per annum)", min_value=0.0, value=12.0, step=0.1)
+        new_tenure = st.number_input("Tenure (Years)", min_value=1, value=3, step=1)
+
+        if st.button("Check Affordability"):
+            emi, _, _ = calculate_emi(new_loan_amount, new_rate, new_tenure * 12)
+            is_affordable, available_income, affordability_pct = check_affordability(profile, emi)
+
+            monthly_income = profile.get('monthly_income', 0)
+            salary_used_amount = emi
+            salary_used_pct = (emi / monthly_income * 100) if monthly_income > 0 else 0
+
+            st.metric("New Loan EMI", f"₹{emi:,.2f}")
+            st.metric("Available Income", f"₹{available_income:,.2f}")
+            st.metric("Amount of Salary Used", f"₹{salary_used_amount:,.2f} ({salary_used_pct:.1f}%)")
+
+            if is_affordable:
+                st.success(f"✅ You can afford this loan! Uses {salary_used_pct:.1f}% of your monthly income.")
+            else:
+                st.error(f"❌ This loan may not be affordable. It exceeds your available income.")
+    else:
+        st.warning("⚠️ Please set up your profile first")
+
+with tab3:
+    st.subheader("Plan Your Debt Payoff")
+    profile = get_profile(user_id)
+
+    if profile and profile.get('current_loans'):
+        current_loans = profile.get('current_loans', [])
+        extra_payment = st.number_input("Extra Monthly Payment (₹)", min_value=0, value=5000, step=1000)
+        loan_labels = [f"Loan {i+1}: ₹{loan.get('amount', 0):,}" for i, loan in enumerate(current_loans)]
+        custom_order = st.multiselect("Custom payoff order (first = paid first)", range(len(loan_labels)),
+                                      format_func=lambda x: loan_labels[x])
+
+        if st.button("Compare Strategies"):
+            payoff = debt_payoff(user_id, profile, extra_payment, custom_order)
+            baseline = payoff['baseline']
+
+            comparison_data = []
+            for name, result in payoff['strategies'].items():
+                months = result['months_to_debt_free']
+                comparison_data.append({
+                    'Strategy': name.title(),
+                    'Payoff Order': " → ".join(f"Loan {i+1}" for i in result['order']),
+                    'Months to Debt-Free': months if months is not None else "Not within 50 years",
+                    'Total Interest': f"₹{result['total_interest']:,.2f}",
+                    'Interest Saved': f"₹{result['interest_saved']:,.2f}"
+                })
+
+            baseline_months = baseline['months_to_debt_free']
+            st.metric("Minimum Payments Only",
+                      f"{baseline_months} months" if baseline_months is not None else "Not within 50 years",
+                      delta=f"₹{baseline['total_interest']:,.2f} interest", delta_color="off")
+            st.dataframe(pd.DataFrame(comparison_data), use_container_width=True, hide_index=True)
+
+            st.subheader("Projected Debt-to-Income Ratio (%)")
+            dti_df = pd.DataFrame({name.title(): pd.Series(result['dti_path'])
+                                   for name, result in payoff['strategies'].items()})
+            dti_df['Minimum Payments'] = pd.Series(baseline['dti_path'])
+            dti_df.index = dti_df.index + 1
+            dti_df.index.name = 'Month'
+            st.line_chart(dti_df)
+    elif profile:
+        st.info("No current loans to plan a payoff for")
+    else:
+        st.warning("⚠️ Please set up your profile first")
@@ -0,0 +1,71 @@
+import streamlit as st
+import pandas as pd
+
+from utils.app_cache import get_loan_catalog, get_profile, loan_comparison, refinancing_plans
+
+# Resolved and checked by the shell (Dashboard.py)
+user_id = st.session_state.active_user_id
+
+st.title("Loan Comparison")
+st.markdown("Compare loan options from different banks")
+
+try:
+    loans = get_loan_catalog()
+    if not loans:
+        raise FileNotFoundError
+
+    # Filters
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        loan_type_filter = st.selectbox("Loan Type", ["All"] + sorted(set(loan['type'] for loan in loans)))
+    with col2:
+        loan_amount = st.number_input("Loan Amount (₹)", min_value=0, value=500000, step=50000)
+    with col3:
+        tenure_years = st.number_input("Tenure (Years)", min_value=1, value=5, step=1)
+
+    df = loan_comparison(loan_type_filter, loan_amount, tenure_years)
+    if df is not None:
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    else:
+        st.info("No loans match your criteria")
+
+    # Refinancing & Consolidation
+    profile = get_profile(user_id)
+    if profile and profile.get('current_loans'):
+        st.markdown("---")
+        st.subheader("Refinancing & Consolidation")
+        st.markdown("See whether moving your current loans to one of these offers would help")
+
+        if st.button("Find Refinancing Plans"):
+            plans = refinancing_plans(user_id, profile)
+
+            def plans_table(plan_list):
+                return pd.DataFrame([{
+                    'Bank': plan['bank'],
+                    'Loan Type': plan['type'],
+                    'Interest Rate': f"{plan['interest_rate']}%",
+                    'Tenure (Years)': plan['tenure_years'],
+                    'Loans': ", ".join(f"Loan {i+1}" for i in plan['loan_indices']),
+                    'Processing Fee': f"₹{plan['processing_fee']:,.2f}",
+                    'New EMI': f"₹{plan['new_emi']:,.2f}",
+                    'Monthly Relief': f"₹{plan['monthly_relief']:,.2f}",
+                    'Net Savings': f"₹{plan['net_savings']:,.2f}"
+                } for plan in plan_list])
+
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("**Best Net Savings**")
+                if plans['by_savings']:
+                    st.dataframe(plans_table(plans['by_savings']), use_container_width=True, hide_index=True)
+                else:
+                    st.info("No refinancing plan would reduce your total repayments")
+            with col2:
+                st.write("**Best Monthly Cash-Flow Relief**")
+                if plans['by_relief']:
+                    st.dataframe(plans_table(plans['by_relief']), use_container_width=True, hide_index=True)
+                else:
+                    st.info("No plan lowers your EMIs without costing more overall")
+except FileNotFoundError:
+    st.error("Loan options file not found. Please ensure data/loan_options.json exists.")
+except Exception as e:
+    st.error(f"Error loading loan data: {e}")
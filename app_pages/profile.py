@@ -0,0 +1,225 @@
+import streamlit as st
+from datetime import datetime
+
+from utils.annual_report import year_score_points
+from utils.app_cache import get_profile
+from utils.data_handler import load_score_series, update_user_profile
+from utils.debt_planner import DEFAULT_LOAN_RATE
+from utils.report_jobs import get_report_job, get_report_pdf, submit_annual_report, submit_report
+
+# Resolved and checked by the shell (Dashboard.py)
+user_id = st.session_state.active_user_id
+
+st.session_state.show_notifications = False
+st.title("User Profile")
+st.markdown("Manage your financial information")
+
+if 'profile_loaded' not in st.session_state or st.session_state.get('reload_profile', False):
+    profile = get_profile(user_id)
+    st.session_state.user_profile = profile
+    st.session_state.profile_loaded = True
+    st.session_state.reload_profile = False
+else:
+    profile = st.session_state.user_profile
+
+if profile is None:
+    profile = {}
+
+if profile.get('birthdate'):
+    try:
+        birthdate_value = datetime.strptime(profile.get('birthdate'), '%Y-%m-%d').date()
+    except:
+        birthdate_value = datetime(2000, 1, 1).date()
+else:
+    birthdate_value = datetime(2000, 1, 1).date()
+
+# What the form shows before any edit, in the shape it saves; a save writes
+# only the fields that differ from this, so changes another session made to
+# the other fields since this profile was loaded are kept
+shown_card_count = profile.get('num_credit_cards', 1) if profile else 1
+shown_card_due_days = profile.get('card_due_days') or []
+shown = {
+    "name": profile.get('name', '') if profile else '',
+    "birthdate": birthdate_value.strftime('%Y-%m-%d'),
+    "monthly_income": profile.get('monthly_income', 0) if profile else 50000,
+    "monthly_expense": profile.get('monthly_expense', 0) if profile else 30000,
+    "credit_score": profile.get('credit_score', 650) if profile else 650,
+    "credit_utilization": profile.get('credit_utilization', 30) if profile else 30,
+    "num_credit_cards": shown_card_count,
+    "card_due_days": [int((shown_card_due_days[i] if i < len(shown_card_due_days) else None) or 0) or None
+                      for i in range(int(shown_card_count))],
+    "current_loans": [{
+        "amount": int(loan.get('amount', 0)),
+        "emi": int(loan.get('emi', 0)),
+        "remaining_tenure": int(loan.get('remaining_tenure', 0)),
+        "interest_rate": float(loan.get('interest_rate', DEFAULT_LOAN_RATE)),
+        "due_day": int(loan.get('due_day') or 0) or None
+    } for loan in profile.get('current_loans', [])],
+}
+
+with st.form("profile_form"):
+    st.subheader("Personal Information")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        name = st.text_input("Full Name", value=shown['name'], key="name_input")
+    with col2:
+        birthdate = st.date_input("Date of Birth", value=birthdate_value, key="birthdate_input")
+
+    st.subheader("Financial Information")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        monthly_income = st.number_input("Monthly Income (₹)", min_value=0, value=shown['monthly_income'], step=1000)
+        monthly_expense = st.number_input("Monthly Expenses (₹)", min_value=0, value=shown['monthly_expense'], step=1000)
+        credit_score = st.number_input("Current Credit Score", min_value=300, max_value=900, value=shown['credit_score'], step=1)
+
+    with col2:
+        credit_utilization = st.number_input("Credit Utilization (%)", min_value=0, max_value=100, value=shown['credit_utilization'], step=1)
+        num_credit_cards = st.number_input("Number of Credit Cards", min_value=0, value=shown['num_credit_cards'], step=1)
+
+    card_due_days = []
+    existing_card_due_days = (profile.get('card_due_days') or []) if profile else []
+    if num_credit_cards > 0:
+        with st.expander("Credit Card Bill Due Days"):
+            st.caption("Day of the month each bill is due (0 = no reminder)")
+            card_cols = st.columns(min(int(num_credit_cards), 4))
+            for i in range(int(num_credit_cards)):
+                existing_day = existing_card_due_days[i] if i < len(existing_card_due_days) else None
+                with card_cols[i % len(card_cols)]:
+                    card_due_day = st.number_input(f"Card {i+1}", min_value=0, max_value=31,
+                                                   value=int(existing_day or 0), step=1, key=f"card_due_{i}")
+                card_due_days.append(int(card_due_day) or None)
+
+    st.subheader("Current Loans")
+    num_loans = st.number_input("Number of Current Loans", min_value=0, value=len(profile.get('current_loans', [])) if profile else 0, step=1)
+
+    current_loans = []
+    existing_loans = profile.get('current_loans', []) if profile else []
+
+    for i in range(num_loans):
+        existing_loan = existing_loans[i] if i < len(existing_loans) else {}
+
+        with st.expander(f"Loan {i+1}"):
+            col1, col2, col3, col4, col5 = st.columns(5)
+            with col1:
+                loan_amount = st.number_input(f"Loan Amount (₹)", min_value=0, 
+                                              value=existing_loan.get('amount', 0), 
+                                              step=10000, key=f"loan_amt_{i}")
+            with col2:
+                loan_emi = st.number_input(f"Monthly EMI (₹)", min_value=0, 
+                                          value=existing_loan.get('emi', 0), 
+                                          step=100, key=f"loan_emi_{i}")
+            with col3:
+                loan_remaining = st.number_input(f"Remaining Tenure (Months)", min_value=0, 
+                                                 value=existing_loan.get('remaining_tenure', 0), 
+                                                 step=1, key=f"loan_tenure_{i}")
+            with col4:
+                loan_rate = st.number_input(f"Interest Rate (%)", min_value=0.0, 
+                                            value=float(existing_loan.get('interest_rate', DEFAULT_LOAN_RATE)), 
+                                            step=0.1, key=f"loan_rate_{i}")
+            with col5:
+                loan_due_day = st.number_input(f"EMI Due Day (0 = none)", min_value=0, max_value=31, 
+                                               value=int(existing_loan.get('due_day') or 0), 
+                                               step=1, key=f"loan_due_{i}")
+            current_loans.append({
+                "amount": int(loan_amount),
+                "emi": int(loan_emi),
+                "remaining_tenure": int(loan_remaining),
+                "interest_rate": float(loan_rate),
+                "due_day": int(loan_due_day) or None
+            })
+
+    submitted = st.form_submit_button("Save Profile")
+
+    if submitted:
+        old_score = profile.get('credit_score', 0) if profile else 0
+        score_changed = (credit_score != old_score) if profile else True
+
+        new_profile = {
+            "name": name.strip() if name else "",
+            "birthdate": birthdate.strftime('%Y-%m-%d') if birthdate else None,
+            "monthly_income": int(monthly_income),
+            "monthly_expense": int(monthly_expense),
+            "credit_score": int(credit_score),
+            "credit_utilization": int(credit_utilization),
+            "num_credit_cards": int(num_credit_cards),
+            "card_due_days": card_due_days,
+            "current_loans": current_loans,
+            "last_updated": datetime.now().isoformat()
+        }
+
+        if profile:
+            changes = {key: value for key, value in new_profile.items() if shown.get(key) != value}
+            changes["last_updated"] = new_profile["last_updated"]
+        else:
+            changes = new_profile
+
+        try:
+            if update_user_profile(lambda current: {**current, **changes}, user_id) is not None:
+                import time
+                time.sleep(0.2)
+
+                saved_profile = get_profile(user_id)
+                if saved_profile:
+                    st.session_state.user_profile = saved_profile
+                    st.session_state.profile_loaded = True
+
+                    if score_changed:
+                        from utils.data_handler import add_credit_history_entry
+                        add_credit_history_entry(credit_score, f"Profile updated - Score: {credit_score}", user_id=user_id)
+
+                    st.success("✅ Profile saved successfully!")
+                    st.session_state.reload_profile = True
+                    st.rerun()
+                else:
+                    st.error("❌ Error: Profile was not saved correctly. Please try again.")
+            else:
+                st.error("❌ Error saving profile. Please check file permissions and try again.")
+        except Exception as e:
+            st.error(f"❌ Error saving profile: {str(e)}")
+            st.exception(e)
+
+current_profile_check = get_profile(user_id)
+if current_profile_check:
+    st.markdown("---")
+    with st.expander("📋 View Saved Profile Data (Verification)"):
+        st.json(current_profile_check)
+        st.caption("This shows the data currently saved in your profile file.")
+
+# PDF Export (rendered in the background; this page polls the job)
+if current_profile_check:
+    st.markdown("---")
+    report_col1, report_col2 = st.columns(2)
+    with report_col1:
+        monthly_clicked = st.button("📄 Generate Monthly Report PDF")
+    with report_col2:
+        annual_clicked = st.button("📊 Generate Annual Report PDF")
+    if monthly_clicked or annual_clicked:
+        if annual_clicked:
+            score_points = year_score_points(load_score_series(user_id))
+            job_id = submit_annual_report(current_profile_check, score_points, user_id)
+        else:
+            job_id = submit_report(current_profile_check, user_id)
+        if job_id:
+            st.session_state.report_job_id = job_id
+        else:
+            st.warning("⏳ Many reports are being generated right now. Please try again in a moment.")
+
+    report_job = get_report_job(st.session_state.get('report_job_id')) if st.session_state.get('report_job_id') else None
+    if report_job and report_job['status'] in ('queued', 'running'):
+        st.info("⏳ Your report is being generated..." if report_job['status'] == 'running' else "⏳ Your report is queued...")
+        st.button("🔄 Check Report Status", key="report_status_btn")
+    elif report_job and report_job['status'] == 'done':
+        pdf_bytes = get_report_pdf(report_job['id'])
+        if pdf_bytes:
+            st.download_button(
+                label="Download PDF Report",
+                data=pdf_bytes,
+                file_name=report_job['filename'],
+                mime="application/pdf"
+            )
+        else:
+            st.warning("This report is no longer available. Please generate it again.")
+    elif report_job and report_job['status'] == 'failed':
+        st.error(f"Error generating PDF: {report_job['error']}")
@@ -0,0 +1,210 @@
+import streamlit as st
+import numpy as np
+from datetime import timedelta
+
+from utils.app_cache import credit_health, get_profile, score_history
+from utils.data_handler import load_credit_history, save_credit_history
+
+
+def initialize_mock_credit_history(user_id=None):
+    """Initialize mock credit history if empty or has very few entries"""
+    history = load_credit_history(user_id)
+    if len(history) <= 1:
+        mock_data = [
+            {
+                "date": "2025-07-15T10:00:00",
+                "credit_score": 580,
+                "notes": "Initial credit assessment"
+            },
+            {
+                "date": "2025-08-15T10:00:00",
+                "credit_score": 595,
+                "notes": "Improved payment history"
+            },
+            {
+                "date": "2025-09-15T10:00:00",
+                "credit_score": 610,
+                "notes": "Reduced credit utilization"
+            },
+            {
+                "date": "2025-10-15T10:00:00",
+                "credit_score": 625,
+                "notes": "Consistent bill payments"
+            },
+            {
+                "date": "2025-11-15T10:00:00",
+                "credit_score": 640,
+                "notes": "Paid off credit card debt"
+            },
+            {
+                "date": "2025-12-15T10:00:00",
+                "credit_score": 655,
+                "notes": "Maintained good credit habits"
+            },
+            {
+                "date": "2026-01-10T10:00:00",
+                "credit_score": 650,
+                "notes": "Took new loan - slight impact"
+            }
+        ]
+        if history:
+            existing_entry = history[0]
+            mock_data.append(existing_entry)
+        save_credit_history(mock_data, user_id)
+        return True
+    return False
+
+
+# Resolved and checked by the shell (Dashboard.py)
+user_id = st.session_state.active_user_id
+
+st.title("Credit Score History")
+st.markdown("Analyze your credit score trends and past decisions with AI-powered insights")
+
+initialize_mock_credit_history(user_id)
+
+history = score_history(user_id)
+profile = get_profile(user_id)
+
+if history is not None:
+    stats = history['stats']
+
+    st.subheader("Credit Score Trend Over Time")
+    first_date = history['first_date']
+    last_date = history['last_date']
+    date_range = st.date_input("Date Range", value=(first_date, last_date),
+                               min_value=first_date, max_value=last_date, key="history_date_range")
+    start, end = None, None
+    if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+        start = int(np.datetime64(date_range[0], 'us').astype(np.int64))
+        end = int(np.datetime64(date_range[1] + timedelta(days=1), 'us').astype(np.int64))
+
+    # Downsampled with each bucket's high and low, plus the rolling average
+    st.line_chart(score_history(user_id, start, end)['chart'] if start is not None else history['chart'])
+
+    # Statistical Analysis
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Current Score", f"{stats['last']:.0f}")
+    with col2:
+        st.metric("Average Score", f"{stats['mean']:.0f}")
+    with col3:
+        st.metric("Highest Score", f"{stats['max']:.0f}")
+    with col4:
+        st.metric("Lowest Score", f"{stats['min']:.0f}")
+
+    st.markdown("---")
+
+    st.subheader("AI-Powered Pattern Analysis")
+
+    if history['count'] > 1:
+        recent_trend = stats['last'] - stats['first']
+        recent_change = history['last_scores'][-1] - history['last_scores'][-2]
+
+        score_std = stats['std']
+        volatility_level = "Low" if score_std < 20 else "Medium" if score_std < 40 else "High"
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.write("**Overall Trend**")
+            if recent_trend > 20:
+                st.success(f"✅ Excellent improvement: +{recent_trend:.0f} points")
+            elif recent_trend > 0:
+                st.success(f"✅ Positive trend: +{recent_trend:.0f} points")
+            elif recent_trend < -20:
+                st.error(f"❌ Significant decline: {recent_trend:.0f} points")
+            elif recent_trend < 0:
+                st.warning(f"⚠️ Declining trend: {recent_trend:.0f} points")
+            else:
+                st.info("📊 Stable performance")
+
+        with col2:
+            st.write("**Score Volatility**")
+            st.metric("Volatility Level", volatility_level)
+            if volatility_level == "Low":
+                st.success("✅ Consistent credit behavior")
+            elif volatility_level == "Medium":
+                st.warning("⚠️ Some fluctuations detected")
+            else:
+                st.error("❌ High volatility - review financial habits")
+
+    st.markdown("---")
+    st.subheader("Reality Check: What Could Have Been")
+
+    if profile:
+        current_score = profile.get('credit_score', 0)
+
+        try:
+            ideal_profile = profile.copy()
+            ideal_profile['credit_utilization'] = min(30, ideal_profile.get('credit_utilization', 0))
+            ideal_profile['credit_score'] = min(900, current_score + 50)
+
+            ideal_eligibility, ideal_risk = credit_health(user_id, ideal_profile)
+            current_eligibility, current_risk = credit_health(user_id, profile)
+
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.write("**Current Situation**")
+                st.metric("Credit Score", f"{current_score}")
+                st.metric("Loan Eligibility", f"{current_eligibility:.1f}%")
+                st.metric("Risk Category", current_risk)
+
+            with col2:
+                st.write("**If You Made Better Decisions**")
+                st.metric("Potential Score", f"{ideal_profile['credit_score']:.0f}", delta=f"+{ideal_profile['credit_score'] - current_score:.0f}")
+                st.metric("Potential Eligibility", f"{ideal_eligibility:.1f}%", delta=f"+{ideal_eligibility - current_eligibility:.1f}%")
+                st.metric("Potential Risk", ideal_risk)
+
+            st.markdown("---")
+            st.subheader("💡 Key Insights & Recommendations")
+
+            insights = []
+            if current_score < stats['mean']:
+                insights.append("• Your current score is below your historical average. Focus on consistent bill payments.")
+
+            if profile.get('credit_utilization', 0) > 30:
+                insights.append(f"• Reducing credit utilization from {profile.get('credit_utilization', 0)}% to below 30% could improve your score significantly.")
+
+            if ideal_eligibility > current_eligibility:
+                insights.append(f"• Making better financial decisions could increase your loan eligibility by {ideal_eligibility - current_eligibility:.1f}%.")
+
+            if ideal_risk != current_risk and ideal_risk == "Low":
+                insights.append("• With better credit habits, you could achieve a Low risk profile.")
+
+            if not insights:
+                insights.append("• You're on the right track! Maintain your good financial habits.")
+
+            for insight in insights:
+                st.info(insight)
+
+        except Exception as e:
+            st.warning(f"Could not generate AI insights: {e}")
+
+    st.markdown("---")
+    st.subheader("Historical Decision Impact")
+
+    if history['count'] > 2:
+        changes = history['changes']
+        positive_changes = changes[changes > 0]
+        negative_changes = changes[changes < 0]
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if len(positive_changes) > 0:
+                avg_positive = positive_changes.mean()
+                st.success(f"✅ Average improvement when making good decisions: +{avg_positive:.1f} points")
+        with col2:
+            if len(negative_changes) > 0:
+                avg_negative = negative_changes.mean()
+                st.error(f"❌ Average decline from poor decisions: {avg_negative:.1f} points")
+else:
+    st.info("No credit history available. Start using the platform to build your history!")
+
+    if profile:
+        st.markdown("---")
+        st.subheader("Start Tracking Your Credit Journey")
+        st.write("Update your profile regularly to see how your financial decisions impact your credit score over time.")
+        current_score = profile.get('credit_score', 0)
+        st.metric("Current Credit Score", f"{current_score}")
@@ -0,0 +1,84 @@
+import streamlit as st
+import pandas as pd
+
+from utils.app_cache import get_profile, what_if
+
+# Resolved and checked by the shell (Dashboard.py)
+user_id = st.session_state.active_user_id
+
+st.title("What-If Simulator")
+st.markdown("See how financial decisions affect your credit health")
+
+profile = get_profile(user_id)
+if profile:
+    st.subheader("Current Status")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Current Credit Score", profile.get('credit_score', 0))
+    with col2:
+        st.metric("Monthly Income", f"₹{profile.get('monthly_income', 0):,}")
+    with col3:
+        st.metric("Monthly Expenses", f"₹{profile.get('monthly_expense', 0):,}")
+
+    st.markdown("---")
+    st.subheader("Simulate Scenario")
+
+    scenario_type = st.selectbox("What would you like to simulate?", 
+                                 ["Take a new loan", "Increase expenses", "Increase income", "Pay off a loan"])
+
+    if scenario_type == "Take a new loan":
+        new_loan_amt = st.number_input("New Loan Amount (₹)", min_value=0, value=100000)
+        new_loan_rate = st.number_input("Interest Rate (%)", min_value=0.0, value=12.0)
+        new_loan_tenure = st.number_input("Tenure (Years)", min_value=1, value=3)
+
+    elif scenario_type == "Increase expenses":
+        expense_increase = st.number_input("Additional Monthly Expenses (₹)", min_value=0, value=5000)
+
+    elif scenario_type == "Increase income":
+        income_increase = st.number_input("Additional Monthly Income (₹)", min_value=0, value=10000)
+
+    elif scenario_type == "Pay off a loan":
+        if profile.get('current_loans'):
+            loan_options = [f"Loan {i+1}: ₹{loan.get('amount', 0):,}" for i, loan in enumerate(profile.get('current_loans', []))]
+            selected_loan_idx = st.selectbox("Select loan to pay off", range(len(loan_options)), format_func=lambda x: loan_options[x])
+        else:
+            st.info("No current loans to pay off")
+            selected_loan_idx = None
+
+    if st.button("Simulate Impact"):
+        try:
+            scenario = {"type": scenario_type}
+            if scenario_type == "Take a new loan":
+                scenario.update({"loan_amount": new_loan_amt, "rate": new_loan_rate, "tenure": new_loan_tenure})
+            elif scenario_type == "Increase expenses":
+                scenario.update({"expense_increase": expense_increase})
+            elif scenario_type == "Increase income":
+                scenario.update({"income_increase": income_increase})
+            elif scenario_type == "Pay off a loan" and selected_loan_idx is not None:
+                scenario.update({"loan_index": selected_loan_idx})
+
+            predicted_score, predicted_risk, predicted_eligibility = what_if(user_id, profile, scenario)
+
+            st.markdown("---")
+            st.subheader("Predicted Impact")
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                score_change = predicted_score - profile.get('credit_score', 0)
+                st.metric("Predicted Credit Score", f"{predicted_score:.0f}", delta=f"{score_change:+.0f}")
+            with col2:
+                st.metric("Predicted Risk Category", predicted_risk)
+            with col3:
+                st.metric("Predicted Eligibility", f"{predicted_eligibility:.1f}%")
+
+            comparison_df = pd.DataFrame({
+                'Metric': ['Credit Score', 'Risk Level', 'Eligibility %'],
+                'Before': [profile.get('credit_score', 0), 'Current', 0],
+                'After': [predicted_score, predicted_risk, predicted_eligibility]
+            })
+            st.bar_chart(comparison_df.set_index('Metric')[['Before', 'After']])
+
+        except Exception as e:
+            st.error(f"Error in simulation: {e}")
+else:
+    st.warning("⚠️ Please set up your profile first")
@@ -4,6 +4,8 @@ from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 import pickle
 import os
 
+from utils.records import UserProfile
+
 MODEL_DIR = "models"
 CREDIT_MODEL_PATH = os.path.join(MODEL_DIR, "credit_health_model.pkl")
 ELIGIBILITY_MODEL_PATH = os.path.join(MODEL_DIR, "eligibility_model.pkl")
@@ -148,33 +150,35 @@ def load_credit_model():
     
     return risk_model, eligibility_model
 
-def predict_credit_health(profile):
+def predict_credit_health(profile, models=None):
     """
     Predict credit health (eligibility probability and risk category)
     
     Args:
         profile: User profile dictionary
+        models: (risk_model, eligibility_model) already loaded (read from
+            disk on every call if not given)
     
     Returns:
         tuple: (eligibility_probability, risk_category)
     """
     # Load or train models
-    risk_model, eligibility_model = load_credit_model()
+    risk_model, eligibility_model = models or load_credit_model()
     
     if risk_model is None or eligibility_model is None:
         print("Models not found. Training new models...")
         risk_model, eligibility_model = train_models()
     
     # Extract features from profile
-    monthly_income = profile.get('monthly_income', 0)
-    monthly_expense = profile.get('monthly_expense', 0)
-    credit_score = profile.get('credit_score', 650)
-    credit_utilization = profile.get('credit_utilization', 0)
-    num_credit_cards = profile.get('num_credit_cards', 0)
+    profile = UserProfile.from_dict(profile)
+    monthly_income = profile.monthly_income
+    monthly_expense = profile.monthly_expense
+    credit_score = profile.credit_score
+    credit_utilization = profile.credit_utilization
+    num_credit_cards = profile.num_credit_cards
     
     # Calculate total EMI
-    current_loans = profile.get('current_loans', [])
-    total_emi = sum([loan.get('emi', 0) for loan in current_loans])
+    total_emi = profile.total_emi
     
     # Calculate derived features
     debt_to_income = (total_emi / monthly_income * 100) if monthly_income > 0 else 0
@@ -4,6 +4,8 @@ from sklearn.ensemble import RandomForestRegressor
 import pickle
 import os
 
+from utils.records import UserProfile
+
 MODEL_DIR = "models"
 WHATIF_MODEL_PATH = os.path.join(MODEL_DIR, "whatif_model.pkl")
 
@@ -165,31 +167,35 @@ def load_whatif_model():
             return pickle.load(f)
     return None
 
-def predict_what_if(profile, scenario):
+def predict_what_if(profile, scenario, model=None):
     """
     Predict financial impact of a scenario
     
     Args:
         profile: Current user profile
         scenario: Scenario dictionary with type and parameters
+        model: What-if model already loaded (read from disk on every call
+            if not given)
     
     Returns:
         tuple: (predicted_credit_score, predicted_risk_category, predicted_eligibility)
     """
     # Load or train model
-    model = load_whatif_model()
+    if model is None:
+        model = load_whatif_model()
     if model is None:
         print("What-if model not found. Training new model...")
         model = train_model()
     
     # Extract current state
-    monthly_income = profile.get('monthly_income', 0)
-    monthly_expense = profile.get('monthly_expense', 0)
-    credit_score = profile.get('credit_score', 650)
-    credit_utilization = profile.get('credit_utilization', 0)
-    num_credit_cards = profile.get('num_credit_cards', 0)
-    current_loans = profile.get('current_loans', [])
-    total_emi = sum([loan.get('emi', 0) for loan in current_loans])
+    profile = UserProfile.from_dict(profile)
+    monthly_income = profile.monthly_income
+    monthly_expense = profile.monthly_expense
+    credit_score = profile.credit_score
+    credit_utilization = profile.credit_utilization
+    num_credit_cards = profile.num_credit_cards
+    current_loans = profile.current_loans
+    total_emi = profile.total_emi
     
     # Calculate current derived features
     debt_to_income = (total_emi / monthly_income * 100) if monthly_income > 0 else 0
@@ -226,7 +232,7 @@ def predict_what_if(profile, scenario):
         loan_index = scenario.get('loan_index', 0)
         if 0 <= loan_index < len(current_loans):
             loan_to_remove = current_loans[loan_index]
-            new_total_emi = total_emi - loan_to_remove.get('emi', 0)
+            new_total_emi = total_emi - loan_to_remove.emi
             new_credit_utilization = max(0, credit_utilization - 10)
     
     # Calculate new derived features
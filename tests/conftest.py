@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+# Import the app's packages (utils, models) from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import data_handler  # noqa: E402
+from utils.data_handler import JSONStorage, set_storage  # noqa: E402
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def storage(request, tmp_path, monkeypatch):
+    """Each storage backend in turn, with every data file under tmp_path"""
+    monkeypatch.setattr(data_handler, "DATA_DIR", str(tmp_path))
+    if request.param == "sqlite":
+        from utils.sqlite_storage import SQLiteStorage
+        backend = SQLiteStorage(str(tmp_path / "credo.db"))
+    else:
+        backend = JSONStorage(str(tmp_path))
+    set_storage(backend)
+    yield backend
+    data_handler.flush_writes()
+    set_storage(None)
+    if request.param == "sqlite":
+        backend.close()
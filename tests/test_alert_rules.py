@@ -0,0 +1,134 @@
+import itertools
+
+import pytest
+
+from utils.alert_rules import DEFAULT_ALERT_RULES, AlertRules, profiles_to_frame
+from utils.records import DEFAULT_CREDIT_SCORE
+
+
+def baseline_alerts(profile):
+    """(type, message, priority) of each alert the original if/elif checks raised"""
+    alerts = []
+
+    credit_score = profile.get('credit_score', 0)
+    if credit_score < 600:
+        alerts.append(("error", f"Your credit score ({credit_score}) is below 600. Consider improving your credit health.", "high"))
+    elif credit_score < 700:
+        alerts.append(("warning", f"Your credit score ({credit_score}) is moderate. Work on improving it for better loan terms.", "medium"))
+
+    credit_utilization = profile.get('credit_utilization', 0)
+    if credit_utilization > 60:
+        alerts.append(("error", f"High credit utilization ({credit_utilization}%). Try to keep it below 30% for better credit health.", "high"))
+    elif credit_utilization > 30:
+        alerts.append(("warning", f"Credit utilization ({credit_utilization}%) is above recommended 30%. Consider reducing it.", "medium"))
+
+    monthly_income = profile.get('monthly_income', 0)
+    current_loans = profile.get('current_loans', [])
+    total_emi = sum([loan.get('emi', 0) for loan in current_loans])
+
+    if monthly_income > 0:
+        debt_to_income = (total_emi / monthly_income) * 100
+        if debt_to_income > 40:
+            alerts.append(("error", f"High debt-to-income ratio ({debt_to_income:.1f}%). Consider reducing debt.", "high"))
+        elif debt_to_income > 30:
+            alerts.append(("warning", f"Debt-to-income ratio ({debt_to_income:.1f}%) is getting high. Monitor your finances.", "medium"))
+
+    monthly_expense = profile.get('monthly_expense', 0)
+    monthly_savings = monthly_income - monthly_expense - total_emi
+    if monthly_savings < 0:
+        alerts.append(("error", "You are spending more than your income. Review your expenses immediately.", "high"))
+    elif monthly_savings < (monthly_income * 0.1):
+        alerts.append(("warning", "Low monthly savings. Aim to save at least 10-20% of your income.", "medium"))
+
+    if current_loans:
+        alerts.append(("info", f"You have {len(current_loans)} active loan(s). Ensure timely EMI payments.", "low"))
+
+    num_credit_cards = profile.get('num_credit_cards', 0)
+    if num_credit_cards > 0:
+        alerts.append(("info", f"Don't forget to pay your credit card bills on time. You have {num_credit_cards} card(s).", "low"))
+
+    return alerts
+
+
+def _grid():
+    """Profiles on and either side of every threshold"""
+    scores = [300, 599, 600, 601, 699, 700, 850]
+    utilizations = [0, 30, 30.5, 31, 60, 61, 100]
+    # EMIs against an income of 100000: none, exactly 30% and 40%, just over each
+    emi_sets = [[], [0], [30000], [30001], [20000, 20000], [40000, 1], [12345.67]]
+    # Savings of 100000 - expense - EMI: with no EMI exactly 10%, just under, zero and negative
+    expenses = [0, 50000, 90000, 90001, 100000, 100001]
+    for score, utilization, emis, expense, cards in itertools.product(
+            scores, utilizations, emi_sets, expenses, [0, 3]):
+        yield {"monthly_income": 100000, "monthly_expense": expense, "credit_score": score,
+               "credit_utilization": utilization, "num_credit_cards": cards,
+               "current_loans": [{"type": "Personal Loan", "amount": 100000, "emi": emi} for emi in emis]}
+
+
+EDGE_PROFILES = [
+    # No income: no debt-to-income alert, any spending is over income
+    {"monthly_income": 0, "monthly_expense": 0, "credit_score": 720, "credit_utilization": 10},
+    {"monthly_income": 0, "monthly_expense": 5000, "credit_score": 720, "current_loans": [{"emi": 1000}]},
+    # Odd incomes whose ratios format with rounding
+    {"monthly_income": 33333, "monthly_expense": 1000, "credit_score": 720,
+     "current_loans": [{"emi": 11111}, {"emi": 2222.5}]},
+    {"monthly_income": 75000.5, "monthly_expense": 67000.25, "credit_score": 640, "credit_utilization": 45.25},
+    # Missing fields
+    {},
+    {"monthly_income": 50000, "monthly_expense": 20000},
+    {"credit_score": 650},
+    {"credit_score": 650, "monthly_income": 50000},
+    {"credit_score": 750, "monthly_income": 50000, "monthly_expense": 48000},
+    {"credit_score": 750, "monthly_income": 50000, "current_loans": [{"amount": 200000}, {"type": "Car Loan"}]},
+    {"credit_score": 750, "monthly_income": 50000, "credit_utilization": 75},
+    {"credit_score": 750, "num_credit_cards": 2},
+]
+
+PROFILES = list(_grid()) + EDGE_PROFILES
+
+
+def expected_alerts(profile):
+    """
+    The baseline alerts, with a missing credit score taken as the default
+    every reader of a profile now shares (the checks used to read it as 0)
+    """
+    return baseline_alerts({"credit_score": DEFAULT_CREDIT_SCORE, **profile})
+
+
+def _triples(alerts):
+    return [(alert["type"], alert["message"], alert["priority"]) for alert in alerts]
+
+
+@pytest.fixture(scope="module")
+def rules():
+    return AlertRules(DEFAULT_ALERT_RULES)
+
+
+def test_grid_raises_every_level():
+    raised = {(alert_type, priority) for profile in PROFILES
+              for alert_type, _, priority in baseline_alerts(profile)}
+    assert raised == {("error", "high"), ("warning", "medium"), ("info", "low")}
+
+
+def test_alerts_for_profile_matches_baseline(rules):
+    for profile in PROFILES:
+        assert _triples(rules.alerts_for_profile(profile)) == expected_alerts(profile), profile
+
+
+def test_evaluate_matches_baseline(rules):
+    alerts = rules.evaluate(profiles_to_frame(PROFILES))
+    by_row = {}
+    for row, alert_type, message, priority in zip(alerts["row"], alerts["type"], alerts["message"],
+                                                  alerts["priority"]):
+        by_row.setdefault(row, []).append((alert_type, message, priority))
+    for row, profile in enumerate(PROFILES):
+        assert by_row.get(row, []) == expected_alerts(profile), profile
+
+
+def test_evaluate_matches_alerts_for_profile_keys(rules):
+    alerts = rules.evaluate(profiles_to_frame(PROFILES))
+    keys = {}
+    for row, key in zip(alerts["row"], alerts["key"]):
+        keys.setdefault(row, []).append(key)
+    for row, profile in enumerate(PROFILES):
+        assert keys.get(row, []) == [alert["key"] for alert in rules.alerts_for_profile(profile)], profile
@@ -0,0 +1,105 @@
+import pytest
+
+from utils import alert_store
+from utils.alert_store import AlertStore, get_alert_id
+from utils.data_handler import load_alerts, save_alerts
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes():
+    alert_store._indexes.clear()
+    yield
+    alert_store._indexes.clear()
+
+
+def _alert(number, seen=False):
+    return {"type": "warning", "message": f"Alert {number}", "priority": "high",
+            "timestamp": f"2099-01-01T00:00:{number:02d}", "seen": seen,
+            "rule": f"rule_{number}", "key": f"rule_{number}"}
+
+
+def test_add_skips_stored_alerts(storage):
+    store = AlertStore()
+    added = store.add([_alert(1), _alert(2)])
+    assert [alert["message"] for alert in added] == ["Alert 1", "Alert 2"]
+    assert all(alert["id"] for alert in added)
+    assert store.add([_alert(2), _alert(3)])[0]["message"] == "Alert 3"
+    assert [alert["message"] for alert in load_alerts()] == ["Alert 1", "Alert 2", "Alert 3"]
+    assert store.count_unseen() == 3
+
+
+def test_mark_seen(storage):
+    store = AlertStore()
+    added = store.add([_alert(1), _alert(2), _alert(3)])
+    assert store.mark_seen(added[1]["id"])
+    assert [alert["seen"] for alert in load_alerts()] == [False, True, False]
+    assert store.count_unseen() == 2
+    assert not store.mark_seen("missing")
+    assert store.mark_all_seen()
+    assert store.count_unseen() == 0
+
+
+def test_mark_seen_after_another_session_reordered(storage):
+    store = AlertStore()
+    added = store.add([_alert(1), _alert(2), _alert(3)])
+    store.count_unseen()
+    # Another session drops the first alert; the indexed position is stale
+    save_alerts(load_alerts()[1:])
+    assert store.mark_seen(added[2]["id"])
+    assert [(alert["message"], alert["seen"]) for alert in load_alerts()] == [
+        ("Alert 2", False), ("Alert 3", True)]
+
+
+def test_mark_seen_of_legacy_alert_without_id(storage):
+    legacy = {"type": "info", "message": "Old", "priority": "low",
+              "timestamp": "2099-01-01T00:00:00", "seen": False}
+    save_alerts([legacy])
+    assert AlertStore().mark_seen(get_alert_id(legacy))
+    assert load_alerts()[0]["seen"] is True
+
+
+def _alert_rows(backend):
+    with backend._connection() as conn:
+        return conn.execute("SELECT id, message, seen FROM alerts ORDER BY id").fetchall()
+
+
+def _total_changes(backend):
+    with backend._connection() as conn:
+        return conn.total_changes
+
+
+def test_sqlite_writes_only_changed_rows(tmp_path, monkeypatch):
+    from utils import data_handler
+    from utils.sqlite_storage import SQLiteStorage
+
+    monkeypatch.setattr(data_handler, "DATA_DIR", str(tmp_path))
+    # One pooled connection, so its change counter sees every write
+    backend = SQLiteStorage(str(tmp_path / "credo.db"), pool_size=1)
+    data_handler.set_storage(backend)
+    try:
+        store = AlertStore()
+        added = store.add([_alert(number) for number in range(1, 6)])
+        before = _alert_rows(backend)
+
+        changes = _total_changes(backend)
+        assert store.mark_seen(added[2]["id"])
+        # One alert row plus the version row
+        assert _total_changes(backend) - changes == 2
+        after = _alert_rows(backend)
+        assert [row[0] for row in after] == [row[0] for row in before]
+        assert [row[2] for row in after] == [0, 0, 1, 0, 0]
+
+        changes = _total_changes(backend)
+        store.add([_alert(6)])
+        assert _total_changes(backend) - changes == 2
+        assert [row[0] for row in _alert_rows(backend)][:5] == [row[0] for row in before]
+
+        # Moving an alert ahead of others reinserts the rows after it, in order
+        alerts = load_alerts()
+        save_alerts([alerts[0], alerts[3], alerts[1], alerts[2], alerts[4], alerts[5]])
+        assert [row[1] for row in _alert_rows(backend)] == [
+            "Alert 1", "Alert 4", "Alert 2", "Alert 3", "Alert 5", "Alert 6"]
+        assert load_alerts()[3]["seen"] is True
+    finally:
+        data_handler.set_storage(None)
+        backend.close()
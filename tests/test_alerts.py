@@ -0,0 +1,59 @@
+import pytest
+
+from utils import alert_store, alerts
+from utils.alert_rules import DEFAULT_ALERT_RULES, AlertRules
+from utils.alerts import store_new_alerts
+from utils.data_handler import JSONStorage, load_alerts, set_storage
+
+PROFILE = {"monthly_income": 50000, "monthly_expense": 48000, "credit_score": 580, "credit_utilization": 70}
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    alert_store._indexes.clear()
+    alerts._last_runs.clear()
+    yield
+    alert_store._indexes.clear()
+    alerts._last_runs.clear()
+
+
+def test_rule_digest_is_stable():
+    rules = AlertRules(DEFAULT_ALERT_RULES)
+    assert AlertRules(DEFAULT_ALERT_RULES).digest == rules.digest
+    changed = [dict(rule) for rule in DEFAULT_ALERT_RULES]
+    changed[0] = {**changed[0], "levels": changed[0]["levels"][:1]}
+    assert AlertRules(changed).digest != rules.digest
+
+
+def _reopen(backend):
+    if isinstance(backend, JSONStorage):
+        return JSONStorage(backend.data_dir)
+    from utils.sqlite_storage import SQLiteStorage
+    return SQLiteStorage(backend.db_path)
+
+
+def test_reopened_storage_keeps_last_run(storage):
+    assert len(store_new_alerts(PROFILE, "alice")) == 3
+    # The same data opened again is the same store, so the run is skipped
+    reopened = _reopen(storage)
+    assert reopened.location == storage.location
+    set_storage(reopened)
+    try:
+        assert store_new_alerts(PROFILE, "alice") == []
+        assert len(alerts._last_runs) == 1
+    finally:
+        set_storage(storage)
+        if hasattr(reopened, "close"):
+            reopened.close()
+
+
+def test_other_storage_is_evaluated_again(storage, tmp_path):
+    assert len(store_new_alerts(PROFILE, "alice")) == 3
+    other = JSONStorage(str(tmp_path / "other"))
+    assert other.location != storage.location
+    set_storage(other)
+    try:
+        assert len(store_new_alerts(PROFILE, "alice")) == 3
+        assert len(load_alerts("alice")) == 3
+    finally:
+        set_storage(storage)
@@ -0,0 +1,33 @@
+import pytest
+
+from utils.annual_report import amortization_schedule, render_annual_report
+from utils.pdf_generator import count_pages
+
+PROFILE = {"name": "Asha", "monthly_income": 80000, "monthly_expense": 30000, "credit_score": 720,
+           "credit_utilization": 25, "num_credit_cards": 2,
+           "current_loans": [{"amount": 200000, "emi": 9000, "remaining_tenure": 24, "interest_rate": 11.0}]}
+
+
+def test_schedule_pays_off_balance():
+    rows = list(amortization_schedule(10000, 12.0, 1000))
+    assert rows[-1][-1] == 0.0
+    assert sum(row[3] for row in rows) == pytest.approx(10000)
+
+
+@pytest.mark.parametrize("stream_tables", [True, False])
+def test_report_renders(stream_tables):
+    pdf = render_annual_report(PROFILE, stream_tables=stream_tables)
+    assert pdf.startswith(b"%PDF")
+    assert count_pages(pdf) >= 2
+
+
+@pytest.mark.parametrize("loan", [
+    {"amount": 0, "emi": 100, "remaining_tenure": 0},
+    {"amount": 0, "emi": 100, "remaining_tenure": 12},
+    {"amount": 50000, "emi": 0, "remaining_tenure": 0},
+])
+@pytest.mark.parametrize("stream_tables", [True, False])
+def test_loan_with_empty_schedule(loan, stream_tables):
+    # A loan with an EMI but nothing left to amortize gives a header-only table
+    pdf = render_annual_report({"current_loans": [loan]}, stream_tables=stream_tables)
+    assert pdf.startswith(b"%PDF")
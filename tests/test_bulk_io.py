@@ -0,0 +1,123 @@
+import csv
+import json
+
+import pytest
+
+from utils.bulk_io import detect_format, export_file, import_file, main
+from utils.data_handler import load_credit_history, load_user_profile, save_user_profile
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def _jsonl(path, rows):
+    return _write(path, "".join(json.dumps(row) + "\n" for row in rows))
+
+
+def test_detect_format():
+    assert detect_format("rows.csv") == "csv"
+    assert detect_format("rows.ndjson") == "jsonl"
+    assert detect_format("rows.txt", "csv") == "csv"
+    with pytest.raises(ValueError):
+        detect_format("rows.txt")
+
+
+def test_profiles_round_trip_through_jsonl(storage, tmp_path):
+    rows = [{"user_id": "alice", "name": "Alice", "monthly_income": 50000, "credit_score": 720,
+             "current_loans": [{"amount": 100000, "emi": 5000, "remaining_tenure": 24, "due_day": 5}],
+             "last_updated": "2026-01-01T00:00:00", "theme": "dark"},
+            {"user_id": "bob", "name": "Bob", "credit_score": 640, "last_updated": "2026-01-01T00:00:00"}]
+    summary = import_file("profiles", _jsonl(tmp_path / "in.jsonl", rows), chunk_size=1)
+    assert (summary["rows"], summary["imported"], summary["failed"]) == (2, 2, 0)
+    assert load_user_profile("alice")["theme"] == "dark"
+    assert load_user_profile("alice")["current_loans"][0]["due_day"] == 5
+
+    out = str(tmp_path / "out.jsonl")
+    assert export_file("profiles", out, user_ids=["alice", "bob"]) == 2
+    with open(out) as f:
+        exported = [json.loads(line) for line in f]
+    assert [row["user_id"] for row in exported] == ["alice", "bob"]
+    assert exported[0]["current_loans"][0]["amount"] == 100000
+    assert exported[1]["credit_score"] == 640
+
+
+def test_profile_row_without_loans_keeps_stored_loans(storage, tmp_path):
+    save_user_profile({"name": "A", "current_loans": [{"amount": 5, "emi": 1, "remaining_tenure": 2}]}, "alice")
+    import_file("profiles", _write(tmp_path / "in.csv", "user_id,name,credit_score\nalice,Alice,700\n"))
+    profile = load_user_profile("alice")
+    assert profile["name"] == "Alice"
+    assert profile["current_loans"][0]["amount"] == 5
+
+
+def test_loans_and_history_through_csv(storage, tmp_path):
+    save_user_profile({"name": "A"}, "alice")
+    summary = import_file("loans", _write(tmp_path / "loans.csv",
+                                          "user_id,amount,emi,remaining_tenure\nalice,1000,100,10\n"
+                                          "nobody,1000,100,10\n"))
+    assert (summary["imported"], summary["failed"]) == (1, 1)
+    assert summary["errors"] == [(3, "No profile for user 'nobody'")]
+    assert load_user_profile("alice")["current_loans"][0]["amount"] == 1000
+
+    summary = import_file("history", _write(tmp_path / "history.csv",
+                                            "user_id,date,credit_score,notes\n"
+                                            "alice,2024-01-01,700,first\nalice,2024-02-01,710,\n"))
+    assert summary["imported"] == 2
+    assert [entry["credit_score"] for entry in load_credit_history("alice")] == [700, 710]
+
+    out = str(tmp_path / "history_out.csv")
+    assert export_file("history", out, user_ids=["alice"]) == 2
+    with open(out, newline="") as f:
+        exported = list(csv.DictReader(f))
+    assert [(row["date"], row["credit_score"], row["notes"]) for row in exported] == [
+        ("2024-01-01", "700", "first"), ("2024-02-01", "710", "")]
+
+
+@pytest.mark.parametrize("row, message", [
+    ({"name": "No id"}, "user_id is required"),
+    ({"user_id": "../x"}, "Invalid user id"),
+    ({"user_id": "a", "credit_score": 950}, "credit_score must be at most 900"),
+    ({"user_id": "a", "credit_score": 700.5}, "credit_score must be a whole number"),
+    ({"user_id": "a", "monthly_income": "lots"}, "monthly_income must be a number"),
+    ({"user_id": "a", "birthdate": "01/02/1990"}, "birthdate must be YYYY-MM-DD"),
+    ({"user_id": "a", "card_due_days": [5, 40]}, "card_due_days[1]: due_day must be at most 31"),
+    ({"user_id": "a", "current_loans": {}}, "current_loans must be a list"),
+    ({"user_id": "a", "current_loans": [{"amount": -1}]}, "current_loans[0]: amount must be at least 0"),
+])
+def test_invalid_profile_rows_are_reported(storage, tmp_path, row, message):
+    summary = import_file("profiles", _jsonl(tmp_path / "in.jsonl", [row]))
+    assert (summary["imported"], summary["failed"]) == (0, 1)
+    assert message in summary["errors"][0][1]
+    assert load_user_profile("a") is None
+
+
+def test_invalid_history_and_json_lines(storage, tmp_path):
+    path = _write(tmp_path / "in.jsonl", "\n".join([
+        json.dumps({"user_id": "a", "date": "2024-01-01", "credit_score": 700}),
+        json.dumps({"user_id": "a", "date": "yesterday", "credit_score": 700}),
+        json.dumps({"user_id": "a", "date": "2024-01-02"}),
+        "{not json",
+        "[1, 2]",
+    ]) + "\n")
+    errors_path = str(tmp_path / "errors.csv")
+    summary = import_file("history", path, errors_path=errors_path)
+    assert (summary["rows"], summary["imported"], summary["failed"]) == (5, 1, 4)
+    assert [line for line, message in summary["errors"]] == [2, 3, 4, 5]
+    assert "date must be an ISO date" in summary["errors"][0][1]
+    assert summary["errors"][1][1] == "credit_score is required"
+    assert summary["errors"][2][1].startswith("Invalid JSON")
+    assert summary["errors"][3][1] == "Expected a JSON object"
+    with open(errors_path, newline="") as f:
+        assert len(list(csv.reader(f))) == 5
+    assert len(load_credit_history("a")) == 1
+
+
+def test_command_line_exit_codes(storage, tmp_path, capsys):
+    good = _jsonl(tmp_path / "good.jsonl", [{"user_id": "a", "name": "A"}])
+    bad = _jsonl(tmp_path / "bad.jsonl", [{"user_id": "a", "credit_score": 1}])
+    assert main(["import", "profiles", good]) == 0
+    assert main(["import", "profiles", bad]) == 1
+    assert main(["import", "profiles", str(tmp_path / "missing.jsonl")]) == 2
+    assert main(["export", "profiles", str(tmp_path / "out.csv")]) == 0
+    assert "Exported 1 profiles rows" in capsys.readouterr().out
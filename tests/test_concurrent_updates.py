@@ -0,0 +1,96 @@
+import multiprocessing
+import threading
+
+import pytest
+
+from utils import data_handler
+from utils.data_handler import DEFAULT_USER_ID, JSONStorage, load_alerts, load_user_profile, update_alerts, update_user_profile
+
+WORKERS = 8
+UPDATES_PER_WORKER = 25
+
+
+def _increment(profile):
+    profile["counter"] = profile.get("counter", 0) + 1
+    return profile
+
+
+def _run_threads(target):
+    errors = []
+
+    def run():
+        try:
+            target()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(WORKERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_concurrent_profile_updates_lose_nothing(storage):
+    def worker():
+        for _ in range(UPDATES_PER_WORKER):
+            assert update_user_profile(_increment) is not None
+
+    _run_threads(worker)
+    assert load_user_profile()["counter"] == WORKERS * UPDATES_PER_WORKER
+
+
+def test_concurrent_alert_updates_lose_nothing(storage):
+    def worker():
+        name = threading.current_thread().name
+        for index in range(UPDATES_PER_WORKER):
+            assert update_alerts(lambda alerts: alerts + [{"message": f"{name} {index}", "seen": False}]) is not None
+
+    _run_threads(worker)
+    messages = [alert["message"] for alert in load_alerts()]
+    assert len(messages) == len(set(messages)) == WORKERS * UPDATES_PER_WORKER
+
+
+def test_conflicts_are_retried(storage, monkeypatch):
+    # Another session saves between every load and save of the first few attempts
+    real_load = type(storage).load_versioned
+    interruptions = [3]
+
+    def load_versioned(self, record, user_id):
+        result = real_load(self, record, user_id)
+        if interruptions[0]:
+            interruptions[0] -= 1
+            self.save_user_profile({"counter": 100}, user_id)
+        return result
+
+    monkeypatch.setattr(type(storage), "load_versioned", load_versioned)
+    assert update_user_profile(_increment)["counter"] == 101
+
+
+def test_gives_up_after_max_retries(storage, monkeypatch):
+    monkeypatch.setattr(data_handler, "MAX_UPDATE_RETRIES", 3)
+    monkeypatch.setattr(data_handler, "MAX_RETRY_DELAY", 0)
+    monkeypatch.setattr(type(storage), "save_if_version", lambda self, *args: False)
+    assert update_user_profile(_increment) is None
+
+
+def _process_worker(data_dir, updates):
+    data_handler.set_storage(JSONStorage(data_dir))
+    for _ in range(updates):
+        if update_user_profile(_increment) is None:
+            raise SystemExit(1)
+    data_handler.flush_writes()
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_concurrent_processes_lose_nothing(tmp_path):
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=_process_worker, args=(str(tmp_path), UPDATES_PER_WORKER))
+                 for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0] * 4
+    assert JSONStorage(str(tmp_path)).load_user_profile(DEFAULT_USER_ID)["counter"] == 4 * UPDATES_PER_WORKER
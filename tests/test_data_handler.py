@@ -0,0 +1,31 @@
+import pytest
+
+from utils import data_handler
+from utils.data_handler import load_user_profile, save_alerts, save_profiles_bulk, save_user_profile
+
+
+@pytest.fixture
+def saves(monkeypatch):
+    """(record, user_id) of every save listeners are told about"""
+    notified = []
+    monkeypatch.setattr(data_handler, "_save_listeners", [lambda record, user_id: notified.append((record, user_id))])
+    return notified
+
+
+def test_saves_return_true(storage):
+    # The second save lands inside the writer's coalescing window and is queued
+    assert save_user_profile({"name": "A"}, "alice") is True
+    assert save_user_profile({"name": "B"}, "alice") is True
+    assert save_alerts([], "alice") is True
+    assert load_user_profile("alice")["name"] == "B"
+
+
+def test_bulk_save_notifies_saved_users(storage, saves):
+    assert save_profiles_bulk([("alice", {"name": "A"}), ("bob", {"name": "B"})])
+    assert sorted(saves) == [("profile", "alice"), ("profile", "bob")]
+
+
+def test_failed_bulk_save_notifies_nobody(storage, saves, monkeypatch):
+    monkeypatch.setattr(type(storage), "save_profiles_bulk", lambda self, profiles: False)
+    assert not save_profiles_bulk([("alice", {"name": "A"})])
+    assert saves == []
@@ -0,0 +1,94 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import pytest
+
+import utils.file_writer as file_writer
+from utils.file_writer import QUEUED, WRITTEN, CoalescingWriter, atomic_write
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _read(file_path):
+    with open(file_path) as f:
+        return f.read()
+
+
+def test_burst_is_coalesced(tmp_path):
+    file_path = str(tmp_path / "profile.json")
+    written = []
+    writer = CoalescingWriter(window=60, on_written=written.append)
+    assert writer.write(file_path, "1", 1) == WRITTEN
+    assert writer.write(file_path, "2", 2) == QUEUED
+    assert writer.write(file_path, "3", 3) == QUEUED
+    assert writer.pending(file_path) == 3
+    assert _read(file_path) == "1"
+
+    assert writer.flush(file_path) is True
+    assert _read(file_path) == "3"
+    assert writer.pending(file_path) is None
+    assert written == [file_path, file_path]
+
+
+def test_failed_deferred_write_stays_queued(tmp_path, monkeypatch):
+    file_path = str(tmp_path / "profile.json")
+    writer = CoalescingWriter(window=0.01)
+    writer.write(file_path, "1", 1)
+    assert writer.write(file_path, "2", 2) == QUEUED
+
+    def fail(path, text):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(file_writer, "atomic_write", fail)
+    # Let the timer try (and fail) to write the queued save
+    time.sleep(0.1)
+    assert writer.pending(file_path) == 2
+    assert writer.flush(file_path) is False
+    assert writer.pending(file_path) == 2
+
+    monkeypatch.setattr(file_writer, "atomic_write", atomic_write)
+    assert writer.flush(file_path) is True
+    assert writer.pending(file_path) is None
+    assert _read(file_path) == "2"
+
+
+def test_failed_direct_write_raises(tmp_path, monkeypatch):
+    def fail(path, text):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(file_writer, "atomic_write", fail)
+    with pytest.raises(OSError):
+        CoalescingWriter().write(str(tmp_path / "profile.json"), "1")
+
+
+# Saves profiles of random size through the writer until killed
+CRASH_CHILD = """
+import json, random, sys
+from utils.file_writer import CoalescingWriter
+writer = CoalescingWriter(window=0.001)
+print("ready", flush=True)
+while True:
+    loans = [{"amount": 100000, "emi": 5000}] * random.randint(0, 4000)
+    writer.write(sys.argv[1], json.dumps({"name": "Crash", "current_loans": loans}))
+"""
+
+
+@pytest.mark.skipif(os.name != "posix", reason="needs SIGKILL")
+def test_killed_writer_leaves_valid_file(tmp_path):
+    file_path = str(tmp_path / "profile.json")
+    atomic_write(file_path, json.dumps({"name": "Crash", "current_loans": []}))
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR)
+    for _ in range(20):
+        child = subprocess.Popen([sys.executable, "-c", CRASH_CHILD, file_path],
+                                 stdout=subprocess.PIPE, env=env, cwd=PROJECT_DIR)
+        assert child.stdout.readline().strip() == b"ready"
+        time.sleep(random.uniform(0.0, 0.05))
+        child.kill()
+        child.wait()
+        child.stdout.close()
+        with open(file_path) as f:
+            assert json.load(f)["name"] == "Crash"
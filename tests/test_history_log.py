@@ -0,0 +1,155 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+
+import utils.history_log as history_log
+from utils.history_log import HistoryLog
+from utils.serializers import get_serializer
+
+
+class Crash(Exception):
+    """Raised to stop a write midway, as if the process died there"""
+
+
+def _entries(start, stop):
+    return [{"date": f"2024-01-{day:02d}", "score": 600 + day} for day in range(start, stop)]
+
+
+def _log(tmp_path, serializer=None):
+    return HistoryLog(str(tmp_path / "credit_history.json"), serializer=serializer)
+
+
+def test_append_and_read_all(tmp_path):
+    log = _log(tmp_path)
+    log.replace_all(_entries(1, 4))
+    log.append(_entries(4, 5)[0])
+    log.extend(_entries(5, 7))
+    assert log.read_all() == _entries(1, 7)
+    assert _log(tmp_path).tail(3) == _entries(4, 7)
+
+
+def test_compact_folds_log_into_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_log, "COMPACT_THRESHOLD", 5)
+    log = _log(tmp_path)
+    for entry in _entries(1, 8):
+        log.append(entry)
+    assert log.read_all() == _entries(1, 8)
+    with open(log.snapshot_path) as f:
+        assert len(json.load(f)) == 5
+
+
+def test_torn_last_line_is_cut(tmp_path):
+    log = _log(tmp_path)
+    log.extend(_entries(1, 3))
+    with open(log.log_path, "a") as f:
+        f.write('{"date": "2024-01-0')
+    assert _log(tmp_path).read_all() == _entries(1, 3)
+
+
+@pytest.mark.parametrize("fail_at", ["write_next", "remove_compacting", "replace_next"])
+def test_replace_all_crash_keeps_old_or_new_history(tmp_path, monkeypatch, fail_at):
+    log = _log(tmp_path)
+    log.replace_all(_entries(1, 3))
+    log.extend(_entries(3, 5))
+    old, new = _entries(1, 5), _entries(10, 12)
+
+    real_write, real_remove, real_replace = log._write_snapshot_file, os.remove, os.replace
+
+    def write_next(file_path, entries):
+        if fail_at == "write_next":
+            with open(file_path, "w") as f:
+                f.write('[\n{"date": "2024')
+            raise Crash()
+        real_write(file_path, entries)
+
+    def remove(file_path):
+        if fail_at == "remove_compacting" and file_path == log.compacting_path:
+            raise Crash()
+        real_remove(file_path)
+
+    def replace(src, dst):
+        if fail_at == "replace_next" and src == log.next_path:
+            raise Crash()
+        real_replace(src, dst)
+
+    monkeypatch.setattr(log, "_write_snapshot_file", write_next)
+    monkeypatch.setattr(history_log.os, "remove", remove)
+    monkeypatch.setattr(history_log.os, "replace", replace)
+    with pytest.raises(Crash):
+        log.replace_all(new)
+    monkeypatch.undo()
+
+    recovered = _log(tmp_path).read_all()
+    if fail_at == "write_next":
+        assert recovered == old
+    else:
+        assert recovered == new
+    assert not os.path.exists(log.next_path)
+    assert not os.path.exists(log.compacting_path)
+
+
+def test_compact_crash_before_snapshot_is_recovered(tmp_path, monkeypatch):
+    log = _log(tmp_path)
+    log.replace_all(_entries(1, 3))
+    log.extend(_entries(3, 6))
+
+    def crash(file_path, entries):
+        raise Crash()
+
+    monkeypatch.setattr(log, "_write_snapshot_file", crash)
+    with pytest.raises(Crash):
+        log.compact()
+    monkeypatch.undo()
+
+    assert os.path.exists(log.compacting_path)
+    assert _log(tmp_path).read_all() == _entries(1, 6)
+
+
+def test_binary_snapshot_recovery(tmp_path):
+    serializer = get_serializer("binary")
+    log = _log(tmp_path, serializer)
+    log.replace_all(_entries(1, 4))
+    log.extend(_entries(4, 6))
+    log.compact()
+    assert _log(tmp_path, serializer).read_all() == _entries(1, 6)
+    assert _log(tmp_path, serializer).tail(2) == _entries(4, 6)
+
+
+def test_compact_merges_files_left_by_another_process(tmp_path):
+    log = _log(tmp_path)
+    log.replace_all(_entries(1, 3))
+    log.extend(_entries(3, 5))
+    # Another process died after renaming its log away
+    other = _log(tmp_path)
+    other.read_all()
+    os.replace(other.log_path, other.compacting_path)
+    log.extend(_entries(5, 7))
+    log.compact()
+    assert _log(tmp_path).read_all() == _entries(1, 7)
+
+
+def _append_worker(snapshot_path, worker, count):
+    log = HistoryLog(snapshot_path)
+    for number in range(count):
+        log.append({"worker": worker, "number": number})
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_concurrent_processes_compact_without_losing_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_log, "COMPACT_THRESHOLD", 7)
+    snapshot_path = str(tmp_path / "credit_history.json")
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=_append_worker, args=(snapshot_path, worker, 150)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0] * 4
+    entries = HistoryLog(snapshot_path).read_all()
+    assert sorted((entry["worker"], entry["number"]) for entry in entries) == [
+        (worker, number) for worker in range(4) for number in range(150)]
+    # Each process's entries stay in the order it appended them
+    for worker in range(4):
+        assert [entry["number"] for entry in entries if entry["worker"] == worker] == list(range(150))
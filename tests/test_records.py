@@ -0,0 +1,48 @@
+from utils.records import DEFAULT_LOAN_RATE, Alert, HistoryEntry, Loan, UserProfile
+
+PROFILE = {
+    "name": "Asha", "birthdate": "1990-01-01", "monthly_income": 50000, "monthly_expense": 30000.5,
+    "credit_score": 710, "credit_utilization": 30, "num_credit_cards": 2, "card_due_days": [5, None],
+    "current_loans": [{"amount": 100000, "emi": 5000, "remaining_tenure": 24, "interest_rate": 11.5,
+                       "due_day": 7, "lender": "Bank"}],
+    "last_updated": "2026-01-01T00:00:00", "theme": "dark",
+}
+
+
+def test_profile_round_trip_keeps_extra_keys():
+    assert UserProfile.from_dict(PROFILE).to_dict() == PROFILE
+
+
+def test_missing_and_malformed_fields_take_defaults():
+    profile = UserProfile.from_dict({"credit_score": "702", "monthly_income": "", "current_loans": [{}]})
+    assert profile.credit_score == 702
+    assert profile.monthly_income == 0
+    assert profile.current_loans == [Loan.from_dict({})]
+    assert profile.current_loans[0].interest_rate == DEFAULT_LOAN_RATE
+    assert profile.extra is None
+
+
+def test_whole_floats_are_stored_as_int():
+    loan = Loan.from_dict({"amount": 1000.0, "emi": 99.5})
+    assert type(loan.amount) is int
+    assert loan.emi == 99.5
+
+
+def test_dict_style_access():
+    alert = Alert.from_dict({"message": "Hi", "seen": 1, "rule": "r1"})
+    assert alert.get("seen") is True
+    assert alert.get("rule") == "r1"
+    assert alert.get("missing", 3) == 3
+    assert "rule" in alert and "type" in alert and "missing" not in alert
+
+
+def test_columns_round_trip():
+    # Extra keys are not carried over to columns
+    loans = [{key: value for key, value in loan.items() if key != "lender"} for loan in PROFILE["current_loans"]]
+    profiles = [UserProfile.from_dict({**PROFILE, "current_loans": loans}), UserProfile.from_dict({"name": "B"})]
+    restored = UserProfile.from_columns(UserProfile.to_columns(profiles))
+    assert [profile.current_loans for profile in restored] == [profile.current_loans for profile in profiles]
+    assert [profile.credit_score for profile in restored] == [710, 650]
+
+    entries = [HistoryEntry.from_dict({"date": "2024-01-01", "credit_score": 700, "notes": "x"})]
+    assert HistoryEntry.from_columns(HistoryEntry.to_columns(entries)) == entries
@@ -0,0 +1,82 @@
+from datetime import date
+
+import pytest
+
+from utils import alert_store
+from utils.data_handler import load_alerts, save_user_profile
+from utils.reminders import Reminder, ReminderScheduler, next_due_date
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes():
+    alert_store._indexes.clear()
+    yield
+    alert_store._indexes.clear()
+
+
+@pytest.mark.parametrize("due_day, on_or_after, expected", [
+    (15, date(2026, 4, 10), date(2026, 4, 15)),
+    (15, date(2026, 4, 15), date(2026, 4, 15)),
+    (15, date(2026, 4, 16), date(2026, 5, 15)),
+    (15, date(2026, 12, 16), date(2027, 1, 15)),
+    # Day 31 in a 30-day month falls on its last day
+    (31, date(2026, 4, 1), date(2026, 4, 30)),
+    (31, date(2026, 4, 30), date(2026, 4, 30)),
+    (31, date(2026, 5, 1), date(2026, 5, 31)),
+    # ... and in February on the 28th, or the 29th in a leap year
+    (31, date(2026, 2, 1), date(2026, 2, 28)),
+    (31, date(2028, 2, 1), date(2028, 2, 29)),
+    (30, date(2026, 2, 28), date(2026, 2, 28)),
+    (29, date(2026, 3, 1), date(2026, 3, 29)),
+    (31, date(2026, 12, 31), date(2026, 12, 31)),
+    (31, date(2027, 1, 1), date(2027, 1, 31)),
+])
+def test_next_due_date(due_day, on_or_after, expected):
+    assert next_due_date(due_day, on_or_after) == expected
+
+
+def test_pop_due_fires_in_date_order():
+    scheduler = ReminderScheduler(lead_days=10)
+    scheduler.schedule("a", [Reminder("a", "loan", 1, 14, 5000), Reminder("a", "card", 1, 5)], date(2026, 4, 1))
+    scheduler.schedule("b", [Reminder("b", "loan", 1, 12, 7000), Reminder("b", "card", 1, 14)], date(2026, 4, 1))
+    assert scheduler.next_fire_date() == date(2026, 3, 26)
+    fired = scheduler.pop_due(date(2026, 4, 4))
+    # Ordered by fire date, then by when they were queued
+    assert [(reminder.user_id, reminder.reminder_id, due) for reminder, due in fired] == [
+        ("a", "card:1", date(2026, 4, 5)),
+        ("b", "loan:1", date(2026, 4, 12)),
+        ("a", "loan:1", date(2026, 4, 14)),
+        ("b", "card:1", date(2026, 4, 14)),
+    ]
+    # Each is queued again for the next month
+    assert len(scheduler) == 4
+    assert scheduler.next_fire_date() == date(2026, 4, 25)
+    assert scheduler.pop_due(date(2026, 4, 24)) == []
+
+
+def test_pop_due_skips_missed_occurrences():
+    scheduler = ReminderScheduler(lead_days=3)
+    scheduler.schedule("a", [Reminder("a", "loan", 1, 10, 5000), Reminder("a", "card", 1, 20)], date(2026, 4, 1))
+    # The loan's 10 April occurrence passed unchecked; only the card fires
+    fired = scheduler.pop_due(date(2026, 4, 17))
+    assert [(reminder.reminder_id, due) for reminder, due in fired] == [("card:1", date(2026, 4, 20))]
+    assert scheduler.next_fire_date() == date(2026, 5, 7)
+
+
+def test_run_due_stores_alerts_in_fire_order(storage):
+    for user_id in ("a", "b"):
+        save_user_profile({"name": user_id}, user_id)
+    scheduler = ReminderScheduler(lead_days=3)
+    scheduler.schedule("a", [Reminder("a", "loan", 1, 10, 5000), Reminder("a", "card", 1, 8),
+                             Reminder("a", "loan", 2, 31, 2500)], date(2026, 4, 1))
+    scheduler.schedule("b", [Reminder("b", "card", 1, 9)], date(2026, 4, 1))
+    assert scheduler.run_due(date(2026, 4, 4)) == 0
+    assert scheduler.run_due(date(2026, 4, 7)) == 3
+    assert [alert["key"] for alert in load_alerts("a")] == ["card_due:1:2026-04-08", "loan_due:1:2026-04-10"]
+    assert [alert["key"] for alert in load_alerts("b")] == ["card_due:1:2026-04-09"]
+    assert scheduler.run_due(date(2026, 4, 28)) == 1
+    assert load_alerts("a")[-1]["message"] == "EMI of ₹2,500 for Loan 2 is due on 30 Apr 2026."
+    # Firing the same occurrence again (e.g. after a restart) stores nothing
+    restarted = ReminderScheduler(lead_days=3)
+    restarted.schedule("a", [Reminder("a", "loan", 2, 31, 2500)], date(2026, 4, 28))
+    assert restarted.run_due(date(2026, 4, 28)) == 0
@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from utils.report_cache import ReportCache
+from utils.report_jobs import DONE, FAILED, QUEUED, SUPERSEDED, ReportQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return ReportQueue(workers=1, cache=ReportCache(str(tmp_path / "cache")))
+
+
+def _blocking_render():
+    release = threading.Event()
+    rendered = []
+
+    def render(profile):
+        release.wait(5)
+        rendered.append(profile["name"])
+        return f"%PDF {profile['name']}".encode()
+
+    return render, release, rendered
+
+
+def test_same_report_is_deduplicated(queue):
+    render, release, rendered = _blocking_render()
+    first = queue.submit({"name": "A"}, "u1", render=render)
+    assert queue.submit({"name": "A"}, "u1", render=render) == first
+    release.set()
+    assert queue.wait(first, timeout=5)["status"] == DONE
+    assert queue.pdf(first) == b"%PDF A"
+    # Cached now: a new request is done without rendering
+    again = queue.submit({"name": "A"}, "u1", render=render)
+    assert queue.get(again)["cached"] and rendered == ["A"]
+
+
+def test_edited_profile_gets_its_own_report(queue):
+    render, release, rendered = _blocking_render()
+    running = queue.submit({"name": "Old"}, "u1", render=render)
+    queued = queue.submit({"name": "Older edit"}, "u1", render=render)
+    latest = queue.submit({"name": "New"}, "u1", render=render)
+    assert len({running, queued, latest}) == 3
+    assert queue.get(queued)["status"] == FAILED
+    assert queue.get(queued)["error"] == SUPERSEDED
+    assert queue.get(latest)["status"] == QUEUED
+
+    release.set()
+    assert queue.wait(latest, timeout=5)["status"] == DONE
+    assert queue.pdf(latest) == b"%PDF New"
+    assert queue.wait(running, timeout=5)["status"] == DONE
+    assert rendered == ["Old", "New"]
+
+
+def test_other_users_are_not_superseded(queue):
+    render, release, rendered = _blocking_render()
+    queue.submit({"name": "A"}, "u1", render=render)
+    other = queue.submit({"name": "B"}, "u2", render=render)
+    queue.submit({"name": "C"}, "u1", render=render)
+    assert queue.get(other)["status"] == QUEUED
+    release.set()
+    assert queue.wait(other, timeout=5)["status"] == DONE
+
+
+def test_full_queue_turns_requests_away(tmp_path):
+    queue = ReportQueue(workers=1, max_pending=2, cache=ReportCache(str(tmp_path / "cache")))
+    render, release, rendered = _blocking_render()
+    assert queue.submit({"name": "A"}, "u1", render=render)
+    assert queue.submit({"name": "B"}, "u2", render=render)
+    assert queue.submit({"name": "C"}, "u3", render=render) is None
+    release.set()
@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+from utils.score_series import INITIAL_CAPACITY, ScoreSeries
+
+
+def test_concurrent_appends_on_same_directory(tmp_path):
+    directory = str(tmp_path / "series")
+    ScoreSeries(directory).rebuild([0], [600.0])
+    per_thread = INITIAL_CAPACITY * 2
+    errors = []
+
+    def writer(offset):
+        # Each thread has its own instance, like two sessions of one user
+        series = ScoreSeries(directory)
+        try:
+            for i in range(per_thread):
+                series.append(1 + offset + 2 * i, 600.0 + offset)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(offset,)) for offset in (0, 1)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    series = ScoreSeries(directory)
+    timestamps, scores = series.range()
+    assert series.count == 1 + 2 * per_thread
+    assert list(timestamps) == list(range(1 + 2 * per_thread))
+    assert scores[1::2].tolist() == [600.0] * per_thread
+    assert scores[2::2].tolist() == [601.0] * per_thread
+
+
+def test_grow_keeps_existing_mapping_valid(tmp_path):
+    directory = str(tmp_path / "series")
+    ScoreSeries(directory).rebuild(range(INITIAL_CAPACITY), [1.0] * INITIAL_CAPACITY)
+    reader = ScoreSeries(directory)
+    writer = ScoreSeries(directory)
+    writer.append(INITIAL_CAPACITY, 2.0)
+
+    # The reader's arrays were not truncated by the writer growing the series
+    timestamps, scores = reader.range()
+    assert len(timestamps) == INITIAL_CAPACITY
+    assert scores.tolist() == [1.0] * INITIAL_CAPACITY
+
+    npy_files = sorted(name for name in os.listdir(directory) if name.endswith(".npy"))
+    assert npy_files == ["rolling.2.npy", "scores.2.npy", "timestamps.2.npy"]
+    assert ScoreSeries(directory).count == INITIAL_CAPACITY + 1
+
+
+def test_out_of_order_append_rebuilds(tmp_path):
+    series = ScoreSeries(str(tmp_path))
+    series.rebuild([10, 30], [1.0, 3.0])
+    series.append(20, 2.0)
+    timestamps, scores = ScoreSeries(str(tmp_path)).range()
+    assert timestamps.tolist() == [10, 20, 30]
+    assert scores.tolist() == [1.0, 2.0, 3.0]
+
+
+def test_append_after_drop_writes_nothing(tmp_path):
+    series = ScoreSeries(str(tmp_path))
+    series.rebuild([1], [1.0])
+    other = ScoreSeries(str(tmp_path))
+    series.drop()
+    other.append(2, 2.0)
+    assert not other.exists()
+
+
+def test_opens_layout_without_generation(tmp_path):
+    directory = str(tmp_path)
+    np.save(os.path.join(directory, "timestamps.npy"), np.array([1, 2] + [0] * 6, dtype=np.int64))
+    np.save(os.path.join(directory, "scores.npy"), np.array([5.0, 7.0] + [0.0] * 6))
+    np.save(os.path.join(directory, "rolling.npy"), np.zeros((8, 4)))
+    with open(os.path.join(directory, "meta.json"), "w") as f:
+        json.dump({"count": 2, "window": 3}, f)
+
+    series = ScoreSeries(directory)
+    assert series.range()[1].tolist() == [5.0, 7.0]
+    series.append(3, 9.0)
+    assert ScoreSeries(directory).range()[1].tolist() == [5.0, 7.0, 9.0]
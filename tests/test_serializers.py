@@ -0,0 +1,55 @@
+import pytest
+
+from utils.serializers import BINARY_MAGIC, _sample_data, detect_format, dumps, get_serializer, loads
+
+
+def _raw(data, name):
+    raw = dumps(data, name)
+    return raw.encode("utf-8") if isinstance(raw, str) else raw
+
+
+@pytest.mark.parametrize("name", ["json", "binary"])
+@pytest.mark.parametrize("record", ["profile", "history", "alerts"])
+def test_sample_data_round_trip(name, record):
+    data = _sample_data(3)[record]
+    assert loads(_raw(data, name)) == data
+
+
+@pytest.mark.parametrize("data", [
+    [],
+    {},
+    None,
+    [{"a": 1}, {"b": "x"}, {}],
+    [{"n": 1}, {"n": 2.5}, {"n": None}, {"n": True}],
+    [{"big": 2 ** 70}, {"big": -1}],
+    [{"text": "naïve ₹"}, {"text": ""}, {"text": "plain"}],
+    [{"nested": [1, {"x": 2}]}, {"nested": []}],
+    [{"flag": True}, {"flag": False}],
+    [{"kind": "a"}] * 10 + [{"kind": "b"}] * 10,
+])
+def test_binary_round_trip_is_exact(data):
+    raw = _raw(data, "binary")
+    assert raw.startswith(BINARY_MAGIC)
+    result = loads(raw)
+    assert result == data
+    if isinstance(data, list):
+        # An int stays an int and a missing key stays missing
+        assert [[type(value) for value in row.values()] for row in result] == \
+            [[type(value) for value in row.values()] for row in data]
+        assert [list(row) for row in result] == [list(row) for row in data]
+
+
+def test_format_is_detected():
+    assert detect_format(_raw([{"a": 1}], "binary")) == "binary"
+    assert detect_format(_raw([{"a": 1}], "json")) == "json"
+
+
+def test_truncated_binary_is_rejected():
+    raw = _raw(_sample_data()["history"], "binary")
+    with pytest.raises(ValueError):
+        loads(raw[:-64])
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        get_serializer("xml")
@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from utils.sqlite_storage import SQLiteStorage
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SQLiteStorage(str(tmp_path / "credo.db"), pool_size=2)
+    yield backend
+    backend.close()
+
+
+def test_round_trips(backend):
+    profile = {"name": "A", "credit_score": 700, "last_updated": "2026-01-01"}
+    assert backend.save_user_profile(profile, "u1")
+    assert backend.load_user_profile("u1") == profile
+    history = [{"date": f"2024-01-0{day}", "credit_score": 600 + day, "notes": "", "source": "import"}
+               for day in range(1, 4)]
+    assert backend.save_credit_history(history, "u1")
+    assert backend.load_credit_history("u1") == history
+    assert backend.tail_credit_history(2, "u1") == history[1:]
+    assert backend.load_credit_history_range("2024-01-02", "2024-01-03", "u1") == history[1:2]
+    assert backend.list_user_ids() == ["u1"]
+
+
+def test_versioned_load_and_compare_and_swap(backend):
+    assert backend.load_versioned("alerts", "u1") == ([], None)
+    version = backend.save_if_version("alerts", [{"message": "a", "seen": False}], None, "u1")
+    assert version == 1
+    alerts, loaded_version = backend.load_versioned("alerts", "u1")
+    assert loaded_version == version
+    assert alerts[0]["message"] == "a"
+    assert backend.save_if_version("alerts", [], None, "u1") is False
+    assert backend.save_if_version("alerts", [], version, "u1") == 2
+
+
+def test_pool_is_bounded_across_threads(backend):
+    backend.save_user_profile({"name": "A"}, "u1")
+    errors = []
+
+    def session():
+        try:
+            for _ in range(20):
+                assert backend.load_versioned("profile", "u1")[1] is not None
+                backend.save_user_profile({"name": "B"}, "u1")
+        except Exception as e:
+            errors.append(e)
+
+    # Many short-lived threads, like Streamlit script runs
+    threads = [threading.Thread(target=session) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert backend._opened <= backend.pool_size
+    assert backend._pool.qsize() == backend._opened
+
+
+def test_failed_transaction_returns_clean_connection(backend):
+    with pytest.raises(RuntimeError):
+        with backend._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            raise RuntimeError()
+    # The rolled-back connection does not hold the write lock
+    assert backend.save_user_profile({"name": "A"}, "u1")
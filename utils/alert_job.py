@@ -0,0 +1,176 @@
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from utils.alert_rules import AlertRules, get_alert_rules, profiles_to_frame
+from utils.alert_store import add_alerts_bulk
+from utils.data_handler import flush_writes, iter_profiles
+
+# Profiles evaluated per worker task (and written back per storage call)
+JOB_CHUNK_SIZE = 5000
+
+# Chunks queued per worker ahead of the one being written, which bounds
+# memory while keeping every worker busy
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+# Rule table of a pool worker, set once by _init_worker
+_worker_rules = None
+
+
+def _init_worker(rules):
+    global _worker_rules
+    _worker_rules = AlertRules(rules)
+
+
+def evaluate_chunk(chunk, timestamp, rules=None):
+    """
+    Evaluate the alert rules over a chunk of profiles
+
+    Args:
+        chunk: List of (user_id, profile) pairs
+        timestamp: ISO timestamp for the alerts
+        rules: AlertRules to use (defaults to the worker's or the process-wide table)
+
+    Returns:
+        tuple: (list of (user_id, alerts) for users with any alert, seconds spent)
+    """
+    start = time.perf_counter()
+    rules = rules or _worker_rules or get_alert_rules()
+    result = rules.evaluate(profiles_to_frame([profile for user_id, profile in chunk]))
+
+    alerts_by_user = []
+    current_row = -1
+    for row, rule, alert_type, priority, message, key in zip(
+            result["row"].tolist(), result["rule"].tolist(), result["type"].tolist(),
+            result["priority"].tolist(), result["message"].tolist(), result["key"].tolist()):
+        if row != current_row:
+            alerts_by_user.append((chunk[row][0], []))
+            current_row = row
+        alerts_by_user[-1][1].append({
+            "type": alert_type,
+            "message": message,
+            "priority": priority,
+            "timestamp": timestamp,
+            "seen": False,
+            "rule": rule,
+            "key": key,
+        })
+    return alerts_by_user, time.perf_counter() - start
+
+
+def run_alert_job(chunk_size=JOB_CHUNK_SIZE, workers=None, policy=None, progress=None):
+    """
+    Generate and store alerts for every stored profile (e.g. as a nightly job)
+
+    Profiles are streamed from storage in chunks, each chunk is evaluated
+    in a worker process, and its alerts are stored with one bulk call while
+    later chunks are still being evaluated. Alerts already stored (by rule
+    key) are skipped and retention applies as for a single profile.
+
+    Args:
+        chunk_size: Profiles per chunk
+        workers: Worker processes (defaults to the CPU count; 1 evaluates
+            in this process)
+        policy: Retention settings (defaults to ALERT_RETENTION)
+        progress: Optional function called with the running stats after each chunk
+
+    Returns:
+        dict: Counts (profiles, alerts raised, alerts added, users that
+        failed to save), whether every held-back save reached disk
+        ("flushed") and seconds per stage: load (reading profiles),
+        evaluate (summed over workers), write, and total wall time
+    """
+    workers = workers or os.cpu_count() or 1
+    rules = get_alert_rules()
+    timestamp = datetime.now().isoformat()
+    stats = {"profiles": 0, "alerts": 0, "added": 0, "failed": 0, "chunks": 0,
+             "load_seconds": 0.0, "evaluate_seconds": 0.0, "write_seconds": 0.0}
+    start = time.perf_counter()
+
+    def chunks():
+        profiles = iter_profiles(chunk_size)
+        while True:
+            load_start = time.perf_counter()
+            chunk = next(profiles, None)
+            stats["load_seconds"] += time.perf_counter() - load_start
+            if chunk is None:
+                return
+            stats["profiles"] += len(chunk)
+            yield chunk
+
+    def store(alerts_by_user, seconds):
+        stats["evaluate_seconds"] += seconds
+        stats["alerts"] += sum(len(alerts) for user_id, alerts in alerts_by_user)
+        write_start = time.perf_counter()
+        for added in add_alerts_bulk(alerts_by_user, policy).values():
+            if added is None:
+                stats["failed"] += 1
+            else:
+                stats["added"] += len(added)
+        stats["write_seconds"] += time.perf_counter() - write_start
+        stats["chunks"] += 1
+        if progress:
+            progress(stats)
+
+    if workers == 1:
+        for chunk in chunks():
+            store(*evaluate_chunk(chunk, timestamp, rules))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rules.rules,)) as pool:
+            pending = deque()
+            for chunk in chunks():
+                pending.append(pool.submit(evaluate_chunk, chunk, timestamp))
+                # Write in submission order once enough chunks are queued
+                while len(pending) >= workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                    store(*pending.popleft().result())
+            while pending:
+                store(*pending.popleft().result())
+
+    write_start = time.perf_counter()
+    stats["flushed"] = flush_writes()
+    stats["write_seconds"] += time.perf_counter() - write_start
+    stats["total_seconds"] = time.perf_counter() - start
+    stats["profiles_per_second"] = stats["profiles"] / stats["total_seconds"] if stats["total_seconds"] else 0.0
+    return stats
+
+
+def format_report(stats):
+    """Describe a run_alert_job result in a few lines"""
+    lines = [
+        f"Profiles: {stats['profiles']:,} in {stats['chunks']:,} chunks "
+        f"({stats['profiles_per_second']:,.0f} profiles/s)",
+        f"Alerts: {stats['alerts']:,} raised, {stats['added']:,} new, {stats['failed']:,} users failed to save",
+        f"Load: {stats['load_seconds']:.2f} s  Evaluate: {stats['evaluate_seconds']:.2f} s (summed over workers)  "
+        f"Write: {stats['write_seconds']:.2f} s  Total: {stats['total_seconds']:.2f} s",
+    ]
+    if not stats.get("flushed", True):
+        lines.append("Some saves were still queued and failed to write; see the errors above")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command line entry point: python -m utils.alert_job"""
+    parser = argparse.ArgumentParser(prog="python -m utils.alert_job",
+                                     description="Generate alerts for every stored profile")
+    parser.add_argument("--chunk-size", type=int, default=JOB_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--quiet", action="store_true", help="Only print the final report")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+
+    def progress(stats):
+        print(f"  {stats['profiles']:,} profiles, {stats['added']:,} new alerts "
+              f"({time.perf_counter() - start:.1f} s)", flush=True)
+
+    stats = run_alert_job(args.chunk_size, args.workers, progress=None if args.quiet else progress)
+    print(format_report(stats))
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
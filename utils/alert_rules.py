@@ -0,0 +1,449 @@
+import hashlib
+import json
+import os
+import string
+import time
+from datetime import datetime
+
+import numpy as np
+
+from utils.records import UserProfile
+
+# pandas is only needed for batch evaluation and is imported there, so
+# single-profile alerts (checked on every page) do not load it
+
+# Optional override of DEFAULT_ALERT_RULES, in the same shape
+ALERT_RULES_FILE = os.path.join("data", "alert_rules.json")
+
+# Each rule checks one metric against thresholds tried in order; the first
+# level that matches raises an alert (like an if/elif chain) and later levels
+# are skipped. A threshold is a number or the name of another metric, and
+# messages are str.format templates with the metric's value as {value}.
+DEFAULT_ALERT_RULES = [
+    {
+        "name": "credit_score",
+        "metric": "credit_score",
+        "levels": [
+            {"op": "<", "threshold": 600, "type": "error", "priority": "high",
+             "message": "Your credit score ({value}) is below 600. Consider improving your credit health."},
+            {"op": "<", "threshold": 700, "type": "warning", "priority": "medium",
+             "message": "Your credit score ({value}) is moderate. Work on improving it for better loan terms."},
+        ],
+    },
+    {
+        "name": "credit_utilization",
+        "metric": "credit_utilization",
+        "levels": [
+            {"op": ">", "threshold": 60, "type": "error", "priority": "high",
+             "message": "High credit utilization ({value}%). Try to keep it below 30% for better credit health."},
+            {"op": ">", "threshold": 30, "type": "warning", "priority": "medium",
+             "message": "Credit utilization ({value}%) is above recommended 30%. Consider reducing it."},
+        ],
+    },
+    {
+        "name": "debt_to_income",
+        "metric": "debt_to_income",
+        "levels": [
+            {"op": ">", "threshold": 40, "type": "error", "priority": "high",
+             "message": "High debt-to-income ratio ({value:.1f}%). Consider reducing debt."},
+            {"op": ">", "threshold": 30, "type": "warning", "priority": "medium",
+             "message": "Debt-to-income ratio ({value:.1f}%) is getting high. Monitor your finances."},
+        ],
+    },
+    {
+        "name": "savings",
+        "metric": "monthly_savings",
+        "levels": [
+            {"op": "<", "threshold": 0, "type": "error", "priority": "high",
+             "message": "You are spending more than your income. Review your expenses immediately."},
+            {"op": "<", "threshold": "min_savings", "type": "warning", "priority": "medium",
+             "message": "Low monthly savings. Aim to save at least 10-20% of your income."},
+        ],
+    },
+    {
+        # General EMI nudge; loans with a due day also get dated reminders (utils/reminders.py)
+        "name": "emi_reminder",
+        "metric": "num_loans",
+        "levels": [
+            {"op": ">", "threshold": 0, "type": "info", "priority": "low",
+             "message": "You have {value} active loan(s). Ensure timely EMI payments."},
+        ],
+    },
+    {
+        "name": "credit_card_reminder",
+        "metric": "num_credit_cards",
+        "levels": [
+            {"op": ">", "threshold": 0, "type": "info", "priority": "low",
+             "message": "Don't forget to pay your credit card bills on time. You have {value} card(s)."},
+        ],
+    },
+]
+
+OPERATORS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+# Profile columns every frame needs (missing columns take the record defaults)
+PROFILE_COLUMNS = ["monthly_income", "monthly_expense", "credit_score", "credit_utilization",
+                   "num_credit_cards", "total_emi", "num_loans"]
+
+
+def _debt_to_income(frame):
+    income = np.asarray(frame["monthly_income"], dtype=float)
+    emi = np.asarray(frame["total_emi"], dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # NaN (no alert) when there is no income to compare against
+        return np.where(income > 0, emi / income * 100, np.nan)
+
+
+# Metrics derived from the profile columns, computed for the whole frame at once
+DERIVED_METRICS = {
+    "debt_to_income": _debt_to_income,
+    "monthly_savings": lambda frame: (np.asarray(frame["monthly_income"]) - np.asarray(frame["monthly_expense"])
+                                      - np.asarray(frame["total_emi"])),
+    "min_savings": lambda frame: np.asarray(frame["monthly_income"]) * 0.1,
+}
+
+# Profile columns each derived metric is computed from
+METRIC_INPUTS = {
+    "debt_to_income": ("monthly_income", "total_emi"),
+    "monthly_savings": ("monthly_income", "monthly_expense", "total_emi"),
+    "min_savings": ("monthly_income",),
+}
+
+
+def load_alert_rules():
+    """
+    Load the alert rule table
+
+    Returns:
+        list: Rules from ALERT_RULES_FILE if it exists, else DEFAULT_ALERT_RULES
+    """
+    if os.path.exists(ALERT_RULES_FILE):
+        try:
+            with open(ALERT_RULES_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error loading alert rules, using defaults: {e}")
+    return DEFAULT_ALERT_RULES
+
+
+def profiles_to_frame(profiles):
+    """
+    Build the metric frame for a batch of profiles
+
+    Args:
+        profiles: List of profile dictionaries or UserProfile records
+
+    Returns:
+        DataFrame: One row per profile with the PROFILE_COLUMNS
+    """
+    import pandas as pd
+
+    columns = UserProfile.to_columns(profiles)
+    offsets = columns["loan_offsets"]
+    emis = columns["loans"]["emi"]
+    # Sum each profile's slice of the flattened loan EMIs
+    total_emi = np.add.reduceat(np.append(emis, 0).astype(float), offsets[:-1]) if len(offsets) > 1 else np.empty(0)
+    counts = np.diff(offsets)
+    total_emi[counts == 0] = 0
+    frame = pd.DataFrame({name: columns[name] for name in PROFILE_COLUMNS if name in columns})
+    frame["total_emi"] = total_emi
+    frame["num_loans"] = counts
+    return frame
+
+
+def profile_inputs(profile):
+    """
+    Get the PROFILE_COLUMNS values of one profile
+
+    Args:
+        profile: Profile dictionary or UserProfile
+
+    Returns:
+        dict: Column name -> value
+    """
+    profile = UserProfile.from_dict(profile)
+    return {
+        "monthly_income": profile.monthly_income,
+        "monthly_expense": profile.monthly_expense,
+        "credit_score": profile.credit_score,
+        "credit_utilization": profile.credit_utilization,
+        "num_credit_cards": profile.num_credit_cards,
+        "total_emi": profile.total_emi,
+        "num_loans": len(profile.current_loans),
+    }
+
+
+def profile_fingerprint(inputs):
+    """Digest of profile_inputs(), equal for profiles that raise the same alerts"""
+    text = json.dumps([inputs[name] for name in PROFILE_COLUMNS])
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _display_value(value):
+    """Show whole numbers without a decimal point, as profile fields are stored"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def alert_key(rule_name, level_index, template, value):
+    """
+    Stable identity of an alert, used to avoid storing it twice
+
+    Built from the rule, the level and a hash of the template parameters as
+    they are shown, so the key survives rewording a message, and two values
+    that display the same (35.04% and 35.03% as "35.0%") are one alert.
+
+    Returns:
+        str: Key such as "credit_score:1:3f2a9c0b1d4e"
+    """
+    params = [format(_display_value(value), spec)
+              for _, name, spec, _ in string.Formatter().parse(template) if name is not None]
+    digest = hashlib.sha1("\x1f".join(params).encode('utf-8')).hexdigest()[:12]
+    return f"{rule_name}:{level_index}:{digest}"
+
+
+class AlertRules:
+    """
+    A compiled alert rule table
+
+    Every rule is evaluated as a whole-column numpy comparison, so checking a
+    million profiles costs a handful of array operations per rule instead of
+    a million passes through Python if/elif blocks.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = rules if rules is not None else load_alert_rules()
+        self._names = [rule["name"] for rule in self.rules]
+        if len(set(self._names)) != len(self._names):
+            raise ValueError("Alert rule names must be unique")
+        for rule in self.rules:
+            for level in rule["levels"]:
+                if level["op"] not in OPERATORS:
+                    raise ValueError(f"Unknown operator {level['op']!r} in alert rule {rule['name']!r}")
+        # Equal for tables with the same rules, to key results across reloads
+        self.digest = hashlib.sha1(json.dumps(self.rules, sort_keys=True).encode('utf-8')).hexdigest()
+
+        # Profile columns each rule reads, to re-run only rules whose inputs changed
+        self.inputs = {}
+        for rule in self.rules:
+            metrics = [rule["metric"]] + [level["threshold"] for level in rule["levels"]
+                                          if isinstance(level["threshold"], str)]
+            self.inputs[rule["name"]] = frozenset(
+                column for metric in metrics for column in METRIC_INPUTS.get(metric, (metric,)))
+
+        # Lookup tables for evaluate(): every (rule, level) pair gets a slot
+        levels = [level for rule in self.rules for level in rule["levels"]]
+        self._level_offsets = np.cumsum([0] + [len(rule["levels"]) for rule in self.rules[:-1]]).astype(np.int64)
+        self._types = sorted({level["type"] for level in levels})
+        self._priorities = sorted({level["priority"] for level in levels})
+        self._type_codes = np.array([self._types.index(level["type"]) for level in levels], dtype=np.int16)
+        self._priority_codes = np.array([self._priorities.index(level["priority"]) for level in levels],
+                                        dtype=np.int16)
+
+    def _metric(self, frame, name, cache):
+        if name not in cache:
+            if name in DERIVED_METRICS:
+                cache[name] = np.asarray(DERIVED_METRICS[name](frame))
+            elif name in frame:
+                cache[name] = np.asarray(frame[name])
+            else:
+                raise ValueError(f"Unknown alert metric: {name!r}")
+        return cache[name]
+
+    def _matches(self, frame, only=None):
+        """Yield (rule index, rows, level per row, metric value per row) for every rule that fires"""
+        cache = {}
+        for rule_index, rule in enumerate(self.rules):
+            if only is not None and rule["name"] not in only:
+                continue
+            values = self._metric(frame, rule["metric"], cache)
+            # Index of the first matching level per row, -1 where none match:
+            # later levels are written first so earlier ones overwrite them
+            chosen = np.full(len(values), -1, dtype=np.int8)
+            for level_index in range(len(rule["levels"]) - 1, -1, -1):
+                level = rule["levels"][level_index]
+                threshold = level["threshold"]
+                if isinstance(threshold, str):
+                    threshold = self._metric(frame, threshold, cache)
+                chosen[OPERATORS[level["op"]](values, threshold)] = level_index
+            rows = np.flatnonzero(chosen >= 0)
+            if len(rows):
+                yield rule_index, rows, chosen[rows], values[rows]
+
+    def _render(self, rule, levels, values):
+        """Format the messages and keys of one rule's alerts, once per distinct (level, value)"""
+        messages = np.empty(len(levels), dtype=object)
+        keys = np.empty(len(levels), dtype=object)
+        for level_index, level in enumerate(rule["levels"]):
+            mask = levels == level_index
+            if not mask.any():
+                continue
+            template = level["message"]
+            if "{" not in template:
+                messages[mask] = template
+                keys[mask] = alert_key(rule["name"], level_index, template, None)
+                continue
+            distinct, inverse = np.unique(values[mask], return_inverse=True)
+            distinct = distinct.tolist()
+            texts = np.array([template.format(value=_display_value(value)) for value in distinct], dtype=object)
+            level_keys = np.array([alert_key(rule["name"], level_index, template, value) for value in distinct],
+                                  dtype=object)
+            messages[mask] = texts[inverse]
+            keys[mask] = level_keys[inverse]
+        return messages, keys
+
+    def evaluate(self, frame, messages=True):
+        """
+        Evaluate every rule over a frame of profiles in one pass
+
+        Args:
+            frame: DataFrame (or dict of arrays) with the PROFILE_COLUMNS,
+                see profiles_to_frame
+            messages: Render alert messages (skip for counts-only runs)
+
+        Returns:
+            DataFrame: One row per raised alert with columns row (position in
+            `frame`), rule, type and priority (categoricals), value, and
+            message and key (see alert_key; both None when messages are not
+            rendered), ordered by row and then by rule order
+        """
+        import pandas as pd
+
+        parts = {"rule": [], "row": [], "level": [], "value": [], "message": [], "key": []}
+        for rule_index, rows, levels, values in self._matches(frame):
+            parts["rule"].append(np.full(len(rows), rule_index, dtype=np.int16))
+            parts["row"].append(rows)
+            parts["level"].append(levels)
+            parts["value"].append(values.astype(float))
+            if messages:
+                rendered, keys = self._render(self.rules[rule_index], levels, values)
+                parts["message"].append(rendered)
+                parts["key"].append(keys)
+
+        empty = {"rule": np.int16, "row": np.int64, "level": np.int8, "value": float, "message": object,
+                 "key": object}
+        columns = {key: np.concatenate(arrays) if arrays else np.empty(0, dtype=empty[key])
+                   for key, arrays in parts.items()}
+        order = np.lexsort((columns["rule"], columns["row"]))
+        rules = columns["rule"][order]
+        # Position of each alert's (rule, level) in the per-level lookup tables
+        levels = self._level_offsets[rules] + columns["level"][order]
+        return pd.DataFrame({
+            "row": columns["row"][order],
+            "rule": pd.Categorical.from_codes(rules, categories=self._names),
+            "type": pd.Categorical.from_codes(self._type_codes[levels], categories=self._types),
+            "priority": pd.Categorical.from_codes(self._priority_codes[levels], categories=self._priorities),
+            "value": columns["value"][order],
+            "message": columns["message"][order] if messages else np.full(len(order), None, dtype=object),
+            "key": columns["key"][order] if messages else np.full(len(order), None, dtype=object),
+        })
+
+    def rules_reading(self, columns):
+        """Names of the rules that read any of the given profile columns"""
+        return {name for name, inputs in self.inputs.items() if inputs & columns}
+
+    def alerts_for_profile(self, profile, timestamp=None, only=None, inputs=None):
+        """
+        Evaluate the rules for a single profile
+
+        Args:
+            profile: Profile dictionary or UserProfile
+            timestamp: ISO timestamp for the alerts (defaults to now)
+            only: Names of the rules to evaluate (None for all)
+            inputs: profile_inputs(profile), when the caller already has it
+
+        Returns:
+            list: Alert dictionaries in rule order
+        """
+        timestamp = timestamp or datetime.now().isoformat()
+        inputs = inputs or profile_inputs(profile)
+        frame = {name: np.array([value]) for name, value in inputs.items()}
+
+        alerts = []
+        for rule_index, rows, levels, values in self._matches(frame, only):
+            rule = self.rules[rule_index]
+            level_index = int(levels[0])
+            level = rule["levels"][level_index]
+            value = values.tolist()[0]
+            alerts.append({
+                "type": level["type"],
+                "message": level["message"].format(value=_display_value(value)),
+                "priority": level["priority"],
+                "timestamp": timestamp,
+                "seen": False,
+                "rule": rule["name"],
+                "key": alert_key(rule["name"], level_index, level["message"], value),
+            })
+        return alerts
+
+
+_default_rules = None
+
+
+def get_alert_rules():
+    """Get the compiled rule table, loading it on first use"""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = AlertRules()
+    return _default_rules
+
+
+def benchmark(count=1_000_000, seed=0):
+    """
+    Time a population-wide evaluation over `count` random profiles
+
+    Args:
+        count: Number of profiles
+        seed: Random seed for the generated profiles
+
+    Returns:
+        dict: Seconds for evaluation with and without messages, and alert count
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    income = rng.integers(0, 200_000, count)
+    frame = pd.DataFrame({
+        "monthly_income": income,
+        "monthly_expense": (income * rng.uniform(0.2, 1.1, count)).round(),
+        "credit_score": rng.integers(300, 901, count),
+        "credit_utilization": rng.integers(0, 101, count),
+        "num_credit_cards": rng.integers(0, 6, count),
+        "total_emi": (income * rng.uniform(0, 0.6, count)).round(),
+        "num_loans": rng.integers(0, 4, count),
+    })
+    rules = get_alert_rules()
+
+    results = {}
+    start = time.perf_counter()
+    alerts = rules.evaluate(frame, messages=False)
+    results["evaluate_seconds"] = time.perf_counter() - start
+    start = time.perf_counter()
+    alerts = rules.evaluate(frame)
+    results["evaluate_with_messages_seconds"] = time.perf_counter() - start
+    results["alerts"] = len(alerts)
+
+    sample = [{"monthly_income": int(income[i]), "monthly_expense": float(frame["monthly_expense"][i]),
+               "credit_score": int(frame["credit_score"][i]), "num_credit_cards": 2,
+               "current_loans": [{"emi": float(frame["total_emi"][i])}]} for i in range(1000)]
+    start = time.perf_counter()
+    for profile in sample:
+        rules.alerts_for_profile(profile)
+    results["single_profile_ms"] = (time.perf_counter() - start) / len(sample) * 1000
+
+    print(f"{count:,} profiles: {results['evaluate_seconds']:.2f} s "
+          f"({results['evaluate_with_messages_seconds']:.2f} s with messages), {results['alerts']:,} alerts")
+    print(f"single profile: {results['single_profile_ms']:.3f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
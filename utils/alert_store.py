@@ -0,0 +1,424 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import uuid
+import zlib
+from datetime import datetime, timedelta
+
+from utils.data_handler import (get_storage, get_user_dir, list_user_ids, load_versioned, resolve_user_id,
+                                update_alerts_bulk, update_alerts_versioned)
+
+# Users whose alert index is kept in memory at once
+MAX_INDEXED_USERS = 1024
+
+# How long alerts stay in the hot list. Alerts older than their priority's
+# TTL are archived, as are older alerts from a rule that has raised a newer
+# one, and the oldest (seen first) beyond max_alerts.
+ALERT_RETENTION = {
+    "ttl_days": {"high": 90, "medium": 30, "low": 7},
+    "max_alerts": 100,
+    "collapse_superseded": True,
+}
+
+# Archived alerts, one JSON object per line, gzip-compressed, in the user's directory
+ALERT_ARCHIVE_FILE = "alerts_archive.jsonl.gz"
+
+# First bytes of every gzip member (magic number and deflate method)
+GZIP_MAGIC = b"\x1f\x8b\x08"
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_alert_id(alert):
+    """
+    Get the id of a stored alert
+
+    Alerts saved before ids existed get one derived from their timestamp and
+    message, so it stays the same however the list is sorted or filtered.
+    """
+    if alert.get('id'):
+        return alert['id']
+    text = f"{alert.get('timestamp', '')}\x1f{alert.get('message', '')}"
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+
+def _dedup_key(alert):
+    """Key an alert is deduplicated on; alerts saved before rule keys existed fall back to their message"""
+    return alert.get('key') or "message:" + alert.get('message', '')
+
+
+def _parse_time(value):
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def apply_retention(alerts, policy=None, now=None):
+    """
+    Split alerts into the ones to keep and the ones to archive
+
+    Args:
+        alerts: Alert dictionaries in stored order
+        policy: Retention settings (defaults to ALERT_RETENTION)
+        now: Time to measure ages against (defaults to now)
+
+    Returns:
+        tuple: (kept, archived) lists, each in stored order
+    """
+    policy = policy or ALERT_RETENTION
+    now = now or datetime.now()
+    ttl_days = policy.get("ttl_days", {})
+    times = [_parse_time(alert.get('timestamp')) for alert in alerts]
+    drop = set()
+
+    for position, alert in enumerate(alerts):
+        ttl = ttl_days.get(alert.get('priority'))
+        # Alerts with no parseable time are never expired
+        if ttl is not None and times[position] is not None and now - times[position] > timedelta(days=ttl):
+            drop.add(position)
+
+    if policy.get("collapse_superseded", False):
+        latest = {}
+        for position, alert in enumerate(alerts):
+            rule = alert.get('rule')
+            if rule is None or position in drop:
+                continue
+            previous = latest.get(rule)
+            if previous is None or (times[position] or datetime.min) >= (times[previous] or datetime.min):
+                if previous is not None:
+                    drop.add(previous)
+                latest[rule] = position
+            else:
+                drop.add(position)
+
+    max_alerts = policy.get("max_alerts")
+    remaining = [position for position in range(len(alerts)) if position not in drop]
+    if max_alerts is not None and len(remaining) > max_alerts:
+        # Oldest first, seen before unseen
+        remaining.sort(key=lambda position: (not alerts[position].get('seen', False),
+                                             times[position] or datetime.min, position))
+        drop.update(remaining[:len(remaining) - max_alerts])
+
+    kept = [alert for position, alert in enumerate(alerts) if position not in drop]
+    archived = [alert for position, alert in enumerate(alerts) if position in drop]
+    return kept, archived
+
+
+class AlertIndex:
+    """
+    Lookup tables over one version of a user's stored alerts
+
+    Maps alert ids to list positions, holds the set of dedup keys and the
+    number of unseen alerts, so none of these needs a pass over the list.
+    """
+
+    __slots__ = ("version", "positions", "keys", "unseen", "legacy")
+
+    def __init__(self, alerts, version):
+        self.version = version
+        self.positions = {get_alert_id(alert): position for position, alert in enumerate(alerts)}
+        self.keys = {_dedup_key(alert) for alert in alerts}
+        self.unseen = sum(1 for alert in alerts if not alert.get('seen', False))
+        # Alerts without a rule key can only be matched by message
+        self.legacy = any(not alert.get('key') for alert in alerts)
+
+    def knows(self, alert):
+        """Check whether an equivalent alert is already stored"""
+        if _dedup_key(alert) in self.keys:
+            return True
+        return self.legacy and "message:" + alert.get('message', '') in self.keys
+
+
+class AlertStore:
+    """
+    A user's alerts with O(1) unseen count, duplicate check and id lookup
+
+    The index is built once per version of the stored alerts and shared by
+    every AlertStore of the process. Each call compares the stored version
+    (a stat for JSON files, one indexed row for SQLite) and only rebuilds
+    the index when another session changed the alerts. Changes go through
+    update_alerts' compare-and-swap, and nothing is written when there is
+    nothing new. The JSON backend rewrites the alerts file on each change;
+    SQLite writes only the rows that changed.
+    """
+
+    def __init__(self, user_id=None):
+        self.user_id = resolve_user_id(user_id)
+
+    def _cache_key(self):
+        return (id(get_storage()), self.user_id)
+
+    def _index(self):
+        storage = get_storage()
+        version = storage.record_version("alerts", self.user_id)
+        with _indexes_lock:
+            index = _indexes.get(self._cache_key())
+        if index is not None and index.version == version:
+            return index
+        alerts, version = load_versioned("alerts", self.user_id)
+        return self._remember(alerts or [], version)
+
+    def _remember(self, alerts, version):
+        index = AlertIndex(alerts, version)
+        with _indexes_lock:
+            _indexes.pop(self._cache_key(), None)
+            _indexes[self._cache_key()] = index
+            while len(_indexes) > MAX_INDEXED_USERS:
+                del _indexes[next(iter(_indexes))]
+        return index
+
+    def count_unseen(self):
+        """Number of alerts not yet marked as seen"""
+        return self._index().unseen
+
+    def contains(self, alert_id):
+        """Check whether an alert with this id is stored"""
+        return alert_id in self._index().positions
+
+    def add(self, alerts, policy=None):
+        """
+        Store the alerts that are not already stored (by dedup key)
+
+        The retention policy is applied in the same save, so alerts the new
+        ones supersede are archived right away.
+
+        Args:
+            alerts: Alert dictionaries, e.g. from AlertRules.alerts_for_profile
+            policy: Retention settings (defaults to ALERT_RETENTION)
+
+        Returns:
+            list: The alerts that were added, each with its new "id"; None if
+            they could not be saved
+        """
+        index = self._index()
+        new_alerts = [alert for alert in alerts if not index.knows(alert)]
+        if not new_alerts:
+            return []
+
+        added = []
+        return added if self._update(self._merge(new_alerts, added, policy)) else None
+
+    def _merge(self, new_alerts, added, policy):
+        """Build the update that appends the alerts not yet stored (collected in `added`) and applies retention"""
+        def merge(existing):
+            # Check against the freshly loaded list: another session may have
+            # stored some of these since the index was built
+            current = AlertIndex(existing, None)
+            added.clear()
+            for alert in new_alerts:
+                if not current.knows(alert):
+                    alert = {**alert, "id": alert.get("id") or uuid.uuid4().hex[:12]}
+                    current.keys.add(_dedup_key(alert))
+                    existing.append(alert)
+                    added.append(alert)
+            if not added:
+                return None
+            return self._retain(existing, policy)
+
+        return merge
+
+    def _retain(self, alerts, policy, now=None):
+        """Apply the retention policy, archiving what it drops before the save"""
+        kept, archived = apply_retention(alerts, policy, now)
+        if archived:
+            # Written before the save so a crash can only archive an alert
+            # twice (load_alert_archive skips repeats), never lose it
+            _append_archive(self._archive_path(), archived)
+        return kept
+
+    def _archive_path(self):
+        return os.path.join(get_user_dir(self.user_id), ALERT_ARCHIVE_FILE)
+
+    def compact(self, policy=None, now=None):
+        """
+        Archive the alerts the retention policy no longer keeps
+
+        Args:
+            policy: Retention settings (defaults to ALERT_RETENTION)
+            now: Time to measure ages against (defaults to now)
+
+        Returns:
+            dict: Number of alerts kept and archived; None if the save failed
+        """
+        alerts, version = load_versioned("alerts", self.user_id)
+        kept, archived = apply_retention(alerts or [], policy, now)
+        if not archived:
+            return {"kept": len(kept), "archived": 0}
+
+        counts = {}
+
+        def prune(current):
+            result = self._retain(current, policy, now)
+            counts.update(kept=len(result), archived=len(current) - len(result))
+            return result
+
+        return counts if self._update(prune) else None
+
+    def mark_seen(self, alert_id):
+        """
+        Mark one alert as seen by id
+
+        The alert is found through the index's id -> position table; the list
+        is only scanned if another session reordered it since the index was
+        built. Nothing is written if the alert is already seen.
+
+        Returns:
+            bool: True if the alert exists and is now marked seen
+        """
+        position = self._index().positions.get(alert_id)
+        if position is None:
+            return False
+        found = [False]
+
+        def mark(alerts):
+            at = position
+            if at >= len(alerts) or get_alert_id(alerts[at]) != alert_id:
+                at = next((i for i, alert in enumerate(alerts) if get_alert_id(alert) == alert_id), None)
+            found[0] = at is not None
+            if at is None or alerts[at].get('seen', False):
+                return None
+            alerts[at]['seen'] = True
+            return alerts
+
+        return self._update(mark) and found[0]
+
+    def mark_all_seen(self):
+        """Mark every alert as seen"""
+        if not self._index().unseen:
+            return True
+
+        def mark(alerts):
+            unseen = [alert for alert in alerts if not alert.get('seen', False)]
+            if not unseen:
+                return None
+            for alert in unseen:
+                alert['seen'] = True
+            return alerts
+
+        return self._update(mark)
+
+    def _update(self, update):
+        """Apply `update` with compare-and-swap and index the saved result"""
+        alerts, version = update_alerts_versioned(update, self.user_id)
+        if alerts is None:
+            return False
+        self._remember(alerts, version)
+        return True
+
+
+def add_alerts_bulk(alerts_by_user, policy=None):
+    """
+    Store new alerts for many users in one storage call (e.g. from a batch job)
+
+    Each user's alerts are deduplicated and retained as by AlertStore.add,
+    without first consulting the in-memory index.
+
+    Args:
+        alerts_by_user: List of (user_id, alerts) pairs
+        policy: Retention settings (defaults to ALERT_RETENTION)
+
+    Returns:
+        dict: user_id -> alerts added; None for users whose alerts could not be saved
+    """
+    added = {}
+    updates = []
+    for user_id, alerts in alerts_by_user:
+        store = AlertStore(user_id)
+        added[store.user_id] = []
+        updates.append((store.user_id, store._merge(alerts, added[store.user_id], policy)))
+    for user_id, (alerts, version) in update_alerts_bulk(updates).items():
+        if alerts is None:
+            added[user_id] = None
+    return added
+
+
+def _append_archive(file_path, alerts):
+    """Append alerts to a gzip archive as a new member (readers see one stream)"""
+    directory = os.path.dirname(file_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    text = "".join(json.dumps(alert, ensure_ascii=False) + "\n" for alert in alerts)
+    with open(file_path, 'ab') as f:
+        f.write(gzip.compress(text.encode('utf-8')))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def load_alert_archive(user_id=None):
+    """
+    Read a user's archived alerts
+
+    Returns:
+        list: Archived alerts, oldest archive first, each alert once
+    """
+    file_path = os.path.join(get_user_dir(resolve_user_id(user_id)), ALERT_ARCHIVE_FILE)
+    if not os.path.exists(file_path):
+        return []
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    alerts = []
+    seen_ids = set()
+    for text in _archive_members(data, file_path):
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            alert = json.loads(line)
+            alert_id = get_alert_id(alert)
+            if alert_id not in seen_ids:
+                seen_ids.add(alert_id)
+                alerts.append(alert)
+    return alerts
+
+
+def _archive_members(data, file_path):
+    """
+    Decompress each gzip member of an archive
+
+    A member torn by a crash mid-append is skipped and reading resumes at
+    the next member header, so later appends are not lost with it.
+    """
+    position = 0
+    while position < len(data):
+        decompressor = zlib.decompressobj(wbits=31)
+        try:
+            text = decompressor.decompress(data[position:])
+            complete = decompressor.eof
+        except zlib.error:
+            complete = False
+        if complete:
+            yield text.decode('utf-8')
+            position = len(data) - len(decompressor.unused_data)
+            continue
+        print(f"Skipping damaged alert archive member at byte {position} of {file_path}")
+        position = data.find(GZIP_MAGIC, position + 1)
+        if position < 0:
+            break
+
+
+def compact_all_alerts(policy=None, now=None):
+    """
+    Apply the retention policy to every user's alerts (e.g. as a nightly job)
+
+    Returns:
+        dict: Users processed and alerts kept and archived in total
+    """
+    summary = {"users": 0, "kept": 0, "archived": 0, "failed": 0}
+    for user_id in list_user_ids():
+        result = AlertStore(user_id).compact(policy, now)
+        summary["users"] += 1
+        if result is None:
+            summary["failed"] += 1
+            continue
+        summary["kept"] += result["kept"]
+        summary["archived"] += result["archived"]
+    return summary
+
+
+if __name__ == "__main__":
+    summary = compact_all_alerts()
+    print(f"Compacted alerts of {summary['users']} users: {summary['kept']} kept, "
+          f"{summary['archived']} archived, {summary['failed']} failed")
@@ -1,142 +1,106 @@
-from datetime import datetime, timedelta
-from utils.data_handler import load_alerts, save_alerts
+import threading
 
-def generate_alerts(profile):
+from utils.alert_rules import get_alert_rules, profile_fingerprint, profile_inputs
+from utils.alert_store import AlertStore
+from utils.data_handler import get_storage, load_alerts, resolve_user_id
+from utils.reminders import get_reminder_scheduler
+
+# Users whose last evaluated profile is remembered at once
+MAX_REMEMBERED_PROFILES = 1024
+
+# (storage location, user, rule table digest) -> (fingerprint, profile_inputs)
+# of the last stored run
+_last_runs = {}
+_last_runs_lock = threading.Lock()
+
+def generate_alerts(profile, user_id=None):
     """
     Generate alerts based on user profile
     
+    The checks are the rule table in utils/alert_rules.py (or
+    data/alert_rules.json when present).
+    
     Args:
-        profile: User profile dictionary
+        profile: User profile dictionary or UserProfile
+        user_id: User the alerts belong to (defaults to the default user)
     
     Returns:
         list: List of alert dictionaries
     """
-    alerts = []
-    
-    # Check credit score
-    credit_score = profile.get('credit_score', 0)
-    if credit_score < 600:
-        alerts.append({
-            "type": "error",
-            "message": f"Your credit score ({credit_score}) is below 600. Consider improving your credit health.",
-            "priority": "high",
-            "timestamp": datetime.now().isoformat(),
-            "seen": False
-        })
-    elif credit_score < 700:
-        alerts.append({
-            "type": "warning",
-            "message": f"Your credit score ({credit_score}) is moderate. Work on improving it for better loan terms.",
-            "priority": "medium",
-            "timestamp": datetime.now().isoformat(),
-            "seen": False
-        })
-    
-    # Check credit utilization
-    credit_utilization = profile.get('credit_utilization', 0)
-    if credit_utilization > 60:
-        alerts.append({
-            "type": "error",
-            "message": f"High credit utilization ({credit_utilization}%). Try to keep it below 30% for better credit health.",
-            "priority": "high",
-            "timestamp": datetime.now().isoformat(),
-            "seen": False
-        })
-    elif credit_utilization > 30:
-        alerts.append({
-            "type": "warning",
-            "message": f"Credit utilization ({credit_utilization}%) is above recommended 30%. Consider reducing it.",
-            "priority": "medium",
-            "timestamp": datetime.now().isoformat(),
-            "seen": False
-        })
-    
-    # Check debt-to-income ratio
-    monthly_income = profile.get('monthly_income', 0)
-    current_loans = profile.get('current_loans', [])
-    total_emi = sum([loan.get('emi', 0) for loan in current_loans])
-    
-    if monthly_income > 0:
-        debt_to_income = (total_emi / monthly_income) * 100
-        if debt_to_income > 40:
-            alerts.append({
-                "type": "error",
-                "message": f"High debt-to-income ratio ({debt_to_income:.1f}%). Consider reducing debt.",
-                "priority": "high",
-                "timestamp": datetime.now().isoformat(),
-                "seen": False
-            })
-        elif debt_to_income > 30:
-            alerts.append({
-                "type": "warning",
-                "message": f"Debt-to-income ratio ({debt_to_income:.1f}%) is getting high. Monitor your finances.",
-                "priority": "medium",
-                "timestamp": datetime.now().isoformat(),
-                "seen": False
-            })
-    
-    # Check savings
-    monthly_expense = profile.get('monthly_expense', 0)
-    monthly_savings = monthly_income - monthly_expense - total_emi
-    if monthly_savings < 0:
-        alerts.append({
-            "type": "error",
-            "message": "You are spending more than your income. Review your expenses immediately.",
-            "priority": "high",
-            "timestamp": datetime.now().isoformat(),
-            "seen": False
-        })
-    elif monthly_savings < (monthly_income * 0.1):
-        alerts.append({
-            "type": "warning",
-            "message": "Low monthly savings. Aim to save at least 10-20% of your income.",
-            "priority": "medium",
-            "timestamp": datetime.now().isoformat(),
-            "seen": False
-        })
-    
-    # EMI reminders (simulated - in real app, would check actual due dates)
-    if current_loans:
-        alerts.append({
-            "type": "info",
-            "message": f"You have {len(current_loans)} active loan(s). Ensure timely EMI payments.",
-            "priority": "low",
-            "timestamp": datetime.now().isoformat(),
-            "seen": False
-        })
-    
-    # Credit card reminders
-    num_credit_cards = profile.get('num_credit_cards', 0)
-    if num_credit_cards > 0:
-        alerts.append({
-            "type": "info",
-            "message": f"Don't forget to pay your credit card bills on time. You have {num_credit_cards} card(s).",
-            "priority": "low",
-            "timestamp": datetime.now().isoformat(),
-            "seen": False
-        })
-    
-    # Save alerts
-    existing_alerts = load_alerts()
-    # Merge with existing alerts (avoid duplicates)
-    alert_messages = {alert.get('message') for alert in existing_alerts}
-    new_alerts = [alert for alert in alerts if alert.get('message') not in alert_messages]
-    existing_alerts.extend(new_alerts)
-    save_alerts(existing_alerts)
-    
-    return existing_alerts
+    store_new_alerts(profile, user_id)
+    return load_alerts(user_id)
+
+def store_new_alerts(profile, user_id=None):
+    """
+    Evaluate the alert rules for a profile and store alerts not already stored
+
+    Duplicates are recognised by rule key (see utils/alert_rules.alert_key),
+    and nothing is written when every alert is already stored.
+
+    The run is incremental: when the alert-relevant profile fields match the
+    last run for this user, nothing is evaluated or loaded, and otherwise
+    only the rules reading a changed field are evaluated.
+
+    Due-date reminders of the profile's loans and cards are (re)scheduled
+    and any that are due are stored first (see utils/reminders.py); with
+    nothing due this is one look at the top of the reminder queue.
 
-def get_unseen_alerts_count():
+    Args:
+        profile: User profile dictionary or UserProfile
+        user_id: User the alerts belong to (defaults to the default user)
+
+    Returns:
+        list: The alerts that were added
+    """
+    rules = get_alert_rules()
+    user_id = resolve_user_id(user_id)
+    scheduler = get_reminder_scheduler()
+    scheduler.sync_profile(profile, user_id)
+    scheduler.run_due()
+
+    inputs = profile_inputs(profile)
+    fingerprint = profile_fingerprint(inputs)
+    run_key = (get_storage().location, user_id, rules.digest)
+
+    with _last_runs_lock:
+        last_run = _last_runs.get(run_key)
+    if last_run is not None and last_run[0] == fingerprint:
+        return []
+
+    only = None
+    if last_run is not None:
+        changed = {name for name, value in inputs.items() if last_run[1].get(name) != value}
+        only = rules.rules_reading(changed)
+
+    alerts = rules.alerts_for_profile(profile, only=only, inputs=inputs)
+    added = AlertStore(user_id).add(alerts)
+    if added is None:
+        return []
+
+    with _last_runs_lock:
+        _last_runs.pop(run_key, None)
+        _last_runs[run_key] = (fingerprint, inputs)
+        while len(_last_runs) > MAX_REMEMBERED_PROFILES:
+            del _last_runs[next(iter(_last_runs))]
+    return added
+
+def get_unseen_alerts_count(user_id=None):
     """Get count of unseen alerts"""
-    alerts = load_alerts()
-    unseen = [alert for alert in alerts if not alert.get('seen', False)]
-    return len(unseen)
-
-def mark_alert_as_seen(alert_index):
-    """Mark an alert as seen"""
-    alerts = load_alerts()
-    if 0 <= alert_index < len(alerts):
-        alerts[alert_index]['seen'] = True
-        save_alerts(alerts)
-        return True
-    return False
+    return AlertStore(user_id).count_unseen()
+
+def mark_alert_as_seen(alert_id, user_id=None):
+    """
+    Mark an alert as seen
+
+    Args:
+        alert_id: Id of the alert (see get_alert_id)
+        user_id: User the alert belongs to
+
+    Returns:
+        bool: True if the alert was found and marked
+    """
+    return AlertStore(user_id).mark_seen(alert_id)
+
+def mark_all_alerts_as_seen(user_id=None):
+    """Mark every alert as seen"""
+    return AlertStore(user_id).mark_all_seen()
@@ -0,0 +1,397 @@
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.platypus import Flowable, SimpleDocTemplate, Table, Paragraph, Spacer
+from datetime import date, datetime, timedelta
+from itertools import islice
+import io
+import os
+import time
+import tracemalloc
+import uuid
+
+import numpy as np
+
+from utils.debt_planner import MAX_SIMULATION_MONTHS, get_loan_terms, simulate_debt_payoff
+from utils.pdf_generator import DATA_TABLE_STYLE, HEADING_STYLE, REPORTS_DIR, STYLES, TITLE_STYLE, count_pages
+from utils.records import UserProfile
+from utils.score_series import CHART_MAX_POINTS, parse_timestamp
+
+# Extra monthly payments compared in the what-if projections, as a
+# fraction of monthly income (0 is the minimum-payments baseline)
+WHAT_IF_EXTRA_SHARES = (0.0, 0.05, 0.10, 0.20)
+
+# Chart size and line colours (one per series, reused in order)
+CHART_WIDTH = 6.5 * inch
+CHART_HEIGHT = 2.6 * inch
+CHART_COLORS = [colors.HexColor('#6C63FF'), colors.HexColor('#FF6584'),
+                colors.HexColor('#2EC4B6'), colors.HexColor('#FF9F1C')]
+
+# Fixed row heights, so a table page's row count is known without measuring
+TABLE_HEADER_HEIGHT = 24
+TABLE_ROW_HEIGHT = 14
+
+AMORTIZATION_HEADER = ['Month', 'Payment', 'Interest', 'Principal', 'Balance']
+AMORTIZATION_COL_WIDTHS = [0.9 * inch, 1.4 * inch, 1.4 * inch, 1.4 * inch, 1.5 * inch]
+
+MICROSECONDS_PER_DAY = 86_400_000_000
+
+
+def amortization_schedule(balance, rate, emi, max_months=MAX_SIMULATION_MONTHS):
+    """
+    Month-by-month repayment of a loan, generated lazily
+
+    Args:
+        balance: Outstanding balance
+        rate: Annual interest rate (percentage)
+        emi: Monthly payment
+        max_months: Months to stop after if the EMI never clears the balance
+
+    Yields:
+        tuple: (month, payment, interest, principal, balance after payment)
+    """
+    monthly_rate = (rate / 100) / 12
+    month = 0
+    while balance > 0.005 and month < max_months:
+        month += 1
+        interest = balance * monthly_rate
+        payment = min(emi, balance + interest)
+        principal = payment - interest
+        balance -= principal
+        yield month, payment, interest, principal, max(balance, 0.0)
+
+
+class StreamingTable(Flowable):
+    """
+    A long table whose rows are pulled from an iterator one page at a time
+
+    Each time the table is laid out it takes only the rows that fit in the
+    space left on the page and becomes an ordinary Table of those rows plus
+    a StreamingTable for the rest, so a table of thousands of rows never
+    holds more than a page of cells. Rows have a fixed height, and the
+    header row is repeated on every page.
+    """
+
+    def __init__(self, header, rows, col_widths, style=DATA_TABLE_STYLE,
+                 header_height=TABLE_HEADER_HEIGHT, row_height=TABLE_ROW_HEIGHT):
+        Flowable.__init__(self)
+        self.header = header
+        self.rows = iter(rows)
+        self.col_widths = col_widths
+        self.style = style
+        self.header_height = header_height
+        self.row_height = row_height
+        # One row read ahead, to know whether anything is left
+        self._next = next(self.rows, None)
+
+    def _rows_fitting(self, height):
+        return max(0, int((height - self.header_height) // self.row_height))
+
+    def _table(self, rows):
+        table = Table([self.header] + rows, colWidths=self.col_widths,
+                      rowHeights=[self.header_height] + [self.row_height] * len(rows))
+        table.setStyle(self.style)
+        return table
+
+    def wrap(self, availWidth, availHeight):
+        # Always taller than the space offered, so the frame splits it and
+        # only a page of rows is ever materialised
+        self.width = sum(self.col_widths)
+        self.height = availHeight + 1 if self._next is not None else self.header_height
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        count = self._rows_fitting(availHeight)
+        if self._next is None:
+            return [self._table([])] if availHeight >= self.header_height else []
+        if count == 0:
+            return []
+        rows = [self._next] + list(islice(self.rows, count - 1))
+        self._next = next(self.rows, None)
+        if self._next is None:
+            return [self._table(rows)]
+        # The rest is this same object; clear the mark the document leaves on
+        # a flowable that did not fit, or the next page break would be an error
+        self.__dict__.pop('_postponed', None)
+        return [self._table(rows), self]
+
+    def draw(self):
+        # Only reached for an empty table that fits as it is; a Table has to
+        # be wrapped before it can be drawn
+        table = self._table([])
+        table.wrapOn(self.canv, self.width, self.height)
+        table.drawOn(self.canv, 0, 0)
+
+
+def year_score_points(series, generated_on=None, max_points=CHART_MAX_POINTS):
+    """
+    Get the credit scores of the year before the report date for the chart
+
+    Args:
+        series: ScoreSeries of the user (e.g. from load_score_series), or None
+        generated_on: Report date (defaults to today)
+        max_points: Most points to return; longer years are downsampled
+
+    Returns:
+        tuple: (timestamps, scores) arrays, in microseconds since the epoch
+    """
+    if series is None:
+        return np.empty(0, np.int64), np.empty(0)
+    generated_on = generated_on or datetime.now().date()
+    end = parse_timestamp((generated_on + timedelta(days=1)).isoformat())
+    start = parse_timestamp((generated_on - timedelta(days=365)).isoformat())
+    return series.downsample(max_points, start, end)
+
+
+def _month_label(day):
+    return date.fromordinal(int(day)).strftime('%b %y')
+
+
+def score_trend_chart(timestamps, scores):
+    """Line chart of credit score over time as a vector Drawing"""
+    drawing = Drawing(CHART_WIDTH, CHART_HEIGHT)
+    # Days since 0001-01-01, so axis labels convert straight back to dates
+    epoch = date(1970, 1, 1).toordinal()
+    days = np.asarray(timestamps, dtype=np.int64) / MICROSECONDS_PER_DAY + epoch
+    plot = LinePlot()
+    plot.x, plot.y = 50, 30
+    plot.width, plot.height = CHART_WIDTH - 70, CHART_HEIGHT - 50
+    plot.data = [list(zip(days.tolist(), np.asarray(scores, dtype=float).tolist()))]
+    plot.lines[0].strokeColor = CHART_COLORS[0]
+    plot.lines[0].strokeWidth = 1.5
+    plot.xValueAxis.labelTextFormat = _month_label
+    plot.xValueAxis.labels.fontSize = 8
+    plot.yValueAxis.labels.fontSize = 8
+    low, high = float(np.min(scores)), float(np.max(scores))
+    plot.yValueAxis.valueMin = max(300, low - 20)
+    plot.yValueAxis.valueMax = min(900, high + 20)
+    drawing.add(plot)
+    return drawing
+
+
+def dti_projection_chart(projections):
+    """Debt-to-income ratio over the coming months for each what-if scenario"""
+    drawing = Drawing(CHART_WIDTH, CHART_HEIGHT)
+    plot = LinePlot()
+    plot.x, plot.y = 50, 30
+    plot.width, plot.height = CHART_WIDTH - 170, CHART_HEIGHT - 50
+    plot.data = [list(enumerate(path or [0.0])) for label, path in projections]
+    for i, (label, path) in enumerate(projections):
+        color = CHART_COLORS[i % len(CHART_COLORS)]
+        plot.lines[i].strokeColor = color
+        plot.lines[i].strokeWidth = 1.5
+        legend_y = CHART_HEIGHT - 30 - i * 14
+        drawing.add(String(CHART_WIDTH - 110, legend_y, label, fontSize=8, fillColor=color))
+    plot.xValueAxis.labels.fontSize = 8
+    plot.yValueAxis.labels.fontSize = 8
+    plot.yValueAxis.valueMin = 0
+    drawing.add(plot)
+    return drawing
+
+
+def _money(value):
+    return f'₹{value:,.0f}'
+
+
+def generate_annual_report(profile, score_points=None, filepath=None, generated_on=None, stream_tables=True):
+    """
+    Generate an annual financial report PDF
+
+    Covers the credit score trend of the past year, what-if projections of
+    paying extra towards loans, and a full amortization table per loan.
+    Charts are reportlab vector graphics and the amortization tables are
+    StreamingTables, so memory stays flat however many rows they have.
+
+    Args:
+        profile: User profile dictionary or UserProfile
+        score_points: (timestamps, scores) of the year, e.g. from year_score_points()
+        filepath: Where to write the PDF: a path or a binary file object
+            (defaults to a timestamped file in REPORTS_DIR)
+        generated_on: Report date (defaults to today)
+        stream_tables: False builds each amortization table as one Table
+            (for comparison in benchmark())
+
+    Returns:
+        str: Path to generated PDF file (or the file object written to)
+    """
+    profile = UserProfile.from_dict(profile)
+    generated_on = generated_on or datetime.now().date()
+    timestamps, scores = score_points if score_points is not None else ([], [])
+
+    if filepath is None:
+        filename = f"annual_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.pdf"
+        filepath = os.path.join(REPORTS_DIR, filename)
+
+    reports_dir = os.path.dirname(filepath) if isinstance(filepath, str) else None
+    if reports_dir and not os.path.exists(reports_dir):
+        os.makedirs(reports_dir, exist_ok=True)
+
+    doc = SimpleDocTemplate(filepath, pagesize=A4)
+    story = []
+
+    story.append(Paragraph("Captain Credo - Annual Financial Report", TITLE_STYLE))
+    story.append(Spacer(1, 0.2*inch))
+    period_start = generated_on - timedelta(days=365)
+    story.append(Paragraph(
+        f"Generated on: {generated_on.strftime('%B %d, %Y')} &nbsp;|&nbsp; "
+        f"Period: {period_start.strftime('%b %Y')} - {generated_on.strftime('%b %Y')}", STYLES['Normal']))
+    story.append(Spacer(1, 0.3*inch))
+
+    # Year in summary
+    loans = profile.current_loans
+    terms = [get_loan_terms(loan) for loan in loans]
+    outstanding = sum(balance for balance, rate, emi in terms)
+    in_a_year = 0.0
+    for balance, rate, emi in terms:
+        last = None
+        for last in islice(amortization_schedule(balance, rate, emi), 12):
+            pass
+        in_a_year += last[4] if last is not None and last[0] == 12 else 0.0
+
+    story.append(Paragraph("Year in Summary", HEADING_STYLE))
+    summary_data = [['Metric', 'Value'], ['Current Credit Score', str(profile.credit_score)]]
+    if len(scores):
+        change = scores[-1] - scores[0]
+        summary_data += [
+            ['Score Change Over the Year', f'{change:+.0f} ({scores[0]:.0f} to {scores[-1]:.0f})'],
+            ['Lowest / Highest Score', f'{np.min(scores):.0f} / {np.max(scores):.0f}'],
+        ]
+    summary_data += [
+        ['EMI Paid per Year', _money(profile.total_emi * 12)],
+        ['Outstanding Debt', _money(outstanding)],
+        ['Outstanding in 12 Months', _money(in_a_year)],
+    ]
+    summary_table = Table(summary_data, colWidths=[3*inch, 3*inch])
+    summary_table.setStyle(DATA_TABLE_STYLE)
+    story.append(summary_table)
+    story.append(Spacer(1, 0.3*inch))
+
+    # Credit score trend
+    story.append(Paragraph("Credit Score Trend", HEADING_STYLE))
+    if len(scores) >= 2:
+        story.append(score_trend_chart(timestamps, scores))
+    else:
+        story.append(Paragraph("Not enough credit history in the past year to chart a trend.", STYLES['Normal']))
+    story.append(Spacer(1, 0.3*inch))
+
+    if loans:
+        # What-if projections (avalanche: extra goes to the highest rate first)
+        story.append(Paragraph("What-if: Paying Extra Each Month", HEADING_STYLE))
+        income = profile.monthly_income
+        extras = sorted({round(income * share) for share in WHAT_IF_EXTRA_SHARES})
+        whatif_data = [['Extra per Month', 'Debt-free In', 'Total Interest', 'Interest Saved']]
+        projections = []
+        for extra in extras:
+            result = simulate_debt_payoff(profile, extra, strategies=["avalanche"])
+            plan = result["baseline"] if extra == 0 else result["strategies"]["avalanche"]
+            months = plan["months_to_debt_free"]
+            whatif_data.append([
+                _money(extra),
+                f'{months} months' if months is not None else f'over {MAX_SIMULATION_MONTHS} months',
+                _money(plan["total_interest"]),
+                _money(plan["interest_saved"]),
+            ])
+            projections.append(("Minimum EMIs" if extra == 0 else f"+{_money(extra)}/month", plan["dti_path"]))
+        whatif_table = Table(whatif_data, colWidths=[1.6*inch, 1.6*inch, 1.6*inch, 1.6*inch])
+        whatif_table.setStyle(DATA_TABLE_STYLE)
+        story.append(whatif_table)
+        story.append(Spacer(1, 0.2*inch))
+        story.append(Paragraph("Debt-to-income ratio (%) by month", STYLES['Normal']))
+        story.append(dti_projection_chart(projections))
+        story.append(Spacer(1, 0.3*inch))
+
+        # Amortization per loan
+        for i, (loan, (balance, rate, emi)) in enumerate(zip(loans, terms), 1):
+            story.append(Paragraph(
+                f"Loan {i} Amortization: {_money(balance)} at {rate:g}% with EMI {_money(emi)}", HEADING_STYLE))
+            if emi <= 0:
+                story.append(Paragraph("No EMI or remaining tenure is set for this loan.", STYLES['Normal']))
+                story.append(Spacer(1, 0.3*inch))
+                continue
+            rows = (
+                [str(month), _money(payment), _money(interest), _money(principal), _money(left)]
+                for month, payment, interest, principal, left in amortization_schedule(balance, rate, emi)
+            )
+            if stream_tables:
+                story.append(StreamingTable(AMORTIZATION_HEADER, rows, AMORTIZATION_COL_WIDTHS))
+            else:
+                table = Table([AMORTIZATION_HEADER] + list(rows), colWidths=AMORTIZATION_COL_WIDTHS, repeatRows=1)
+                table.setStyle(DATA_TABLE_STYLE)
+                story.append(table)
+            story.append(Spacer(1, 0.3*inch))
+
+    story.append(Spacer(1, 0.3*inch))
+    story.append(Paragraph("This is a financial advisory report. For professional financial advice, consult a certified financial advisor.",
+                          STYLES['Italic']))
+
+    doc.build(story)
+
+    return filepath
+
+
+def render_annual_report(profile, score_points=None, stream_tables=True):
+    """Render the annual report in memory and return the PDF bytes"""
+    output = io.BytesIO()
+    generate_annual_report(profile, score_points, output, stream_tables=stream_tables)
+    return output.getvalue()
+
+
+def benchmark(loans=10, tenure_months=MAX_SIMULATION_MONTHS, history_points=100_000):
+    """
+    Time an annual report with long amortization tables and compare peak
+    memory of StreamingTable against building each table in one piece
+
+    Args:
+        loans: Loans in the profile (each gets `tenure_months` table rows)
+        tenure_months: Remaining tenure of every loan
+        history_points: Credit score observations over the year (downsampled
+            to CHART_MAX_POINTS for the chart)
+
+    Returns:
+        dict: Rows, pages, seconds and peak traced memory (MiB) of both ways
+    """
+    profile = {
+        "monthly_income": 400_000, "monthly_expense": 100_000, "credit_score": 720,
+        "current_loans": [
+            {"amount": 2_000_000, "emi": 18_000, "remaining_tenure": tenure_months, "interest_rate": 9 + i % 5}
+            for i in range(loans)
+        ],
+    }
+    today = datetime.now().date()
+    end = parse_timestamp(today.isoformat())
+    timestamps = np.linspace(end - 365 * MICROSECONDS_PER_DAY, end, history_points).astype(np.int64)
+    scores = 700 + 50 * np.sin(np.linspace(0, 6, history_points))
+    keep = np.linspace(0, history_points - 1, CHART_MAX_POINTS).astype(int)
+    score_points = (timestamps[keep], scores[keep])
+
+    def measure(stream_tables):
+        tracemalloc.start()
+        start = time.perf_counter()
+        pdf = render_annual_report(profile, score_points, stream_tables)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return pdf, seconds, peak / 2 ** 20
+
+    rows = sum(1 for loan in profile["current_loans"] for _ in amortization_schedule(*get_loan_terms(loan)))
+    pdf, streamed_seconds, streamed_peak = measure(True)
+    whole_pdf, whole_seconds, whole_peak = measure(False)
+    pages = count_pages(pdf)
+    results = {
+        "rows": rows,
+        "pages": pages,
+        "streamed_seconds": streamed_seconds,
+        "streamed_peak_mib": streamed_peak,
+        "whole_seconds": whole_seconds,
+        "whole_peak_mib": whole_peak,
+    }
+    print(f"Annual report: {rows:,} amortization rows, {pages} pages")
+    print(f"StreamingTable: {streamed_seconds:.2f} s, peak {streamed_peak:.1f} MiB")
+    print(f"One Table per loan: {whole_seconds:.2f} s, peak {whole_peak:.1f} MiB")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,451 @@
+import functools
+import hashlib
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import streamlit as st
+
+from utils.alerts import get_unseen_alerts_count, store_new_alerts
+from utils.calculators import calculate_emi
+from utils.data_handler import add_save_listener, load_score_series, load_user_profile, record_version
+from utils.debt_planner import simulate_debt_payoff
+from utils.preload import preload_times
+from utils.refinance import find_refinancing_plans, load_loan_options
+from utils.reminders import get_reminder_scheduler, next_due_date
+from utils.score_series import CHART_MAX_POINTS, ROLLING_WINDOW, to_datetimes
+
+# pandas and the models (sklearn) are imported where they are used, so pages
+# that need neither do not wait for them to load
+
+# Most cached results kept per function (across all users and sessions)
+CACHE_MAX_ENTRIES = 512
+
+# Credit history written by another process is only noticed once a cached
+# chart is this old (saves in this process invalidate it at once)
+HISTORY_TTL_SECONDS = 60
+
+# Bumped for a user by every save in this process, so cached entries keyed
+# on the old value are never served again
+_generations = {}
+_generations_lock = threading.Lock()
+
+# user_id -> (data version, whether a profile exists) the alert rules last
+# ran for; capped at CACHE_MAX_ENTRIES users, oldest dropped first
+_alerts_refreshed = {}
+_alerts_refreshed_lock = threading.Lock()
+
+# Seconds the last computation of each cached function took, to estimate
+# what a cache hit saved
+_compute_seconds = {}
+
+# Counters of the rerun running in this thread (Streamlit runs each
+# session's script in its own thread)
+_rerun = threading.local()
+
+
+def _on_saved(record, user_id):
+    with _generations_lock:
+        _generations[user_id] = _generations.get(user_id, 0) + 1
+
+
+add_save_listener(_on_saved)
+
+
+def invalidate_user(user_id):
+    """Drop every cached result derived from a user's data (saves through data_handler do this already)"""
+    _on_saved("profile", user_id)
+
+
+def invalidate_models():
+    """Reload the credit health and what-if models on next use (e.g. after retraining)"""
+    get_credit_models.clear()
+    get_whatif_model.clear()
+    credit_health.clear()
+    what_if.clear()
+
+
+def invalidate_loan_catalog():
+    """Re-read the loan catalog on next use (e.g. after editing loan_options.json)"""
+    get_loan_catalog.clear()
+    loan_comparison.clear()
+    refinancing_plans.clear()
+
+
+def data_version(user_id):
+    """
+    Version the cached results of a user are keyed on
+
+    The stored profile's version stamp (which changes whenever any process
+    saves the profile) plus this process's save counter for the user (which
+    also covers the credit history).
+    """
+    with _generations_lock:
+        generation = _generations.get(user_id, 0)
+    return record_version("profile", user_id), generation
+
+
+def _stats():
+    stats = getattr(_rerun, "stats", None)
+    if stats is None:
+        stats = _rerun.stats = {}
+    return stats
+
+
+def _timed(cache, name, **cache_options):
+    """
+    Wrap a function in a Streamlit cache and count its calls per rerun
+
+    The function body only runs on a miss, so timing it tells computed calls
+    from calls served by the cache. Time spent computing other cached values
+    inside it (e.g. loading a model for a prediction) is counted there only.
+    """
+    def decorate(function):
+        @functools.wraps(function)
+        def compute(*args, **kwargs):
+            outer = getattr(_rerun, "nested", 0.0)
+            _rerun.nested = 0.0
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                seconds = elapsed - _rerun.nested
+                _rerun.nested = outer + elapsed
+            _compute_seconds[name] = seconds
+            entry = _stats().setdefault(name, [0, 0, 0.0])
+            entry[1] += 1
+            entry[2] += seconds
+            return result
+
+        cached = cache(**cache_options)(compute)
+
+        @functools.wraps(function)
+        def call(*args, **kwargs):
+            entry = _stats().setdefault(name, [0, 0, 0.0])
+            entry[0] += 1
+            return cached(*args, **kwargs)
+
+        call.clear = cached.clear
+        return call
+    return decorate
+
+
+def cached_resource(name):
+    """st.cache_resource with per-rerun counting; one shared object per key"""
+    return _timed(st.cache_resource, name, show_spinner=False)
+
+
+def cached_data(name, **options):
+    """st.cache_data with per-rerun counting; every caller gets its own copy"""
+    options.setdefault("max_entries", CACHE_MAX_ENTRIES)
+    return _timed(st.cache_data, name, show_spinner=False, **options)
+
+
+# Shared resources
+
+@cached_resource("credit models")
+def get_credit_models():
+    """The (risk, eligibility) credit health models, trained if none are saved"""
+    from models.credit_health_model import load_credit_model, train_models
+
+    risk_model, eligibility_model = load_credit_model()
+    if risk_model is None or eligibility_model is None:
+        risk_model, eligibility_model = train_models()
+    return risk_model, eligibility_model
+
+
+@cached_resource("what-if model")
+def get_whatif_model():
+    """The what-if model, trained if none is saved"""
+    from models.what_if_model import load_whatif_model, train_model
+
+    model = load_whatif_model()
+    return model if model is not None else train_model()
+
+
+@cached_resource("loan catalog")
+def get_loan_catalog():
+    """The loan catalog (shared; do not modify it)"""
+    return load_loan_options()
+
+
+@cached_resource("reminder scheduler")
+def start_reminders():
+    """The reminder scheduler, loaded with every stored user and firing from its background thread"""
+    scheduler = get_reminder_scheduler()
+    scheduler.load_all_users()
+    scheduler.start()
+    return scheduler
+
+
+# Data keyed on the user's data version
+
+@cached_data("profile")
+def _profile(user_id, version):
+    return load_user_profile(user_id)
+
+
+def get_profile(user_id):
+    """The user's stored profile (a copy, safe to modify), or None"""
+    return _profile(user_id, data_version(user_id))
+
+
+def _profile_key(profile):
+    """Digest of a profile's contents, so different profiles never share a cache entry"""
+    text = json.dumps(profile, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+@cached_data("credit health")
+def _credit_health(user_id, profile_key, _user_profile):
+    from models.credit_health_model import predict_credit_health
+
+    return predict_credit_health(_user_profile, get_credit_models())
+
+
+def credit_health(user_id, profile):
+    """
+    predict_credit_health for a user's profile with the cached models
+
+    Keyed on the profile's contents rather than the data version, since
+    pages also score variants of the stored profile (e.g. the
+    what-could-have-been profile on the Score History page).
+
+    Args:
+        user_id: User the profile belongs to
+        profile: The stored profile, or a variant of it
+    """
+    return _credit_health(user_id, _profile_key(profile), profile)
+
+
+credit_health.clear = _credit_health.clear
+
+
+@cached_data("what-if")
+def _what_if(user_id, version, scenario, _user_profile):
+    from models.what_if_model import predict_what_if
+
+    return predict_what_if(_user_profile, dict(scenario), get_whatif_model())
+
+
+def what_if(user_id, profile, scenario):
+    """predict_what_if for a user's profile with the cached model"""
+    return _what_if(user_id, data_version(user_id), tuple(sorted(scenario.items())), profile)
+
+
+what_if.clear = _what_if.clear
+
+
+@cached_data("loans table")
+def _loans_table(user_id, version, today, _user_profile):
+    import pandas as pd
+
+    return pd.DataFrame([{
+        'Loan #': i,
+        'Amount': f"₹{loan.get('amount', 0):,}",
+        'Monthly EMI': f"₹{loan.get('emi', 0):,}",
+        'Remaining Tenure': f"{loan.get('remaining_tenure', 0)} months",
+        'Next EMI Due': next_due_date(loan['due_day'], today).strftime('%d %b %Y') if loan.get('due_day') else "Not set"
+    } for i, loan in enumerate(_user_profile.get('current_loans', []), 1)])
+
+
+def loans_table(user_id, profile):
+    """Current loans summary of the Dashboard page"""
+    return _loans_table(user_id, data_version(user_id), datetime.now().date(), profile)
+
+
+@cached_data("debt payoff")
+def _debt_payoff(user_id, version, extra_payment, custom_order, _user_profile):
+    return simulate_debt_payoff(_user_profile, extra_payment, custom_order=list(custom_order))
+
+
+def debt_payoff(user_id, profile, extra_payment, custom_order):
+    """simulate_debt_payoff for a user's profile"""
+    return _debt_payoff(user_id, data_version(user_id), extra_payment, tuple(custom_order), profile)
+
+
+@cached_data("refinancing plans")
+def _refinancing_plans(user_id, version, _user_profile):
+    return find_refinancing_plans(_user_profile, get_loan_catalog())
+
+
+def refinancing_plans(user_id, profile):
+    """find_refinancing_plans for a user's profile against the loan catalog"""
+    return _refinancing_plans(user_id, data_version(user_id), profile)
+
+
+refinancing_plans.clear = _refinancing_plans.clear
+
+
+@cached_data("score history", ttl=HISTORY_TTL_SECONDS)
+def _score_history(user_id, version, start, end):
+    import pandas as pd
+
+    series = load_score_series(user_id)
+    if series is None or series.count == 0:
+        return None
+    all_timestamps, all_scores = series.range()
+    # Downsampling keeps each bucket's high and low, the rolling average
+    # comes precomputed from the series
+    timestamps, scores = series.downsample(CHART_MAX_POINTS, start, end)
+    rolling_timestamps, rolling = series.rolling(start, end)
+    chart = pd.DataFrame({'Credit Score': scores}, index=pd.Index(to_datetimes(timestamps), name='date'))
+    if len(rolling_timestamps) > 0:
+        positions = np.searchsorted(rolling_timestamps, timestamps)
+        chart[f'{ROLLING_WINDOW}-Entry Average'] = rolling[positions, 0]
+    return {
+        "count": series.count,
+        "first_date": to_datetimes(all_timestamps[:1])[0].astype(datetime).date(),
+        "last_date": to_datetimes(all_timestamps[-1:])[0].astype(datetime).date(),
+        "last_scores": np.array(all_scores[-2:]),
+        "stats": series.stats(),
+        "changes": series.changes(),
+        "chart": chart,
+    }
+
+
+def score_history(user_id, start=None, end=None):
+    """
+    Credit score chart and statistics of a user
+
+    Args:
+        user_id: User whose history to chart
+        start, end: Timestamp range of the chart (None for all of it)
+
+    Returns:
+        dict: count, first_date, last_date, last_scores (last two), stats,
+        changes and chart (DataFrame with the score and its rolling
+        average), or None if there is no history
+    """
+    return _score_history(user_id, data_version(user_id), start, end)
+
+
+# Header alert badge
+
+def _refresh_alerts(user_id, version):
+    """
+    Run the alert rules once per data version of the user
+
+    Returns:
+        bool: Whether the user has a profile
+    """
+    with _alerts_refreshed_lock:
+        refreshed = _alerts_refreshed.get(user_id)
+    if refreshed is not None and refreshed[0] == version:
+        return refreshed[1]
+    profile = load_user_profile(user_id)
+    if profile:
+        store_new_alerts(profile, user_id)
+    with _alerts_refreshed_lock:
+        _alerts_refreshed.pop(user_id, None)
+        _alerts_refreshed[user_id] = (version, profile is not None)
+        while len(_alerts_refreshed) > CACHE_MAX_ENTRIES:
+            del _alerts_refreshed[next(iter(_alerts_refreshed))]
+    return profile is not None
+
+
+def alert_badge(user_id):
+    """
+    Unseen alert count shown in the header on every page
+
+    The alert rules run once per data version of the user (i.e. after a
+    save), so on other reruns this is the due-reminder check and the alert
+    store's unseen counter.
+
+    Returns:
+        int: Unseen alerts (0 without a profile)
+    """
+    if not _refresh_alerts(user_id, data_version(user_id)):
+        return 0
+    get_reminder_scheduler().run_due()
+    return get_unseen_alerts_count(user_id)
+
+
+# Loan catalog tables
+
+@cached_data("loan comparison")
+def loan_comparison(loan_type, loan_amount, tenure_years):
+    """Comparison table of catalog loans of a type ("All" for every type), or None if none match"""
+    import pandas as pd
+
+    loans = get_loan_catalog()
+    if loan_type != "All":
+        loans = [loan for loan in loans if loan['type'] == loan_type]
+    comparison_data = []
+    for loan in loans:
+        emi, total_interest, total_amount = calculate_emi(loan_amount, loan['interest_rate'], tenure_years * 12)
+        comparison_data.append({
+            'Bank': loan['bank'],
+            'Loan Type': loan['type'],
+            'Interest Rate': f"{loan['interest_rate']}%",
+            'EMI': f"₹{emi:,.2f}",
+            'Total Interest': f"₹{total_interest:,.2f}",
+            'Total Amount': f"₹{total_amount:,.2f}",
+            'Processing Fee': loan.get('processing_fee', 'N/A')
+        })
+    return pd.DataFrame(comparison_data) if comparison_data else None
+
+
+# Per-rerun timing
+
+def start_rerun():
+    """Reset the counters at the top of the script"""
+    _rerun.stats = {}
+    _rerun.nested = 0.0
+    _rerun.modules = set(sys.modules)
+    _rerun.start = time.perf_counter()
+
+
+def rerun_timing():
+    """
+    Summarise the cache use of the current rerun
+
+    Returns:
+        dict: total_ms (so far), computed_ms, skipped_ms (estimated from
+        each hit function's last computation), per-function rows of
+        calls, computed, hits, computed_ms and skipped_ms, and imported
+        (packages first imported during the rerun)
+    """
+    rows = []
+    for name, (calls, computed, seconds) in sorted(_stats().items()):
+        hits = calls - computed
+        rows.append({
+            "name": name,
+            "calls": calls,
+            "computed": computed,
+            "hits": hits,
+            "computed_ms": seconds * 1000,
+            "skipped_ms": hits * _compute_seconds.get(name, 0.0) * 1000,
+        })
+    return {
+        "total_ms": (time.perf_counter() - getattr(_rerun, "start", time.perf_counter())) * 1000,
+        "computed_ms": sum(row["computed_ms"] for row in rows),
+        "skipped_ms": sum(row["skipped_ms"] for row in rows),
+        "rows": rows,
+        "imported": sorted(name for name in set(sys.modules) - getattr(_rerun, "modules", set())
+                           if "." not in name and not name.startswith("_")),
+    }
+
+
+def show_rerun_timing():
+    """Show this rerun's timing and cache use in the sidebar"""
+    timing = rerun_timing()
+    with st.sidebar.expander("⏱️ Rerun timing"):
+        st.caption(f"This rerun: {timing['total_ms']:.0f} ms, {timing['computed_ms']:.0f} ms of it computing "
+                   f"cached values; about {timing['skipped_ms']:.0f} ms skipped by cache hits")
+        if timing["imported"]:
+            st.caption(f"Modules loaded during this rerun: {', '.join(timing['imported'])}")
+        preloaded = preload_times()
+        if preloaded:
+            st.caption("Loaded in the background: " + ", ".join(
+                f"{name} {seconds * 1000:.0f} ms" for name, seconds in preloaded.items()))
+        if timing["rows"]:
+            # A markdown table, so pages without pandas do not load it for this
+            lines = ["| Cached | Calls | Hits | Computed (ms) | Skipped (ms) |", "|---|---:|---:|---:|---:|"]
+            lines += [f"| {row['name']} | {row['calls']} | {row['hits']} | {row['computed_ms']:.1f} | "
+                      f"{row['skipped_ms']:.1f} |" for row in timing["rows"]]
+            st.markdown("\n".join(lines))
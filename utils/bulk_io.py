@@ -0,0 +1,380 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+
+from utils.data_handler import (
+    append_credit_history_bulk,
+    list_user_ids,
+    load_credit_history,
+    load_user_profile,
+    resolve_user_id,
+    save_profiles_bulk,
+)
+from utils.records import HistoryEntry, Loan, UserProfile
+from utils.score_series import parse_timestamp
+
+# Rows validated and written per bulk call
+CHUNK_SIZE = 1000
+
+# Row errors kept in the returned summary (all of them go to the errors file)
+MAX_REPORTED_ERRORS = 100
+
+KINDS = ["profiles", "loans", "history"]
+FORMATS = ["csv", "jsonl"]
+
+# CSV columns per kind (JSONL rows may carry extra keys, which are kept)
+PROFILE_COLUMNS = ["user_id"] + [field[0] for field in UserProfile.FIELDS
+                                  if field[0] not in ("card_due_days", "current_loans")]
+LOAN_COLUMNS = ["user_id"] + [field[0] for field in Loan.FIELDS]
+HISTORY_COLUMNS = ["user_id"] + [field[0] for field in HistoryEntry.FIELDS]
+COLUMNS = {"profiles": PROFILE_COLUMNS, "loans": LOAN_COLUMNS, "history": HISTORY_COLUMNS}
+
+
+def detect_format(path, file_format=None):
+    """Get the file format from an explicit choice or the file extension"""
+    if file_format:
+        return file_format
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"Cannot tell the format of {path}; pass csv or jsonl explicitly")
+
+
+def read_rows(path, file_format):
+    """
+    Stream rows from a CSV or JSONL file
+
+    Yields:
+        tuple: (line_number, row dictionary or None, error message or None)
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if file_format == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                # Empty cells mean "not given", so defaults and existing values apply
+                yield reader.line_num, {key: value for key, value in row.items() if value not in ("", None)}, None
+        else:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield line_number, None, f"Invalid JSON: {e}"
+                    continue
+                if not isinstance(row, dict):
+                    yield line_number, None, "Expected a JSON object"
+                    continue
+                yield line_number, row, None
+
+
+def _number(row, field, integer=False, minimum=None, maximum=None, required=False):
+    """Validate one numeric field of a row, returning None when it is absent"""
+    value = row.get(field)
+    if value is None:
+        if required:
+            raise ValueError(f"{field} is required")
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a number, got {value!r}")
+    if integer and not number.is_integer():
+        raise ValueError(f"{field} must be a whole number, got {value!r}")
+    if minimum is not None and number < minimum:
+        raise ValueError(f"{field} must be at least {minimum}, got {value!r}")
+    if maximum is not None and number > maximum:
+        raise ValueError(f"{field} must be at most {maximum}, got {value!r}")
+    return int(number) if number.is_integer() else number
+
+
+def _user_id(row):
+    if row.get("user_id") is None:
+        raise ValueError("user_id is required")
+    return resolve_user_id(row["user_id"])
+
+
+def _validate_loan(row):
+    _number(row, "amount", minimum=0)
+    _number(row, "emi", minimum=0)
+    _number(row, "remaining_tenure", integer=True, minimum=0)
+    _number(row, "interest_rate", minimum=0, maximum=100)
+    _number(row, "due_day", integer=True, minimum=1, maximum=31)
+    return Loan.from_dict({key: value for key, value in row.items() if key != "user_id"})
+
+
+def validate_profile(row):
+    """Validate a profile row, returning (user_id, UserProfile)"""
+    user_id = _user_id(row)
+    _number(row, "monthly_income", minimum=0)
+    _number(row, "monthly_expense", minimum=0)
+    _number(row, "credit_score", integer=True, minimum=300, maximum=900)
+    _number(row, "credit_utilization", minimum=0, maximum=100)
+    _number(row, "num_credit_cards", integer=True, minimum=0)
+    if row.get("birthdate") is not None:
+        try:
+            datetime.strptime(str(row["birthdate"]), '%Y-%m-%d')
+        except ValueError:
+            raise ValueError(f"birthdate must be YYYY-MM-DD, got {row['birthdate']!r}")
+    card_due_days = row.get("card_due_days")
+    if card_due_days is not None:
+        if not isinstance(card_due_days, list):
+            raise ValueError("card_due_days must be a list")
+        for index, due_day in enumerate(card_due_days):
+            try:
+                _number({"due_day": due_day}, "due_day", integer=True, minimum=1, maximum=31)
+            except ValueError as e:
+                raise ValueError(f"card_due_days[{index}]: {e}")
+    loans = row.get("current_loans")
+    if loans is not None:
+        if not isinstance(loans, list):
+            raise ValueError("current_loans must be a list")
+        for index, loan in enumerate(loans):
+            if not isinstance(loan, dict):
+                raise ValueError(f"current_loans[{index}] must be an object")
+            try:
+                _validate_loan(loan)
+            except ValueError as e:
+                raise ValueError(f"current_loans[{index}]: {e}")
+    profile = UserProfile.from_dict({key: value for key, value in row.items() if key != "user_id"})
+    return user_id, profile
+
+
+def validate_loan(row):
+    """Validate a loan row, returning (user_id, Loan)"""
+    return _user_id(row), _validate_loan(row)
+
+
+def validate_history(row):
+    """Validate a history row, returning (user_id, HistoryEntry)"""
+    user_id = _user_id(row)
+    if row.get("date") is None or parse_timestamp(row["date"]) is None:
+        raise ValueError(f"date must be an ISO date, got {row.get('date')!r}")
+    _number(row, "credit_score", integer=True, minimum=300, maximum=900, required=True)
+    return user_id, HistoryEntry.from_dict({key: value for key, value in row.items() if key != "user_id"})
+
+
+VALIDATORS = {"profiles": validate_profile, "loans": validate_loan, "history": validate_history}
+
+
+def _write_profiles(chunk, row_keys):
+    """Save a chunk of profiles, keeping stored loans for rows that list none"""
+    items = []
+    now = datetime.now().isoformat()
+    for (line_number, user_id, profile), keys in zip(chunk, row_keys):
+        if profile.last_updated is None:
+            profile.last_updated = now
+        if "current_loans" not in keys:
+            existing = load_user_profile(user_id)
+            if existing:
+                profile.current_loans = UserProfile.from_dict(existing).current_loans
+        items.append((user_id, profile))
+    return save_profiles_bulk(items), []
+
+
+def _write_loans(chunk):
+    """Add a chunk of loans to their users' stored profiles"""
+    by_user = {}
+    for line_number, user_id, loan in chunk:
+        by_user.setdefault(user_id, []).append((line_number, loan))
+
+    items = []
+    failed = []
+    for user_id, loans in by_user.items():
+        existing = load_user_profile(user_id)
+        if existing is None:
+            failed.extend((line_number, f"No profile for user {user_id!r}") for line_number, loan in loans)
+            continue
+        profile = UserProfile.from_dict(existing)
+        profile.current_loans.extend(loan for line_number, loan in loans)
+        items.append((user_id, profile))
+    return save_profiles_bulk(items) if items else True, failed
+
+
+def _write_history(chunk):
+    return append_credit_history_bulk([(user_id, entry) for line_number, user_id, entry in chunk]), []
+
+
+def import_file(kind, path, file_format=None, chunk_size=CHUNK_SIZE, errors_path=None):
+    """
+    Stream-import profiles, loans or score history from a CSV or JSONL file
+
+    Rows are validated one at a time and written in chunks of `chunk_size`
+    through the data layer's bulk calls, so memory stays bounded by the chunk
+    size however large the file is. Invalid rows are skipped and reported.
+
+    Profiles replace the stored profile; a profile row without current_loans
+    keeps the user's stored loans. Loan rows are added to an existing
+    profile. History rows are appended to the user's credit history.
+
+    Args:
+        kind: "profiles", "loans" or "history"
+        path: File to read
+        file_format: "csv" or "jsonl" (detected from the extension if None)
+        chunk_size: Rows written per bulk call
+        errors_path: Optional CSV file receiving every rejected row as
+            (line, error)
+
+    Returns:
+        dict: rows, imported and failed counts, plus up to
+              MAX_REPORTED_ERRORS (line, error) pairs
+    """
+    file_format = detect_format(path, file_format)
+    validate = VALIDATORS[kind]
+    summary = {"kind": kind, "rows": 0, "imported": 0, "failed": 0, "errors": []}
+
+    errors_file = open(errors_path, 'w', encoding='utf-8', newline='') if errors_path else None
+    errors_writer = csv.writer(errors_file) if errors_file else None
+    if errors_writer:
+        errors_writer.writerow(["line", "error"])
+
+    def report(line_number, message):
+        summary["failed"] += 1
+        if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+            summary["errors"].append((line_number, message))
+        if errors_writer:
+            errors_writer.writerow([line_number, message])
+
+    def flush(chunk, row_keys):
+        if kind == "profiles":
+            saved, failed = _write_profiles(chunk, row_keys)
+        elif kind == "loans":
+            saved, failed = _write_loans(chunk)
+        else:
+            saved, failed = _write_history(chunk)
+        for line_number, message in failed:
+            report(line_number, message)
+        if saved:
+            summary["imported"] += len(chunk) - len(failed)
+        else:
+            failed_lines = {line_number for line_number, message in failed}
+            for line_number, user_id, record in chunk:
+                if line_number not in failed_lines:
+                    report(line_number, "Write failed")
+
+    try:
+        chunk = []
+        row_keys = []
+        for line_number, row, error in read_rows(path, file_format):
+            summary["rows"] += 1
+            if error is None:
+                try:
+                    user_id, record = validate(row)
+                    chunk.append((line_number, user_id, record))
+                    row_keys.append(row.keys())
+                except ValueError as e:
+                    error = str(e)
+            if error is not None:
+                report(line_number, error)
+                continue
+            if len(chunk) >= chunk_size:
+                flush(chunk, row_keys)
+                chunk = []
+                row_keys = []
+        if chunk:
+            flush(chunk, row_keys)
+    finally:
+        if errors_file:
+            errors_file.close()
+    return summary
+
+
+def _export_rows(kind, user_ids):
+    """Yield (user_id, row dictionary) pairs for every stored record of a kind"""
+    for user_id in user_ids:
+        if kind == "history":
+            for entry in load_credit_history(user_id):
+                yield user_id, entry
+            continue
+        profile = load_user_profile(user_id)
+        if profile is None:
+            continue
+        if kind == "profiles":
+            yield user_id, profile
+        else:
+            for loan in profile.get('current_loans', []):
+                yield user_id, loan
+
+
+def export_file(kind, path, file_format=None, user_ids=None):
+    """
+    Stream-export profiles, loans or score history to a CSV or JSONL file
+
+    Users are read and written one at a time, so memory stays bounded by the
+    largest single user's data. CSV files hold the standard columns only;
+    JSONL keeps every stored key (and profiles keep their nested loans).
+
+    Args:
+        kind: "profiles", "loans" or "history"
+        path: File to write
+        file_format: "csv" or "jsonl" (detected from the extension if None)
+        user_ids: Users to export (defaults to every stored user)
+
+    Returns:
+        int: Number of rows written
+    """
+    file_format = detect_format(path, file_format)
+    if user_ids is None:
+        user_ids = list_user_ids()
+
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if file_format == "csv":
+            writer = csv.DictWriter(f, fieldnames=COLUMNS[kind], extrasaction='ignore')
+            writer.writeheader()
+        for user_id, data in _export_rows(kind, user_ids):
+            if file_format == "csv":
+                writer.writerow({"user_id": user_id, **data})
+            else:
+                f.write(json.dumps({"user_id": user_id, **data}, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def main(argv=None):
+    """Command line entry point: python -m utils.bulk_io import|export ..."""
+    parser = argparse.ArgumentParser(prog="python -m utils.bulk_io",
+                                     description="Bulk import/export of profiles, loans and score history")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Import a CSV or JSONL file")
+    import_parser.add_argument("kind", choices=KINDS)
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=FORMATS, dest="file_format")
+    import_parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    import_parser.add_argument("--errors", dest="errors_path", help="Write rejected rows to this CSV file")
+
+    export_parser = commands.add_parser("export", help="Export to a CSV or JSONL file")
+    export_parser.add_argument("kind", choices=KINDS)
+    export_parser.add_argument("path")
+    export_parser.add_argument("--format", choices=FORMATS, dest="file_format")
+    export_parser.add_argument("--user", action="append", dest="user_ids", help="Export only this user (repeatable)")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "import":
+            summary = import_file(args.kind, args.path, args.file_format, args.chunk_size, args.errors_path)
+            print(f"Imported {summary['imported']} of {summary['rows']} {args.kind} rows "
+                  f"({summary['failed']} rejected)")
+            for line_number, message in summary["errors"][:20]:
+                print(f"  line {line_number}: {message}")
+            if summary["failed"] > 20:
+                print(f"  ... {summary['failed'] - 20} more" + (f", see {args.errors_path}" if args.errors_path else ""))
+            return 1 if summary["failed"] else 0
+
+        user_ids = [resolve_user_id(user_id) for user_id in args.user_ids] if args.user_ids else None
+        count = export_file(args.kind, args.path, args.file_format, user_ids)
+        print(f"Exported {count} {args.kind} rows to {args.path}")
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
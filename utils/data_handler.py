@@ -1,128 +1,877 @@
-import json
+import hashlib
 import os
+import random
+import re
+import threading
+import time
 from datetime import datetime
 
+from utils.file_writer import CoalescingWriter, atomic_write, file_lock, flush_all
+from utils.history_log import HistoryLog
+from utils.records import Alert, HistoryEntry, Record, UserProfile
+from utils.score_series import ScoreSeries, parse_timestamp
+from utils.serializers import get_serializer, loads
+
 DATA_DIR = "data"
 
+# The default user keeps the original single-user files at the top of DATA_DIR;
+# every other user lives in its own shard directory under DATA_DIR/users
+DEFAULT_USER_ID = "default"
+USERS_DIR = "users"
+USER_ID_PATTERN = re.compile(r'^[A-Za-z0-9_.@-]{1,128}$')
+
+# Storage backend: "json" (default) or "sqlite"
+STORAGE_BACKEND = os.environ.get("CREDO_STORAGE_BACKEND", "json")
+SQLITE_DB_FILE = "credo.db"
+
+# Columnar copy of each user's credit scores, kept next to their data files
+SCORE_SERIES_DIR = "score_series"
+
+# Records that support versioned (compare-and-swap) updates
+VERSIONED_RECORDS = {"profile": "user_profile.json", "alerts": "alerts.json"}
+
+# Attempts made by update_user_profile / update_alerts before giving up,
+# with a randomized backoff that doubles up to MAX_RETRY_DELAY seconds
+MAX_UPDATE_RETRIES = 50
+MAX_RETRY_DELAY = 0.1
+
+# Profiles per chunk yielded by iter_profiles
+PROFILE_CHUNK_SIZE = 1000
+
+_storage = None
+
+# Read-through cache of parsed JSON files: path -> ((mtime_ns, size, inode), data, version),
+# kept in least-recently-used order and capped at MAX_CACHED_FILES entries
+MAX_CACHED_FILES = 256
+_read_cache = {}
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+# Credit history logs by snapshot path, kept so fsync batching state persists
+_history_logs = {}
+
+# Functions called as listener(record, user_id) after this process saves a
+# "profile" or "history", e.g. to drop caches derived from it
+_save_listeners = []
+
+def add_save_listener(listener):
+    """Call `listener(record, user_id)` after every profile or credit history save in this process"""
+    if listener not in _save_listeners:
+        _save_listeners.append(listener)
+
+def _notify_saved(record, user_ids):
+    for user_id in user_ids:
+        for listener in list(_save_listeners):
+            try:
+                listener(record, user_id)
+            except Exception as e:
+                print(f"Error in save listener: {e}")
+
 def ensure_data_dir():
     """Ensure data directory exists"""
     if not os.path.exists(DATA_DIR):
         os.makedirs(DATA_DIR)
 
-def load_user_profile():
-    """Load user profile from JSON file"""
-    ensure_data_dir()
-    file_path = os.path.join(DATA_DIR, "user_profile.json")
-    
-    if os.path.exists(file_path):
+def resolve_user_id(user_id=None):
+    """
+    Validate a user id, falling back to the default user
+
+    Args:
+        user_id: User id or None
+
+    Returns:
+        str: The user id to use
+
+    Raises:
+        ValueError: If the id contains characters unsafe for file names
+    """
+    if user_id is None or user_id == "":
+        return DEFAULT_USER_ID
+    user_id = str(user_id)
+    if not USER_ID_PATTERN.match(user_id) or user_id in (".", ".."):
+        raise ValueError(f"Invalid user id: {user_id!r}")
+    return user_id
+
+def get_user_shard(user_id):
+    """Get the two-character shard a user's files are stored under"""
+    return hashlib.sha1(user_id.encode('utf-8')).hexdigest()[:2]
+
+def get_user_dir(user_id, data_dir=None):
+    """Get the directory holding a user's data files"""
+    data_dir = data_dir or DATA_DIR
+    if user_id == DEFAULT_USER_ID:
+        return data_dir
+    return os.path.join(data_dir, USERS_DIR, get_user_shard(user_id), user_id)
+
+def _copy_json(data):
+    """Copy the containers of parsed JSON (scalars are immutable and shared)"""
+    data_type = type(data)
+    if data_type is dict:
+        copied = data.copy()
+        for key, value in copied.items():
+            if type(value) in (dict, list):
+                copied[key] = _copy_json(value)
+        return copied
+    if data_type is list:
+        copied = data.copy()
+        for index, value in enumerate(copied):
+            if type(value) in (dict, list):
+                copied[index] = _copy_json(value)
+        return copied
+    return data
+
+def _read_json_entry(file_path):
+    """Get the cached (data, version) of a data file (JSON or binary), re-reading it if it changed"""
+    stat = os.stat(file_path)
+    key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    with _cache_lock:
+        entry = _read_cache.pop(file_path, None)
+        if entry is not None and entry[0] == key:
+            _read_cache[file_path] = entry
+            _cache_stats["hits"] += 1
+            return entry[1], entry[2]
+
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    with _cache_lock:
+        _cache_stats["misses"] += 1
+    return _cache_contents(file_path, key, raw)
+
+def _cache_contents(file_path, key, raw):
+    """Parse a file's raw contents and cache them under its stat key"""
+    data = loads(raw)
+    # The version is a hash of the contents, so equal versions mean equal files
+    version = hashlib.sha1(raw).hexdigest()[:16]
+    with _cache_lock:
+        _read_cache.pop(file_path, None)
+        _read_cache[file_path] = (key, data, version)
+        while len(_read_cache) > MAX_CACHED_FILES:
+            del _read_cache[next(iter(_read_cache))]
+    return data, version
+
+def _cache_written(file_path, raw):
+    """Cache a file just written (under its lock) and return its version"""
+    stat = os.stat(file_path)
+    return _cache_contents(file_path, (stat.st_mtime_ns, stat.st_size, stat.st_ino), raw)[1]
+
+def _read_json_cached(file_path):
+    """
+    Read and parse a data file, serving repeat reads from memory
+
+    JSON and binary files are told apart by their first bytes (see
+    utils/serializers.py), so either format can be read whatever the
+    configured CREDO_DATA_FORMAT.
+
+    The cached object is reused while the file's mtime, size and inode are
+    unchanged, so writes from other processes are still picked up. Callers get
+    their own copy and can modify it without touching the cache.
+
+    Args:
+        file_path: Path of the data file
+
+    Returns:
+        Parsed data
+    """
+    return _copy_json(_read_json_entry(file_path)[0])
+
+def _invalidate_cache(file_path):
+    """Drop a file from the read cache after it has been written"""
+    with _cache_lock:
+        if _read_cache.pop(file_path, None) is not None:
+            _cache_stats["invalidations"] += 1
+
+# Every JSON save goes through one writer: atomic replace plus directory
+# fsync, with bursts of saves to the same file coalesced
+_writer = CoalescingWriter(on_written=_invalidate_cache)
+
+def _write_json(file_path, data):
+    """
+    Serialize (in the configured data format) and save data through the shared writer
+
+    Returns:
+        bool: True once written or queued behind a write in progress (readers
+        in this process see queued data at once); failed writes raise
+    """
+    text = get_serializer().dumps(data)
+    _writer.write(file_path, text, _copy_json(data))
+    return True
+
+def flush_writes():
+    """
+    Write any saves still held back by coalescing
+
+    Returns:
+        bool: True if every held-back save is on disk
+    """
+    return flush_all()
+
+def get_cache_stats():
+    """
+    Get read cache counters
+
+    Returns:
+        dict: hits, misses, invalidations and the number of cached files
+    """
+    with _cache_lock:
+        stats = dict(_cache_stats)
+        stats["entries"] = len(_read_cache)
+    return stats
+
+def clear_cache():
+    """Empty the read cache and reset its counters"""
+    with _cache_lock:
+        _read_cache.clear()
+        for key in _cache_stats:
+            _cache_stats[key] = 0
+
+
+class StorageBackend:
+    """
+    Interface every storage backend implements
+
+    Every method is scoped to one user id. Load methods return None / [] when
+    nothing is stored and save methods return True or False, matching the
+    module-level load_*/save_* functions.
+    """
+
+    @property
+    def location(self):
+        """
+        Where the backend keeps its data, equal for every backend opened on
+        the same data (used to key caches that must survive set_storage)
+        """
+        # Unknown backends get one per instance, which never mixes up two stores
+        return f"{type(self).__name__}:{id(self)}"
+
+    def list_user_ids(self):
+        raise NotImplementedError
+
+    def load_user_profile(self, user_id):
+        raise NotImplementedError
+
+    def save_user_profile(self, profile, user_id):
+        raise NotImplementedError
+
+    def load_credit_history(self, user_id):
+        raise NotImplementedError
+
+    def save_credit_history(self, history, user_id):
+        raise NotImplementedError
+
+    def append_credit_history(self, entry, user_id):
+        """Append one history entry (backends override this when they can do better)"""
+        history = self.load_credit_history(user_id)
+        history.append(entry)
+        return self.save_credit_history(history, user_id)
+
+    def tail_credit_history(self, n, user_id):
+        """Get the n most recent history entries, oldest first"""
+        return self.load_credit_history(user_id)[-n:] if n > 0 else []
+
+    def load_alerts(self, user_id):
+        raise NotImplementedError
+
+    def save_alerts(self, alerts, user_id):
+        raise NotImplementedError
+
+    def save_profiles_bulk(self, profiles):
+        """
+        Save many profiles at once (backends override this with one transaction)
+
+        Args:
+            profiles: List of (user_id, profile) pairs
+
+        Returns:
+            bool: True if every profile was saved
+        """
+        saved = True
+        for user_id, profile in profiles:
+            saved = self.save_user_profile(profile, user_id) and saved
+        return saved
+
+    def append_credit_history_bulk(self, entries):
+        """
+        Append many history entries at once
+
+        Args:
+            entries: List of (user_id, entry) pairs, in the order to append
+
+        Returns:
+            bool: True if every entry was saved
+        """
+        saved = True
+        for user_id, entry in entries:
+            saved = self.append_credit_history(entry, user_id) and saved
+        return saved
+
+    def iter_profiles(self, chunk_size=PROFILE_CHUNK_SIZE):
+        """
+        Stream every stored profile in chunks (backends override this with paged reads)
+
+        Yields:
+            list: Up to chunk_size (user_id, profile) pairs, in list_user_ids order
+        """
+        chunk = []
+        for user_id in self.list_user_ids():
+            profile = self.load_user_profile(user_id)
+            if profile:
+                chunk.append((user_id, profile))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    def update_alerts_bulk(self, updates):
+        """
+        Apply an update to the alerts of many users (backends override this with one transaction)
+
+        Args:
+            updates: List of (user_id, update) pairs; update takes the current
+                alert list and returns the list to save, or None to leave it as is
+
+        Returns:
+            dict: user_id -> (alerts, version) as stored afterwards; (None, None)
+            for users whose alerts could not be saved
+        """
+        return {user_id: _update_with_retry("alerts", update, [], user_id, self) for user_id, update in updates}
+
+    def load_versioned(self, record, user_id):
+        """
+        Load a record together with its version stamp
+
+        Args:
+            record: "profile" or "alerts"
+            user_id: User whose record to load
+
+        Returns:
+            tuple: (data, version); both None if nothing is stored
+        """
+        raise NotImplementedError
+
+    def save_if_version(self, record, data, version, user_id):
+        """
+        Save a record only if it is still at `version` (compare-and-swap)
+
+        Returns:
+            The new version if saved, False on a version conflict or error
+        """
+        raise NotImplementedError
+
+    def record_version(self, record, user_id):
+        """
+        Get the current version of "profile" or "alerts" without loading it
+
+        Backends override this with a lookup that does not read the record.
+
+        Returns:
+            Version stamp, or None if nothing is stored
+        """
+        return self.load_versioned(record, user_id)[1]
+
+    def count_unseen_alerts(self, user_id):
+        """Count alerts not yet marked as seen"""
+        return len([alert for alert in self.load_alerts(user_id) if not alert.get('seen', False)])
+
+
+class JSONStorage(StorageBackend):
+    """
+    Stores each user's profile, history and alerts as JSON files
+
+    Files for user "alice" live in DATA_DIR/users/<shard>/alice/, where the
+    shard is taken from a hash of the id, so no directory grows past a few
+    hundred entries and finding a user's files never scans other users.
+    """
+
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir
+
+    @property
+    def location(self):
+        return f"json:{os.path.abspath(self.data_dir or DATA_DIR)}"
+
+    def _user_dir(self, user_id):
+        return get_user_dir(user_id, self.data_dir)
+
+    def _path(self, filename, user_id, create=False):
+        user_dir = self._user_dir(user_id)
+        if create and not os.path.exists(user_dir):
+            os.makedirs(user_dir)
+        return os.path.join(user_dir, filename)
+
+    def list_user_ids(self):
+        data_dir = self.data_dir or DATA_DIR
+        user_ids = []
+        if os.path.exists(os.path.join(data_dir, "user_profile.json")):
+            user_ids.append(DEFAULT_USER_ID)
+        users_dir = os.path.join(data_dir, USERS_DIR)
+        if os.path.isdir(users_dir):
+            for shard in sorted(os.listdir(users_dir)):
+                shard_dir = os.path.join(users_dir, shard)
+                if os.path.isdir(shard_dir):
+                    user_ids.extend(sorted(os.listdir(shard_dir)))
+        return user_ids
+
+    def load_user_profile(self, user_id):
+        file_path = self._path("user_profile.json", user_id)
+        pending = _writer.pending(file_path)
+        if pending is not None:
+            return _copy_json(pending)
+
+        if os.path.exists(file_path):
+            try:
+                return _read_json_cached(file_path)
+            except Exception as e:
+                print(f"Error loading user profile: {e}")
+                import traceback
+                traceback.print_exc()
+                return None
+        return None
+
+    def save_user_profile(self, profile, user_id):
+        file_path = self._path("user_profile.json", user_id, create=True)
+
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _write_json(file_path, profile)
         except Exception as e:
-            print(f"Error loading user profile: {e}")
+            print(f"Error saving user profile: {e}")
             import traceback
             traceback.print_exc()
-            return None
-    return None
+            return False
 
-def save_user_profile(profile):
-    """Save user profile to JSON file"""
-    ensure_data_dir()
-    file_path = os.path.join(DATA_DIR, "user_profile.json")
-    
-    try:
-        # Create a temporary file first, then rename (atomic write)
-        temp_file = file_path + ".tmp"
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            json.dump(profile, f, indent=2, ensure_ascii=False)
-            f.flush()  # Ensure data is written to disk
-            os.fsync(f.fileno())  # Force write to disk
-        
-        # Atomic rename (works on Windows and Unix)
-        if os.path.exists(file_path):
-            os.remove(file_path)
-        os.rename(temp_file, file_path)
-        
-        # Verify the file was written correctly
-        with open(file_path, 'r', encoding='utf-8') as f:
-            json.load(f)  # Verify it's valid JSON
-        
-        return True
-    except Exception as e:
-        print(f"Error saving user profile: {e}")
-        import traceback
-        traceback.print_exc()
-        # Clean up temp file if it exists
-        temp_file = file_path + ".tmp"
-        if os.path.exists(temp_file):
-            try:
-                os.remove(temp_file)
-            except:
-                pass
-        return False
-
-def load_credit_history():
-    """Load credit history from JSON file"""
-    ensure_data_dir()
-    file_path = os.path.join(DATA_DIR, "credit_history.json")
-    
-    if os.path.exists(file_path):
+    def _history_log(self, user_id, create=False):
+        """Get the append-only log backing a user's credit history"""
+        file_path = self._path("credit_history.json", user_id, create=create)
+        log = _history_logs.get(file_path)
+        if log is None:
+            log = HistoryLog(file_path, load_snapshot=_read_json_cached,
+                             on_snapshot_written=_invalidate_cache, serializer=get_serializer())
+            _history_logs[file_path] = log
+        return log
+
+    def load_credit_history(self, user_id):
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            return self._history_log(user_id).read_all()
         except Exception as e:
             print(f"Error loading credit history: {e}")
             return []
-    return []
 
-def save_credit_history(history):
-    """Save credit history to JSON file"""
-    ensure_data_dir()
-    file_path = os.path.join(DATA_DIR, "credit_history.json")
-    
-    try:
-        with open(file_path, 'w') as f:
-            json.dump(history, f, indent=2)
-        return True
-    except Exception as e:
-        print(f"Error saving credit history: {e}")
-        return False
+    def tail_credit_history(self, n, user_id):
+        try:
+            return self._history_log(user_id).tail(n)
+        except Exception as e:
+            print(f"Error loading credit history: {e}")
+            return []
 
-def add_credit_history_entry(credit_score, notes=""):
-    """Add a new entry to credit history"""
-    history = load_credit_history()
-    new_entry = {
-        "date": datetime.now().isoformat(),
-        "credit_score": credit_score,
-        "notes": notes
-    }
-    history.append(new_entry)
-    save_credit_history(history)
-    return True
+    def save_credit_history(self, history, user_id):
+        try:
+            self._history_log(user_id, create=True).replace_all(history)
+            return True
+        except Exception as e:
+            print(f"Error saving credit history: {e}")
+            return False
 
-def load_alerts():
-    """Load alerts from JSON file"""
-    ensure_data_dir()
-    file_path = os.path.join(DATA_DIR, "alerts.json")
-    
-    if os.path.exists(file_path):
+    def append_credit_history(self, entry, user_id):
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            return self._history_log(user_id, create=True).append(entry)
         except Exception as e:
-            print(f"Error loading alerts: {e}")
-            return []
-    return []
+            print(f"Error saving credit history: {e}")
+            return False
+
+    def append_credit_history_bulk(self, entries):
+        # One log write per user instead of one per entry
+        by_user = {}
+        for user_id, entry in entries:
+            by_user.setdefault(user_id, []).append(entry)
+        saved = True
+        for user_id, user_entries in by_user.items():
+            try:
+                self._history_log(user_id, create=True).extend(user_entries)
+            except Exception as e:
+                print(f"Error saving credit history: {e}")
+                saved = False
+        return saved
+
+    def load_alerts(self, user_id):
+        file_path = self._path("alerts.json", user_id)
+        pending = _writer.pending(file_path)
+        if pending is not None:
+            return _copy_json(pending)
+
+        if os.path.exists(file_path):
+            try:
+                return _read_json_cached(file_path)
+            except Exception as e:
+                print(f"Error loading alerts: {e}")
+                return []
+        return []
+
+    def save_alerts(self, alerts, user_id):
+        file_path = self._path("alerts.json", user_id, create=True)
+
+        try:
+            return _write_json(file_path, alerts)
+        except Exception as e:
+            print(f"Error saving alerts: {e}")
+            return False
+
+    def load_versioned(self, record, user_id):
+        file_path = self._path(VERSIONED_RECORDS[record], user_id)
+        # A save still held back by coalescing must land before versions compare
+        _writer.flush(file_path)
+        if not os.path.exists(file_path):
+            return None, None
+        try:
+            data, version = _read_json_entry(file_path)
+            return _copy_json(data), version
+        except Exception as e:
+            print(f"Error loading {record}: {e}")
+            return None, None
+
+    def save_if_version(self, record, data, version, user_id):
+        file_path = self._path(VERSIONED_RECORDS[record], user_id, create=True)
+        # The version on disk is only current once a held-back save has landed
+        if not _writer.flush(file_path):
+            return False
+        try:
+            text = get_serializer().dumps(data)
+            with file_lock(file_path):
+                current = _read_json_entry(file_path)[1] if os.path.exists(file_path) else None
+                if current != version:
+                    return False
+                atomic_write(file_path, text)
+                # Cache what was just written so the next version check is a stat
+                return _cache_written(file_path, text.encode('utf-8') if isinstance(text, str) else text)
+        except Exception as e:
+            print(f"Error saving {record}: {e}")
+            return False
+
+    def record_version(self, record, user_id):
+        file_path = self._path(VERSIONED_RECORDS[record], user_id)
+        _writer.flush(file_path)
+        if not os.path.exists(file_path):
+            return None
+        try:
+            return _read_json_entry(file_path)[1]
+        except Exception as e:
+            print(f"Error loading {record}: {e}")
+            return None
+
+
+def get_storage():
+    """Get the active storage backend, creating it on first use"""
+    global _storage
+    if _storage is None:
+        if STORAGE_BACKEND == "sqlite":
+            from utils.sqlite_storage import SQLiteStorage
+            _storage = SQLiteStorage(os.path.join(DATA_DIR, SQLITE_DB_FILE))
+        else:
+            _storage = JSONStorage()
+    return _storage
 
-def save_alerts(alerts):
-    """Save alerts to JSON file"""
-    ensure_data_dir()
-    file_path = os.path.join(DATA_DIR, "alerts.json")
-    
+def set_storage(storage):
+    """Replace the active storage backend (None resets to the configured default)"""
+    global _storage
+    _storage = storage
+
+def _to_json_shape(data):
+    """Convert records (or lists of records) to the dictionaries that are stored"""
+    if isinstance(data, Record):
+        return data.to_dict()
+    if isinstance(data, list):
+        return [item.to_dict() if isinstance(item, Record) else item for item in data]
+    return data
+
+def load_user_profile(user_id=None):
+    """Load user profile"""
+    return get_storage().load_user_profile(resolve_user_id(user_id))
+
+def load_profile_record(user_id=None):
+    """Load user profile as a UserProfile (None if no profile is saved)"""
+    profile = load_user_profile(user_id)
+    return UserProfile.from_dict(profile) if profile is not None else None
+
+def save_user_profile(profile, user_id=None):
+    """Save user profile (a dictionary or UserProfile)"""
+    user_id = resolve_user_id(user_id)
+    saved = get_storage().save_user_profile(_to_json_shape(profile), user_id)
+    if saved:
+        _notify_saved("profile", [user_id])
+    return saved
+
+def load_credit_history(user_id=None):
+    """Load credit history"""
+    return get_storage().load_credit_history(resolve_user_id(user_id))
+
+def load_history_records(user_id=None):
+    """Load credit history as HistoryEntry records"""
+    return [HistoryEntry.from_dict(entry) for entry in load_credit_history(user_id)]
+
+def save_credit_history(history, user_id=None):
+    """Save credit history (dictionaries or HistoryEntry records)"""
+    user_id = resolve_user_id(user_id)
+    saved = get_storage().save_credit_history(_to_json_shape(history), user_id)
+    if saved:
+        _drop_score_series(user_id)
+        _notify_saved("history", [user_id])
+    return saved
+
+def add_credit_history_entry(credit_score, notes="", user_id=None):
+    """Add a new entry to credit history"""
+    user_id = resolve_user_id(user_id)
+    new_entry = HistoryEntry(date=datetime.now().isoformat(), credit_score=credit_score, notes=notes).to_dict()
+    saved = get_storage().append_credit_history(new_entry, user_id)
+    if saved:
+        try:
+            series = ScoreSeries(_score_series_dir(user_id))
+            if series.exists():
+                series.append(parse_timestamp(new_entry["date"]), float(credit_score))
+        except Exception as e:
+            # The series is rebuilt from the history on next load
+            print(f"Error updating score series: {e}")
+            _drop_score_series(user_id)
+        _notify_saved("history", [user_id])
+    return saved
+
+def tail_credit_history(n, user_id=None):
+    """Get the n most recent credit history entries, oldest first"""
+    return get_storage().tail_credit_history(n, resolve_user_id(user_id))
+
+def _score_series_dir(user_id):
+    return os.path.join(get_user_dir(user_id), SCORE_SERIES_DIR)
+
+def _drop_score_series(user_id):
+    """Mark a user's score series stale so the next load rebuilds it"""
+    if os.path.exists(_score_series_dir(user_id)):
+        ScoreSeries(_score_series_dir(user_id)).drop()
+
+def load_score_series(user_id=None):
+    """
+    Get a user's credit scores as a columnar ScoreSeries
+
+    The series is built from the credit history the first time and kept up to
+    date by add_credit_history_entry. It is rebuilt whenever its last point
+    does not match the latest history entry (e.g. the history was edited by
+    another process). Entries with unparsable dates are left out.
+
+    Args:
+        user_id: User whose history to read
+
+    Returns:
+        ScoreSeries: Series sorted by date, or None on error
+    """
+    user_id = resolve_user_id(user_id)
     try:
-        with open(file_path, 'w') as f:
-            json.dump(alerts, f, indent=2)
-        return True
+        series = ScoreSeries(_score_series_dir(user_id))
+        latest = get_storage().tail_credit_history(1, user_id)
+        latest_timestamp = parse_timestamp(latest[0].get('date')) if latest else None
+        if series.exists() and series.last_timestamp() == latest_timestamp:
+            return series
+
+        timestamps = []
+        scores = []
+        for entry in get_storage().load_credit_history(user_id):
+            timestamp = parse_timestamp(entry.get('date'))
+            if timestamp is None or entry.get('credit_score') is None:
+                continue
+            timestamps.append(timestamp)
+            scores.append(entry['credit_score'])
+        series.rebuild(timestamps, scores)
+        return series
     except Exception as e:
-        print(f"Error saving alerts: {e}")
-        return False
+        print(f"Error loading score series: {e}")
+        return None
+
+def load_versioned(record, user_id=None):
+    """Load "profile" or "alerts" with its version stamp, as (data, version)"""
+    return get_storage().load_versioned(record, resolve_user_id(user_id))
+
+def save_if_version(record, data, version, user_id=None):
+    """Save "profile" or "alerts" only if still at `version`; the new version, or False on conflict"""
+    return get_storage().save_if_version(record, data, version, resolve_user_id(user_id))
+
+def _update_with_retry(record, update, default, user_id, storage=None):
+    """
+    Load-modify-save a record, retrying when another session saved first
+
+    Args:
+        record: "profile" or "alerts"
+        update: Function taking the current data and returning the new data,
+            or None to leave the record as it is
+        default: Data to start from when nothing is stored yet
+        user_id: User whose record to update
+        storage: Backend to use (defaults to get_storage())
+
+    Returns:
+        tuple: (saved data, new version), or (None, None) if every attempt conflicted
+    """
+    user_id = resolve_user_id(user_id)
+    storage = storage or get_storage()
+    for attempt in range(MAX_UPDATE_RETRIES):
+        data, version = storage.load_versioned(record, user_id)
+        new_data = update(default if data is None else data)
+        if new_data is None:
+            return default if data is None else data, version
+        new_data = _to_json_shape(new_data)
+        new_version = storage.save_if_version(record, new_data, version, user_id)
+        if new_version:
+            return new_data, new_version
+        time.sleep(random.uniform(0, min(MAX_RETRY_DELAY, 0.002 * 2 ** attempt)))
+    print(f"Error saving {record}: still conflicting after {MAX_UPDATE_RETRIES} attempts")
+    return None, None
+
+def update_user_profile(update, user_id=None):
+    """
+    Apply `update` to the stored profile without losing concurrent saves
+
+    Args:
+        update: Function taking the current profile dict (empty if none is
+            stored) and returning the profile to save
+        user_id: User whose profile to update
+
+    Returns:
+        dict: The saved profile, or None if it could not be saved
+    """
+    user_id = resolve_user_id(user_id)
+    saved = _update_with_retry("profile", update, {}, user_id)[0]
+    if saved is not None:
+        _notify_saved("profile", [user_id])
+    return saved
+
+def update_alerts(update, user_id=None):
+    """
+    Apply `update` to the stored alerts without losing concurrent saves
+
+    Args:
+        update: Function taking the current alert list and returning the list to save
+        user_id: User whose alerts to update
+
+    Returns:
+        list: The saved alerts, or None if they could not be saved
+    """
+    return _update_with_retry("alerts", update, [], user_id)[0]
+
+def update_alerts_versioned(update, user_id=None):
+    """Like update_alerts, but return (saved alerts, new version); (None, None) on failure"""
+    return _update_with_retry("alerts", update, [], user_id)
+
+def update_alerts_bulk(updates):
+    """
+    Apply updates to the alerts of many users in one backend call
+
+    Args:
+        updates: List of (user_id, update) pairs (see update_alerts; an
+            update may return None to leave a user's alerts unchanged)
+
+    Returns:
+        dict: user_id -> (alerts, version) as stored afterwards; (None, None)
+        for users whose alerts could not be saved
+    """
+    items = [(resolve_user_id(user_id), update) for user_id, update in updates]
+    return get_storage().update_alerts_bulk(items)
+
+def iter_profiles(chunk_size=PROFILE_CHUNK_SIZE):
+    """
+    Stream every stored profile in chunks without loading them all at once
+
+    Yields:
+        list: Up to chunk_size (user_id, profile) pairs
+    """
+    return get_storage().iter_profiles(chunk_size)
+
+def record_version(record, user_id=None):
+    """Get the version stamp of "profile" or "alerts" without loading it (None if not stored)"""
+    return get_storage().record_version(record, resolve_user_id(user_id))
+
+def load_alerts(user_id=None):
+    """Load alerts"""
+    return get_storage().load_alerts(resolve_user_id(user_id))
+
+def save_profiles_bulk(profiles):
+    """
+    Save many profiles in one backend call
+
+    Args:
+        profiles: List of (user_id, profile) pairs; profiles may be records
+
+    Returns:
+        bool: True if every profile was saved
+    """
+    items = [(resolve_user_id(user_id), _to_json_shape(profile)) for user_id, profile in profiles]
+    saved = get_storage().save_profiles_bulk(items)
+    if saved:
+        _notify_saved("profile", {user_id for user_id, profile in items})
+    return saved
+
+def append_credit_history_bulk(entries):
+    """
+    Append many history entries in one backend call
+
+    Args:
+        entries: List of (user_id, entry) pairs; entries may be records
+
+    Returns:
+        bool: True if every entry was saved
+    """
+    items = [(resolve_user_id(user_id), _to_json_shape(entry)) for user_id, entry in entries]
+    saved = get_storage().append_credit_history_bulk(items)
+    for user_id in {user_id for user_id, entry in items}:
+        # Imported entries may be older than the series' last point
+        _drop_score_series(user_id)
+    _notify_saved("history", {user_id for user_id, entry in items})
+    return saved
+
+def load_alert_records(user_id=None):
+    """Load alerts as Alert records"""
+    return [Alert.from_dict(alert) for alert in load_alerts(user_id)]
+
+def save_alerts(alerts, user_id=None):
+    """Save alerts (dictionaries or Alert records)"""
+    return get_storage().save_alerts(_to_json_shape(alerts), resolve_user_id(user_id))
+
+def count_unseen_alerts(user_id=None):
+    """Count alerts not yet marked as seen"""
+    return get_storage().count_unseen_alerts(resolve_user_id(user_id))
+
+def list_user_ids():
+    """List the ids of all users with stored data"""
+    return get_storage().list_user_ids()
+
+def migrate_json_to_sqlite(db_path=None, data_dir=None):
+    """
+    One-shot migration of the JSON data files into a SQLite database
+
+    Every user's rows in the database are replaced. Does nothing if the
+    database has already been migrated.
+
+    Args:
+        db_path: Path of the SQLite database (defaults to DATA_DIR/credo.db)
+        data_dir: Directory holding the JSON files (defaults to DATA_DIR)
+
+    Returns:
+        dict: Number of records migrated per table, or None if already migrated
+    """
+    from utils.sqlite_storage import SQLiteStorage
+
+    source = JSONStorage(data_dir)
+    target = SQLiteStorage(db_path or os.path.join(data_dir or DATA_DIR, SQLITE_DB_FILE))
+    if target.get_meta("migrated_from_json"):
+        return None
+
+    counts = {"profiles": 0, "credit_history": 0, "alerts": 0}
+    for user_id in source.list_user_ids():
+        profile = source.load_user_profile(user_id)
+        history = source.load_credit_history(user_id)
+        alerts = source.load_alerts(user_id)
+
+        if profile is not None:
+            target.save_user_profile(profile, user_id)
+            counts["profiles"] += 1
+        target.save_credit_history(history, user_id)
+        target.save_alerts(alerts, user_id)
+        counts["credit_history"] += len(history)
+        counts["alerts"] += len(alerts)
+
+    target.set_meta("migrated_from_json", datetime.now().isoformat())
+    return counts
@@ -0,0 +1,205 @@
+import numpy as np
+
+from utils.records import DEFAULT_LOAN_RATE, Loan, UserProfile
+
+# Safety cap so loans whose EMI never covers the interest cannot loop forever
+MAX_SIMULATION_MONTHS = 600
+
+STRATEGIES = ["avalanche", "snowball", "custom"]
+
+
+def get_loan_terms(loan):
+    """
+    Work out outstanding balance, annual rate and minimum payment for a loan
+
+    Profiles store `amount`, `emi` and `remaining_tenure`; `interest_rate` and
+    `balance` are optional. When no balance is given the outstanding amount is
+    the present value of the remaining EMIs, capped at the original amount.
+
+    Args:
+        loan: Loan record or dictionary from profile['current_loans']
+
+    Returns:
+        tuple: (balance, annual_rate, emi)
+    """
+    loan = Loan.from_dict(loan)
+    rate = loan.interest_rate
+    emi = float(loan.emi)
+    amount = float(loan.amount)
+    remaining = loan.remaining_tenure
+
+    if 'balance' in loan:
+        balance = float(loan.get('balance') or 0)
+    elif remaining > 0 and emi > 0:
+        monthly_rate = (rate / 100) / 12
+        if monthly_rate > 0:
+            balance = emi * (1 - (1 + monthly_rate) ** -remaining) / monthly_rate
+        else:
+            balance = emi * remaining
+        if amount > 0:
+            balance = min(balance, amount)
+    else:
+        balance = amount
+
+    if emi <= 0 and balance > 0 and remaining > 0:
+        from utils.calculators import calculate_emi
+        emi, _, _ = calculate_emi(balance, rate, remaining)
+
+    return max(balance, 0.0), rate, emi
+
+
+def get_payoff_order(strategy, balances, rates, custom_order=None):
+    """
+    Get the order in which extra payments are directed to loans
+
+    Args:
+        strategy: 'avalanche', 'snowball' or 'custom'
+        balances: Array of outstanding balances
+        rates: Array of annual interest rates
+        custom_order: List of loan indices for the 'custom' strategy
+
+    Returns:
+        list: Loan indices, highest priority first
+    """
+    n = len(balances)
+    if strategy == "avalanche":
+        # Highest rate first, smaller balance breaks ties
+        return list(np.lexsort((balances, -rates)))
+    if strategy == "snowball":
+        # Smallest balance first, higher rate breaks ties
+        return list(np.lexsort((-rates, balances)))
+    if strategy == "custom":
+        order = []
+        for idx in (custom_order or []):
+            idx = int(idx)
+            if 0 <= idx < n and idx not in order:
+                order.append(idx)
+        # Loans the user did not rank keep their original position at the end
+        order.extend(i for i in range(n) if i not in order)
+        return order
+    raise ValueError(f"Unknown payoff strategy: {strategy}")
+
+
+def _simulate(balances, rates, emis, orders, extra_payments, rollover, max_months):
+    """
+    Advance every strategy month by month in one vectorized pass
+
+    Rows are strategies, columns are loans. Each month interest accrues, the
+    minimum EMIs are paid, and the extra payment (plus, for rows with rollover,
+    the EMIs freed by closed loans) goes to loans in each row's priority order.
+    """
+    n_strategies = orders.shape[0]
+    n_loans = balances.shape[0]
+    rows = np.arange(n_strategies)[:, None]
+
+    bal = np.tile(balances, (n_strategies, 1))
+    monthly_rates = (rates / 100) / 12
+    total_emi = emis.sum()
+
+    total_interest = np.zeros(n_strategies)
+    months_to_free = np.full(n_strategies, -1)
+    payoff_month = np.full((n_strategies, n_loans), -1)
+    payoff_month[bal <= 0.005] = 0
+    emi_path = []
+
+    month = 0
+    while month < max_months:
+        active = bal > 0.005
+        done = ~active.any(axis=1)
+        months_to_free[(months_to_free < 0) & done] = month
+        if done.all():
+            break
+        month += 1
+
+        interest = bal * monthly_rates
+        total_interest += interest.sum(axis=1)
+        bal = bal + interest
+
+        # Minimum payments on every open loan
+        minimum = np.minimum(emis, bal) * active
+        bal = bal - minimum
+        freed = np.maximum(total_emi - minimum.sum(axis=1), 0) * rollover
+        leftover = (extra_payments + freed) * ~done
+
+        # Direct the leftover budget to loans in priority order
+        ordered = np.take_along_axis(bal, orders, axis=1)
+        paid_before = np.cumsum(ordered, axis=1) - ordered
+        allocation = np.clip(leftover[:, None] - paid_before, 0, ordered)
+        bal[rows, orders] = ordered - allocation
+
+        closed_now = active & (bal <= 0.005)
+        payoff_month[closed_now] = month
+        bal[bal <= 0.005] = 0.0
+
+        # Required EMIs still outstanding after this month's payments
+        emi_path.append(((bal > 0) * emis).sum(axis=1))
+
+    unfinished = months_to_free < 0
+    if unfinished.any():
+        still_open = (bal > 0.005).any(axis=1)
+        months_to_free[unfinished & ~still_open] = month
+
+    return months_to_free, total_interest, payoff_month, np.array(emi_path).T
+
+
+def simulate_debt_payoff(profile, extra_payment, custom_order=None, strategies=None):
+    """
+    Compare debt payoff strategies for the loans in a profile
+
+    Avalanche pays the highest-rate loan first, snowball pays the smallest
+    balance first and custom follows `custom_order`. All strategies (plus a
+    minimum-payments baseline) are simulated together as rows of one array.
+
+    Args:
+        profile: User profile dictionary
+        extra_payment: Extra amount paid towards loans every month
+        custom_order: List of loan indices for the 'custom' strategy
+        strategies: Strategies to run (defaults to all)
+
+    Returns:
+        dict: Baseline and per-strategy results with months_to_debt_free,
+              total_interest, interest_saved, payoff_months and dti_path
+    """
+    profile = UserProfile.from_dict(profile)
+    current_loans = profile.current_loans
+    monthly_income = profile.monthly_income
+    strategies = list(strategies or STRATEGIES)
+
+    terms = [get_loan_terms(loan) for loan in current_loans]
+    balances = np.array([t[0] for t in terms], dtype=float)
+    rates = np.array([t[1] for t in terms], dtype=float)
+    emis = np.array([t[2] for t in terms], dtype=float)
+
+    # Row 0 is the minimum-payments baseline with no extra payment or rollover
+    orders = [list(range(len(terms)))]
+    extras = [0.0]
+    rollover = [False]
+    for strategy in strategies:
+        orders.append(get_payoff_order(strategy, balances, rates, custom_order))
+        extras.append(max(float(extra_payment), 0.0))
+        rollover.append(True)
+
+    orders = np.array(orders, dtype=int).reshape(len(orders), len(terms))
+    months, interest, payoff_month, emi_path = _simulate(
+        balances, rates, emis, orders, np.array(extras), np.array(rollover),
+        MAX_SIMULATION_MONTHS
+    )
+
+    def build_result(row):
+        if monthly_income > 0 and emi_path.size:
+            dti_path = np.round(emi_path[row] / monthly_income * 100, 2).tolist()
+        else:
+            dti_path = [0.0] * emi_path.shape[-1] if emi_path.size else []
+        return {
+            "order": orders[row].tolist(),
+            "months_to_debt_free": int(months[row]) if months[row] >= 0 else None,
+            "total_interest": round(float(interest[row]), 2),
+            "interest_saved": round(float(interest[0] - interest[row]), 2),
+            "payoff_months": [int(m) if m >= 0 else None for m in payoff_month[row]],
+            "dti_path": dti_path,
+        }
+
+    return {
+        "baseline": build_result(0),
+        "strategies": {name: build_result(i + 1) for i, name in enumerate(strategies)},
+    }
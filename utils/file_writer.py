@@ -0,0 +1,289 @@
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only cover threads of this process
+    fcntl = None
+
+# Saves to a file that was written less than this many seconds ago are held
+# back and folded into one write at the end of the window
+COALESCE_WINDOW = 0.05
+
+# What CoalescingWriter.write returns: the file is on disk, or the save is
+# held back and is not durable until a flush() returns True
+WRITTEN = "written"
+QUEUED = "queued"
+
+_open_writers = weakref.WeakSet()
+
+# Fallback locks by path where fcntl is unavailable
+_local_locks = {}
+_local_locks_guard = threading.Lock()
+
+
+def fsync_dir(path):
+    """fsync a directory so renames inside it are durable (no-op where unsupported)"""
+    try:
+        fd = os.open(path or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def file_lock(file_path):
+    """
+    Hold an exclusive advisory lock on `file_path` (via a `.lock` file)
+
+    Only writers take the lock; readers never block because every write is
+    an atomic replace.
+    """
+    if fcntl is None:
+        with _local_locks_guard:
+            lock = _local_locks.setdefault(file_path, threading.Lock())
+        with lock:
+            yield
+        return
+
+    with open(file_path + ".lock", 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write(file_path, text):
+    """
+    Replace a file's contents so readers and crashes see the old or new version
+
+    The text goes to a temporary file in the same directory, which is fsync'd
+    and renamed over the target with os.replace (atomic on POSIX and Windows),
+    then the directory is fsync'd so the rename itself survives a power loss.
+
+    Args:
+        file_path: File to write
+        text: New contents (str, or bytes for binary files)
+    """
+    directory = os.path.dirname(file_path)
+    temp_file = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with (open(temp_file, 'wb') if isinstance(text, bytes) else open(temp_file, 'w', encoding='utf-8')) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, file_path)
+    except BaseException:
+        if os.path.exists(temp_file):
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+        raise
+    fsync_dir(directory)
+
+
+class CoalescingWriter:
+    """
+    Atomic file writes with bursts to the same file folded together
+
+    A save to a file not written within the last `window` seconds goes to disk
+    immediately. Further saves inside the window only replace a pending copy,
+    which a timer writes once the window closes, so a burst of N saves costs
+    two writes. pending() lets loads see a queued save before it lands.
+
+    write() returns QUEUED for a held-back save, not a claim that it is on
+    disk. A queued save that fails to write stays queued: pending() still
+    returns it and the next flush() retries it, returning False while it
+    keeps failing.
+    """
+
+    def __init__(self, window=COALESCE_WINDOW, on_written=None):
+        self.window = window
+        self._on_written = on_written
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._timers = {}
+        self._last_write = {}
+        self._path_locks = {}
+        self._sequence = 0
+        self._written = {}
+        _open_writers.add(self)
+
+    def write(self, file_path, text, data=None):
+        """
+        Save `text` to `file_path`
+
+        Args:
+            file_path: File to write
+            text: New contents (str or bytes)
+            data: Parsed form of the contents, returned by pending() until written
+
+        Returns:
+            str: WRITTEN if the file is on disk, QUEUED if the save is held
+            back (call flush() to learn whether it landed); failures of a
+            direct write raise
+        """
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+            now = time.monotonic()
+            recent = now - self._last_write.get(file_path, float('-inf')) < self.window
+            if recent or file_path in self._pending:
+                self._pending[file_path] = (sequence, text, data)
+                if file_path not in self._timers:
+                    timer = threading.Timer(self.window, self.flush, args=(file_path,))
+                    timer.daemon = True
+                    self._timers[file_path] = timer
+                    timer.start()
+                return QUEUED
+            self._last_write[file_path] = now
+        self._write(file_path, sequence, text)
+        return WRITTEN
+
+    def _write(self, file_path, sequence, text):
+        with self._lock:
+            path_lock = self._path_locks.setdefault(file_path, threading.Lock())
+        with path_lock:
+            # A newer save may have reached disk while this one waited
+            if self._written.get(file_path, 0) > sequence:
+                return
+            with file_lock(file_path):
+                atomic_write(file_path, text)
+            self._written[file_path] = sequence
+        if self._on_written is not None:
+            self._on_written(file_path)
+
+    def pending(self, file_path):
+        """Get the data of a queued save, or None if nothing is waiting"""
+        entry = self._pending.get(file_path)
+        return entry[2] if entry is not None else None
+
+    def flush(self, file_path=None):
+        """
+        Write queued saves now (all files if `file_path` is None)
+
+        Returns:
+            bool: True if every queued save is on disk, False if one failed to
+            write (it stays queued and is retried by the next flush)
+        """
+        with self._lock:
+            paths = [file_path] if file_path is not None else list(self._pending)
+            batch = []
+            for path in paths:
+                timer = self._timers.pop(path, None)
+                if timer is not None:
+                    timer.cancel()
+                entry = self._pending.get(path)
+                if entry is not None:
+                    self._last_write[path] = time.monotonic()
+                    batch.append((path, entry))
+
+        written = True
+        for path, (sequence, text, data) in batch:
+            try:
+                self._write(path, sequence, text)
+            except Exception as e:
+                print(f"Error writing {path}: {e}")
+                written = False
+                continue
+            with self._lock:
+                if self._pending.get(path, (None,))[0] == sequence:
+                    del self._pending[path]
+        return written
+
+
+def flush_all():
+    """
+    Write every queued save (registered to run at exit)
+
+    Returns:
+        bool: True if every queued save is on disk
+    """
+    written = True
+    for writer in list(_open_writers):
+        written = writer.flush() and written
+    return written
+
+
+atexit.register(flush_all)
+
+
+def _legacy_save(file_path, text):
+    """The old save_user_profile path: remove-then-rename plus a verify re-read"""
+    temp_file = file_path + ".tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    if os.path.exists(file_path):
+        os.remove(file_path)
+    os.rename(temp_file, file_path)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        json.load(f)
+
+
+def benchmark(saves=200, burst=20, work_dir="benchmark_data"):
+    """
+    Compare save latency of the old profile write, atomic_write and a
+    CoalescingWriter under bursts of saves to one file
+
+    Args:
+        saves: Number of saves timed per method
+        burst: Saves per burst for the coalescing writer
+        work_dir: Scratch directory for the written files
+
+    Returns:
+        dict: Milliseconds per save and disk writes issued for each method
+    """
+    if not os.path.exists(work_dir):
+        os.makedirs(work_dir)
+    file_path = os.path.join(work_dir, "write_bench.json")
+    profile = {"name": "Benchmark", "monthly_income": 50000, "monthly_expense": 30000,
+               "credit_score": 700, "credit_utilization": 30,
+               "current_loans": [{"amount": 100000, "emi": 5000, "remaining_tenure": 24}] * 20}
+    text = json.dumps(profile, indent=2, ensure_ascii=False)
+
+    results = {}
+    start = time.perf_counter()
+    for _ in range(saves):
+        _legacy_save(file_path, text)
+    results["legacy"] = {"ms_per_save": (time.perf_counter() - start) / saves * 1000, "writes": saves}
+
+    start = time.perf_counter()
+    for _ in range(saves):
+        atomic_write(file_path, text)
+    results["atomic"] = {"ms_per_save": (time.perf_counter() - start) / saves * 1000, "writes": saves}
+
+    written = []
+    writer = CoalescingWriter(on_written=written.append)
+    start = time.perf_counter()
+    for index in range(saves):
+        writer.write(file_path, text)
+        if index % burst == burst - 1:
+            writer.flush()
+            # Let the window close so the next burst starts with a direct write
+            time.sleep(writer.window)
+    writer.flush()
+    elapsed = time.perf_counter() - start - (saves // burst) * writer.window
+    results["coalesced"] = {"ms_per_save": elapsed / saves * 1000, "writes": len(written)}
+
+    os.remove(file_path)
+    for name, result in results.items():
+        print(f"{name:>9}: {result['ms_per_save']:7.3f} ms per save, {result['writes']} disk writes")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,397 @@
+import atexit
+import json
+import os
+import struct
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+from utils.file_writer import file_lock, fsync_dir
+from utils.serializers import BINARY_MAGIC, loads
+
+# Appends are flushed to the OS immediately but only fsync'd once this many
+# are pending or this many seconds have passed since the last fsync
+FSYNC_BATCH_SIZE = 16
+FSYNC_INTERVAL = 1.0
+
+# Fold the log into the snapshot once it holds this many entries
+COMPACT_THRESHOLD = 500
+
+# Bytes read per step when scanning the log backwards for tail()
+TAIL_BLOCK_SIZE = 8192
+
+_open_logs = weakref.WeakSet()
+
+
+def _dump_snapshot(entries):
+    """Serialize entries as a JSON array with one entry per line"""
+    if not entries:
+        return "[]\n"
+    lines = ",\n".join(json.dumps(entry, ensure_ascii=False) for entry in entries)
+    return "[\n" + lines + "\n]\n"
+
+
+def _read_lines_backwards(file_path, limit):
+    """Yield up to `limit` complete lines from the end of a file, last first"""
+    with open(file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+        yielded = 0
+        while position > 0 and yielded < limit:
+            step = min(TAIL_BLOCK_SIZE, position)
+            position -= step
+            f.seek(position)
+            block = f.read(step) + remainder
+            lines = block.split(b"\n")
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                if line.strip():
+                    yield line
+                    yielded += 1
+                    if yielded >= limit:
+                        return
+        if remainder.strip() and yielded < limit:
+            yield remainder
+
+
+class HistoryLog:
+    """
+    Credit history stored as a snapshot plus an append-only log
+
+    The snapshot (credit_history.json) stays a JSON array, written one entry
+    per line so its tail can be read without parsing the whole file, unless
+    a binary `serializer` is given. New
+    entries are appended to a line-delimited log next to it and folded into
+    the snapshot by compact() once the log grows past COMPACT_THRESHOLD.
+
+    Compaction never loses or duplicates entries if the process dies midway:
+    the log is first renamed to `.compacting`, the merged snapshot is written
+    to `.next`, then `.compacting` is removed and `.next` renamed over the
+    snapshot. recover() finishes whichever step was interrupted, and a torn
+    last log line from a crash during append is cut off.
+
+    Every step that changes the files (append, compaction, recovery) holds
+    file_lock on the log path as well as the in-process lock, so several
+    processes can share the history without recovering or compacting the
+    same files at once.
+    """
+
+    def __init__(self, snapshot_path, load_snapshot=None, on_snapshot_written=None, serializer=None):
+        self.snapshot_path = snapshot_path
+        self.log_path = os.path.splitext(snapshot_path)[0] + ".log"
+        self.compacting_path = self.log_path + ".compacting"
+        self.next_path = snapshot_path + ".next"
+        self._load_snapshot = load_snapshot
+        self._on_snapshot_written = on_snapshot_written
+        self._serializer = serializer
+        self._lock = threading.RLock()
+        # Nesting depth of _exclusive() in the thread holding _lock; the file
+        # lock is taken by the outermost level only (a second flock from the
+        # same process would wait on itself)
+        self._exclusive_depth = 0
+        self._recovered = False
+        self._log_entries = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        _open_logs.add(self)
+
+    def _read_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return []
+        if self._load_snapshot is not None:
+            return self._load_snapshot(self.snapshot_path)
+        with open(self.snapshot_path, 'rb') as f:
+            return loads(f.read())
+
+    def _dump(self, entries):
+        """Serialize a snapshot: JSON one entry per line unless another format is set"""
+        if self._serializer is None or self._serializer.name == "json":
+            return _dump_snapshot(entries)
+        return self._serializer.dumps(entries)
+
+    def _read_log(self, file_path):
+        """Parse a log file, skipping a torn last line"""
+        entries = []
+        if not os.path.exists(file_path):
+            return entries
+        with open(file_path, 'r', encoding='utf-8') as f:
+            lines = f.read().split("\n")
+        for index, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                if index < len(lines) - 1:
+                    print(f"Skipping corrupt credit history log line {index + 1} in {file_path}")
+        return entries
+
+    def _write_snapshot_file(self, file_path, entries):
+        data = self._dump(entries)
+        with (open(file_path, 'wb') if isinstance(data, bytes) else open(file_path, 'w', encoding='utf-8')) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    @contextmanager
+    def _exclusive(self):
+        """Hold the in-process lock and the cross-process file lock on the log"""
+        with self._lock:
+            if self._exclusive_depth:
+                self._exclusive_depth += 1
+                try:
+                    yield
+                finally:
+                    self._exclusive_depth -= 1
+                return
+            with file_lock(self.log_path):
+                self._exclusive_depth = 1
+                try:
+                    yield
+                finally:
+                    self._exclusive_depth = 0
+
+    def recover(self):
+        """Finish an interrupted compaction and cut off a torn last log line"""
+        directory = os.path.dirname(self.snapshot_path)
+        if directory and not os.path.isdir(directory):
+            # Nothing stored yet (and nowhere to put the lock file)
+            return
+        with self._exclusive():
+            # The files are checked again under the lock: another process
+            # may have finished the same recovery or a compaction meanwhile
+            if os.path.exists(self.next_path):
+                try:
+                    with open(self.next_path, 'rb') as f:
+                        loads(f.read())
+                    next_complete = True
+                except (ValueError, KeyError, IndexError, struct.error):
+                    next_complete = False
+                if next_complete:
+                    # The merged snapshot was fully written; the old log is already in it
+                    if os.path.exists(self.compacting_path):
+                        os.remove(self.compacting_path)
+                    os.replace(self.next_path, self.snapshot_path)
+                    self._snapshot_written()
+                else:
+                    os.remove(self.next_path)
+                fsync_dir(directory)
+
+            if os.path.exists(self.compacting_path):
+                self._merge_compacting()
+
+            self._log_entries = 0
+            if os.path.exists(self.log_path):
+                with open(self.log_path, 'rb+') as f:
+                    data = f.read()
+                    if data and not data.endswith(b"\n"):
+                        cut = data.rfind(b"\n") + 1
+                        f.truncate(cut)
+                        data = data[:cut]
+                        os.fsync(f.fileno())
+                self._log_entries = data.count(b"\n")
+
+            self._recovered = True
+
+    def _ensure_recovered(self):
+        if not self._recovered:
+            self.recover()
+
+    def _recover_leftovers(self):
+        """
+        Recover (under the file lock) if a compaction's files are on disk,
+        e.g. left by another process that died midway, so they are merged
+        before a new compaction reuses their names
+        """
+        if not self._recovered or os.path.exists(self.compacting_path) or os.path.exists(self.next_path):
+            self.recover()
+
+    def _snapshot_written(self):
+        if self._on_snapshot_written is not None:
+            self._on_snapshot_written(self.snapshot_path)
+
+    def _merge_compacting(self):
+        """Fold `.compacting` into the snapshot (second half of compact())"""
+        self._install_snapshot(self._read_snapshot() + self._read_log(self.compacting_path))
+
+    def _install_snapshot(self, entries):
+        """
+        Write entries to `.next`, then drop `.compacting` and rename `.next`
+        over the snapshot; recover() promotes a complete `.next` left by a crash
+        """
+        directory = os.path.dirname(self.snapshot_path)
+        self._write_snapshot_file(self.next_path, entries)
+        if os.path.exists(self.compacting_path):
+            os.remove(self.compacting_path)
+        os.replace(self.next_path, self.snapshot_path)
+        fsync_dir(directory)
+        self._snapshot_written()
+
+    def read_all(self):
+        """
+        Read the full history
+
+        Returns:
+            list: Snapshot entries followed by logged entries, oldest first
+        """
+        with self._lock:
+            self._ensure_recovered()
+            return self._read_snapshot() + self._read_log(self.log_path)
+
+    def tail(self, n):
+        """
+        Read the most recent entries without parsing the whole history
+
+        Args:
+            n: Number of entries to return
+
+        Returns:
+            list: Up to n most recent entries, oldest first
+        """
+        if n <= 0:
+            return []
+        with self._lock:
+            self._ensure_recovered()
+            recent = []
+            if os.path.exists(self.log_path):
+                for line in _read_lines_backwards(self.log_path, n):
+                    recent.append(json.loads(line))
+
+            recent.reverse()
+            if len(recent) < n and os.path.exists(self.snapshot_path):
+                needed = n - len(recent)
+                try:
+                    with open(self.snapshot_path, 'rb') as f:
+                        if f.read(len(BINARY_MAGIC)) == BINARY_MAGIC:
+                            raise ValueError("Binary snapshot")
+                    older = self._tail_snapshot(needed)
+                except ValueError:
+                    # Snapshot not written one entry per line (an older indented
+                    # file, or the binary format, which loads quickly in full)
+                    older = self._read_snapshot()[-needed:]
+                recent = older + recent
+            return recent
+
+    def _tail_snapshot(self, n):
+        """Read the last n snapshot entries from a one-entry-per-line snapshot"""
+        entries = []
+        for line in _read_lines_backwards(self.snapshot_path, n + 1):
+            line = line.strip().rstrip(b",")
+            if line in (b"[", b"]", b"[]"):
+                continue
+            entry = json.loads(line)
+            if not isinstance(entry, dict):
+                raise ValueError("Snapshot is not one entry per line")
+            entries.append(entry)
+            if len(entries) == n:
+                break
+        entries.reverse()
+        return entries
+
+    def append(self, entry):
+        """
+        Append one entry to the log
+
+        The line is written with a single write call so a crash leaves at most
+        a torn last line, which recover() removes.
+        """
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._exclusive():
+            self._ensure_recovered()
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                self._unsynced += 1
+                self._log_entries += 1
+                if (self._unsynced >= FSYNC_BATCH_SIZE or
+                        time.monotonic() - self._last_sync >= FSYNC_INTERVAL):
+                    os.fsync(f.fileno())
+                    self._unsynced = 0
+                    self._last_sync = time.monotonic()
+
+            if self._log_entries >= COMPACT_THRESHOLD:
+                self.compact()
+        return True
+
+    def extend(self, entries):
+        """
+        Append several entries to the log with a single write
+
+        Returns:
+            bool: True once written
+        """
+        if not entries:
+            return True
+        text = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        with self._exclusive():
+            self._ensure_recovered()
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                self._unsynced += len(entries)
+                self._log_entries += len(entries)
+                if (self._unsynced >= FSYNC_BATCH_SIZE or
+                        time.monotonic() - self._last_sync >= FSYNC_INTERVAL):
+                    os.fsync(f.fileno())
+                    self._unsynced = 0
+                    self._last_sync = time.monotonic()
+
+            if self._log_entries >= COMPACT_THRESHOLD:
+                self.compact()
+        return True
+
+    def sync(self):
+        """fsync any appends still waiting for a batch"""
+        with self._lock:
+            if self._unsynced and os.path.exists(self.log_path):
+                with open(self.log_path, 'a') as f:
+                    os.fsync(f.fileno())
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def compact(self):
+        """Fold the log into the snapshot and start a fresh log"""
+        with self._exclusive():
+            self._recover_leftovers()
+            if not os.path.exists(self.log_path):
+                return
+            self.sync()
+            os.replace(self.log_path, self.compacting_path)
+            fsync_dir(os.path.dirname(self.snapshot_path))
+            self._merge_compacting()
+            self._log_entries = 0
+
+    def replace_all(self, entries):
+        """
+        Overwrite the whole history (used by save_credit_history)
+
+        Goes through the same steps as compact(), with `entries` as the merged
+        snapshot: the log is renamed to `.compacting` and the new snapshot
+        written to `.next`. A crash before `.next` is complete leaves the
+        previous history; after that, recover() finishes the replacement.
+        The old log is never dropped before the new snapshot is on disk, and
+        never read on top of it.
+        """
+        with self._exclusive():
+            self._recover_leftovers()
+            if os.path.exists(self.log_path):
+                self.sync()
+                os.replace(self.log_path, self.compacting_path)
+                fsync_dir(os.path.dirname(self.snapshot_path))
+            self._install_snapshot(entries)
+            self._log_entries = 0
+            self._unsynced = 0
+
+
+def sync_all():
+    """fsync every history log with pending appends"""
+    for log in list(_open_logs):
+        try:
+            log.sync()
+        except Exception as e:
+            print(f"Error syncing credit history log: {e}")
+
+
+atexit.register(sync_all)
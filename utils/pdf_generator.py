@@ -5,132 +5,146 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from datetime import datetime
+import io
 import os
+import re
+import uuid
 
-def generate_monthly_report(profile):
+from utils.records import UserProfile
+
+REPORTS_DIR = "reports"
+
+# Bump whenever a report's layout or wording changes (monthly or annual),
+# so reports cached under the old template are rendered again
+REPORT_TEMPLATE_VERSION = 1
+
+# Page objects in a PDF; "/Type /Pages" (the page tree) is not matched
+PAGE_PATTERN = re.compile(rb'/Type\s*/Page\b(?!s)')
+
+# Styles are built once at import and shared by every report (and every
+# report worker thread); reportlab only reads them while rendering
+STYLES = getSampleStyleSheet()
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=STYLES['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#6C63FF'),
+    spaceAfter=30,
+    alignment=TA_CENTER
+)
+
+HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=STYLES['Heading2'],
+    fontSize=16,
+    textColor=colors.HexColor('#6C63FF'),
+    spaceAfter=12,
+    spaceBefore=12
+)
+
+# Header row plus banded body, used by every table in the report
+DATA_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#6C63FF')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+])
+
+def generate_monthly_report(profile, filepath=None):
     """
     Generate a monthly financial report PDF
     
     Args:
-        profile: User profile dictionary
+        profile: User profile dictionary or UserProfile
+        filepath: Where to write the PDF: a path or a binary file object
+            (defaults to a timestamped file in REPORTS_DIR)
     
     Returns:
-        str: Path to generated PDF file
+        str: Path to generated PDF file (or the file object written to)
     """
-    # Create reports directory if it doesn't exist
-    reports_dir = "reports"
-    if not os.path.exists(reports_dir):
-        os.makedirs(reports_dir)
+    profile = UserProfile.from_dict(profile)
     
-    # Generate filename
-    filename = f"monthly_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    filepath = os.path.join(reports_dir, filename)
+    if filepath is None:
+        # Timestamp plus a random suffix, so reports started in the same
+        # second (other threads or processes) never share a file
+        filename = f"monthly_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.pdf"
+        filepath = os.path.join(REPORTS_DIR, filename)
+    
+    # Create reports directory if it doesn't exist
+    reports_dir = os.path.dirname(filepath) if isinstance(filepath, str) else None
+    if reports_dir and not os.path.exists(reports_dir):
+        os.makedirs(reports_dir, exist_ok=True)
     
     # Create PDF document
     doc = SimpleDocTemplate(filepath, pagesize=A4)
     story = []
     
-    # Styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#6C63FF'),
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#6C63FF'),
-        spaceAfter=12,
-        spaceBefore=12
-    )
-    
     # Title
-    story.append(Paragraph("Captain Credo - Monthly Financial Report", title_style))
+    story.append(Paragraph("Captain Credo - Monthly Financial Report", TITLE_STYLE))
     story.append(Spacer(1, 0.2*inch))
-    story.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y')}", styles['Normal']))
+    story.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y')}", STYLES['Normal']))
     story.append(Spacer(1, 0.3*inch))
     
     # Key Metrics
-    story.append(Paragraph("Key Financial Metrics", heading_style))
+    story.append(Paragraph("Key Financial Metrics", HEADING_STYLE))
     
     # Calculate metrics
-    monthly_income = profile.get('monthly_income', 0)
-    monthly_expense = profile.get('monthly_expense', 0)
-    current_loans = profile.get('current_loans', [])
-    total_emi = sum([loan.get('emi', 0) for loan in current_loans])
+    monthly_income = profile.monthly_income
+    monthly_expense = profile.monthly_expense
+    current_loans = profile.current_loans
+    total_emi = profile.total_emi
     monthly_savings = monthly_income - monthly_expense - total_emi
     
     metrics_data = [
         ['Metric', 'Value'],
-        ['Credit Score', str(profile.get('credit_score', 0))],
+        ['Credit Score', str(profile.credit_score)],
         ['Monthly Income', f'₹{monthly_income:,}'],
         ['Monthly Expenses', f'₹{monthly_expense:,}'],
         ['Total EMI Payments', f'₹{total_emi:,}'],
         ['Monthly Savings', f'₹{monthly_savings:,}'],
-        ['Credit Utilization', f"{profile.get('credit_utilization', 0)}%"],
-        ['Number of Credit Cards', str(profile.get('num_credit_cards', 0))],
+        ['Credit Utilization', f"{profile.credit_utilization}%"],
+        ['Number of Credit Cards', str(profile.num_credit_cards)],
     ]
     
     metrics_table = Table(metrics_data, colWidths=[3*inch, 3*inch])
-    metrics_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#6C63FF')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-    ]))
+    metrics_table.setStyle(DATA_TABLE_STYLE)
     
     story.append(metrics_table)
     story.append(Spacer(1, 0.3*inch))
     
     # Current Loans
     if current_loans:
-        story.append(Paragraph("Current Loans", heading_style))
+        story.append(Paragraph("Current Loans", HEADING_STYLE))
         
         loans_data = [['Loan #', 'Amount', 'Monthly EMI', 'Remaining Tenure (Months)']]
         for i, loan in enumerate(current_loans, 1):
             loans_data.append([
                 str(i),
-                f'₹{loan.get("amount", 0):,}',
-                f'₹{loan.get("emi", 0):,}',
-                str(loan.get("remaining_tenure", 0))
+                f'₹{loan.amount:,}',
+                f'₹{loan.emi:,}',
+                str(loan.remaining_tenure)
             ])
         
         loans_table = Table(loans_data, colWidths=[1*inch, 2*inch, 2*inch, 2.5*inch])
-        loans_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#6C63FF')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-        ]))
+        loans_table.setStyle(DATA_TABLE_STYLE)
         
         story.append(loans_table)
         story.append(Spacer(1, 0.3*inch))
     
     # Recommendations
-    story.append(Paragraph("Recommendations", heading_style))
+    story.append(Paragraph("Recommendations", HEADING_STYLE))
     
     recommendations = []
-    credit_score = profile.get('credit_score', 0)
+    credit_score = profile.credit_score
     if credit_score < 700:
         recommendations.append("• Work on improving your credit score by paying bills on time and reducing debt")
     
-    credit_utilization = profile.get('credit_utilization', 0)
+    credit_utilization = profile.credit_utilization
     if credit_utilization > 30:
         recommendations.append(f"• Reduce credit utilization from {credit_utilization}% to below 30%")
     
@@ -144,15 +158,27 @@ def generate_monthly_report(profile):
         recommendations.append("• Your financial health looks good! Maintain these good habits.")
     
     for rec in recommendations:
-        story.append(Paragraph(rec, styles['Normal']))
+        story.append(Paragraph(rec, STYLES['Normal']))
         story.append(Spacer(1, 0.1*inch))
     
     # Footer
     story.append(Spacer(1, 0.3*inch))
     story.append(Paragraph("This is a financial advisory report. For professional financial advice, consult a certified financial advisor.", 
-                          styles['Italic']))
+                          STYLES['Italic']))
     
     # Build PDF
     doc.build(story)
     
     return filepath
+
+
+def render_monthly_report(profile):
+    """Render the monthly report in memory and return the PDF bytes"""
+    output = io.BytesIO()
+    generate_monthly_report(profile, output)
+    return output.getvalue()
+
+
+def count_pages(pdf):
+    """Count the pages of a rendered PDF"""
+    return len(PAGE_PATTERN.findall(pdf))
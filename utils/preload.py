@@ -0,0 +1,198 @@
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# Project root, so the measuring interpreters import the same modules the app does
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules Dashboard.py imports for every page (the header, alert badge and sidebar)
+SHELL_MODULES = ["streamlit", "utils.data_handler", "utils.alerts", "utils.app_cache"]
+
+# Slow-to-import modules each page script (app_pages/) needs on top of the
+# shell, so opening a page loads only its own: pandas for tables and charts,
+# sklearn through the models, reportlab through the reports
+PAGE_MODULES = {
+    "app_pages/dashboard.py": ["pandas"],
+    "app_pages/credit_health.py": ["pandas", "models.credit_health_model"],
+    "app_pages/emi_calculator.py": ["pandas"],
+    "app_pages/loan_comparison.py": ["pandas"],
+    "app_pages/what_if.py": ["pandas", "models.what_if_model"],
+    "app_pages/score_history.py": ["pandas", "models.credit_health_model"],
+    "app_pages/profile.py": ["utils.report_jobs"],
+    "app_pages/alerts.py": [],
+}
+
+# Loaded in the background once the first page is on screen, so the next
+# page opened does not wait for them; most widely needed first
+PRELOAD_MODULES = ["pandas", "models.credit_health_model", "models.what_if_model", "utils.report_jobs"]
+
+# Set CREDO_PRELOAD=0 to load modules only when a page needs them (e.g. to
+# keep the CPU free on a small server)
+PRELOAD_ENABLED = os.environ.get("CREDO_PRELOAD", "1") != "0"
+
+_preload_thread = None
+_preload_lock = threading.Lock()
+
+# Seconds each module took to import in the preload thread (modules a page
+# had already loaded are not listed)
+_preload_seconds = {}
+
+
+def _preload(modules):
+    for name in modules:
+        if name in sys.modules:
+            continue
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"Error preloading {name}: {e}")
+            continue
+        _preload_seconds[name] = time.perf_counter() - start
+
+
+def start_preload(modules=None):
+    """
+    Import modules in a background thread, once per process
+
+    Imports are thread safe: a page needing a module the thread is still
+    loading waits for that module only.
+
+    Args:
+        modules: Module names (defaults to PRELOAD_MODULES)
+
+    Returns:
+        Thread: The preload thread, or None if preloading is disabled
+    """
+    global _preload_thread
+    if not PRELOAD_ENABLED:
+        return None
+    with _preload_lock:
+        if _preload_thread is None:
+            _preload_thread = threading.Thread(target=_preload, args=(list(modules or PRELOAD_MODULES),),
+                                               name="module-preload", daemon=True)
+            _preload_thread.start()
+        return _preload_thread
+
+
+def preload_times():
+    """Seconds each module took in the preload thread so far"""
+    return dict(_preload_seconds)
+
+
+def _run(code, *args):
+    """Run code in a fresh interpreter from the project root and return its completed process"""
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR, CREDO_PRELOAD="0")
+    return subprocess.run([sys.executable, *args, "-c", code], cwd=PROJECT_DIR, env=env,
+                          capture_output=True, text=True)
+
+
+def import_times(modules, after=()):
+    """
+    Per-module import times of a cold interpreter (python -X importtime)
+
+    Args:
+        modules: Module names to import
+        after: Modules imported first and left out of the report (e.g.
+            SHELL_MODULES, to see what a page adds)
+
+    Returns:
+        list: (module, self seconds, cumulative seconds), slowest cumulative first
+    """
+    code = "".join(f"import {name}\n" for name in after)
+    code += "import sys\nsys.stderr.write('-- measured --\\n')\n"
+    code += "".join(f"import {name}\n" for name in modules)
+    result = _run(code, "-X", "importtime")
+    if result.returncode != 0:
+        print(f"Error measuring imports of {', '.join(modules)}: {result.stderr.strip().splitlines()[-1:]}")
+        return []
+    rows = []
+    lines = result.stderr.split("-- measured --", 1)[-1].splitlines()
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        if self_us.isdigit():
+            rows.append((name, int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows
+
+
+def first_render_seconds(page):
+    """
+    Seconds from a cold interpreter to the end of a page's first run
+
+    Covers importing the app's modules and running the script once (Streamlit's
+    own import is excluded), measured with streamlit.testing in a fresh process.
+
+    Args:
+        page: Page script, e.g. "app_pages/dashboard.py"
+
+    Returns:
+        float: Seconds, or None if the page failed
+    """
+    code = (
+        "import sys, time\n"
+        "from streamlit.testing.v1 import AppTest\n"
+        "at = AppTest.from_file('Dashboard.py', default_timeout=300)\n"
+        f"at.switch_page({page!r})\n"
+        "start = time.perf_counter()\n"
+        "at.run()\n"
+        "print(time.perf_counter() - start)\n"
+        "print(len(at.exception))\n"
+    )
+    result = _run(code)
+    lines = result.stdout.split()
+    if result.returncode != 0 or len(lines) < 2 or lines[-1] != "0":
+        print(f"Error rendering {page}: {result.stderr.strip().splitlines()[-1:]}")
+        return None
+    return float(lines[-2])
+
+
+def report(top=15, first_render=False, repeat=3):
+    """
+    Print what each page costs to import and, optionally, to render first
+
+    Args:
+        top: Slowest modules listed for the shell and each page
+        first_render: Also time each page's first render (median of `repeat`
+            cold runs)
+        repeat: Cold runs per page for first_render
+    """
+    shell = import_times(SHELL_MODULES)
+    print(f"Shell ({', '.join(SHELL_MODULES)}): "
+          f"{sum(row[1] for row in shell) * 1000:,.0f} ms")
+    for name, self_seconds, cumulative in shell[:top]:
+        print(f"  {cumulative * 1000:9,.1f} ms  {self_seconds * 1000:8,.1f} ms self  {name}")
+    for page, modules in PAGE_MODULES.items():
+        rows = import_times(modules, after=SHELL_MODULES) if modules else []
+        line = f"{page}: +{sum(row[1] for row in rows) * 1000:,.0f} ms of imports"
+        if first_render:
+            runs = sorted(seconds for seconds in (first_render_seconds(page) for _ in range(repeat))
+                          if seconds is not None)
+            if runs:
+                line += f", first render {runs[len(runs) // 2] * 1000:,.0f} ms"
+        print(line)
+        for name, self_seconds, cumulative in [row for row in rows if row[0] in modules][:top]:
+            print(f"  {cumulative * 1000:9,.1f} ms  {name}")
+
+
+def main(argv=None):
+    """Command line entry point: python -m utils.preload"""
+    parser = argparse.ArgumentParser(prog="python -m utils.preload",
+                                     description="Report the import time of the app shell and each page")
+    parser.add_argument("--top", type=int, default=15, help="Slowest shell modules to list")
+    parser.add_argument("--first-render", action="store_true",
+                        help="Also time each page's first render in a cold interpreter")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold runs per page for --first-render")
+    args = parser.parse_args(argv)
+    report(args.top, args.first_render, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
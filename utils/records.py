@@ -0,0 +1,372 @@
+import gc
+import time
+import tracemalloc
+from operator import attrgetter
+
+import numpy as np
+
+# Defaults shared by every reader of a profile, so a missing field means the
+# same thing to the models, the alerts and the PDF report
+DEFAULT_CREDIT_SCORE = 650
+
+# Assumed annual rate for loans saved without one (matches the What-If default)
+DEFAULT_LOAN_RATE = 12.0
+
+# numpy dtype used for each field kind in column form
+COLUMN_DTYPES = {"int": np.int64, "number": np.float64, "float": np.float64, "flag": np.bool_}
+
+
+def _number(value, default):
+    """Coerce to int or float, keeping whole numbers as int"""
+    if value is None or value == "":
+        return default
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, int):
+        return int(value)
+    try:
+        return _number(float(value), default)
+    except (TypeError, ValueError):
+        return default
+
+
+def _int(value, default):
+    number = _number(value, default)
+    return int(number) if number is not None else None
+
+
+def _float(value, default):
+    number = _number(value, default)
+    return float(number) if number is not None else None
+
+
+def _text(value, default):
+    return default if value is None else str(value)
+
+
+def _flag(value, default):
+    return default if value is None else bool(value)
+
+
+def _any(value, default):
+    return default if value is None else value
+
+
+CONVERTERS = {"int": _int, "number": _number, "float": _float, "text": _text, "flag": _flag, "any": _any}
+
+# Value types each kind stores unchanged, letting the loaders skip the
+# converter call for well-formed data
+PASSTHROUGH_TYPES = {"int": (int,), "number": (int,), "float": (float,), "text": (str,), "flag": (bool,)}
+
+
+class Record:
+    """
+    Base for the slotted record classes
+
+    Subclasses list their fields in FIELDS as (name, kind, default). Keys in
+    the JSON shape that are not fields are kept in `extra` (None when there
+    are none, which saves an empty dict per record) and written back by
+    to_dict(), so loading and saving a record never drops data.
+    """
+
+    __slots__ = ("extra",)
+    FIELDS = ()
+
+    def __init__(self, **values):
+        for name, kind, default in self.FIELDS:
+            setattr(self, name, CONVERTERS[kind](values.pop(name, None), default))
+        self.extra = values or None
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a record from its JSON dictionary
+
+        Args:
+            data: Dictionary in the stored JSON shape (a record is returned as is)
+
+        Returns:
+            Record: Instance of cls with missing fields set to their defaults
+        """
+        if isinstance(data, cls):
+            return data
+        return cls._load(cls, data)
+
+    def to_dict(self):
+        """Convert back to the stored JSON shape"""
+        return self._dump()
+
+    def get(self, key, default=None):
+        """Dictionary-style access so code written against dicts accepts records"""
+        if key in self._names:
+            return getattr(self, key)
+        return self.extra.get(key, default) if self.extra else default
+
+    def __contains__(self, key):
+        return key in self._names or bool(self.extra and key in self.extra)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name, kind, default in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+    @classmethod
+    def to_columns(cls, records):
+        """
+        Convert a batch of records to one numpy array per field
+
+        Numeric and flag fields become typed arrays; text fields become
+        object arrays. Extra keys are not carried over.
+
+        Args:
+            records: List of records (or dictionaries in the JSON shape)
+
+        Returns:
+            dict: Field name -> array
+        """
+        return _to_columns([cls.from_dict(record) for record in records], cls.FIELDS)
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Build records from arrays produced by to_columns()
+
+        Args:
+            columns: Field name -> array; missing fields take their defaults
+
+        Returns:
+            list: Records, one per row
+        """
+        return [cls.from_dict(row) for row in _rows(columns, cls.FIELDS)]
+
+
+def _to_columns(records, fields):
+    columns = {}
+    for name, kind, default in fields:
+        dtype = COLUMN_DTYPES.get(kind, object)
+        values = [getattr(record, name) for record in records]
+        if dtype is not object and None in values:
+            dtype = object
+        columns[name] = np.array(values, dtype=dtype)
+    return columns
+
+
+def _rows(columns, fields):
+    """Yield one dictionary per row of the given field columns"""
+    values = [(name, columns[name].tolist()) for name, kind, default in fields if name in columns]
+    count = len(values[0][1]) if values else 0
+    for row in range(count):
+        yield {name: column[row] for name, column in values}
+
+
+def record_class(cls):
+    """
+    Class decorator that sets up the loader and dumper of a record class
+
+    The per-field converters, defaults and pass-through types are looked up
+    once per class, so from_dict() is one loop over prepared tuples and
+    to_dict() a single attrgetter call zipped with the field names.
+    """
+    names = tuple(name for name, kind, default in cls.FIELDS)
+    name_set = frozenset(names)
+    fields = tuple((name, PASSTHROUGH_TYPES.get(kind, ()), CONVERTERS[kind], default)
+                   for name, kind, default in cls.FIELDS)
+    # attrgetter returns a tuple when given two or more names, as every record has
+    getter = attrgetter(*names)
+
+    def load(cls, data):
+        record = object.__new__(cls)
+        get = data.get
+        for name, types, convert, default in fields:
+            value = get(name)
+            setattr(record, name, value if type(value) in types else convert(value, default))
+        record.extra = None if data.keys() <= name_set else {
+            key: value for key, value in data.items() if key not in name_set}
+        return record
+
+    def dump(self):
+        data = dict(zip(names, getter(self)))
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    cls._names = name_set
+    cls._load = staticmethod(load)
+    cls._dump = dump
+    return cls
+
+
+@record_class
+class Loan(Record):
+    """A loan from profile['current_loans']"""
+
+    __slots__ = ("amount", "emi", "remaining_tenure", "interest_rate", "due_day")
+    FIELDS = (
+        ("amount", "number", 0),
+        ("emi", "number", 0),
+        ("remaining_tenure", "int", 0),
+        ("interest_rate", "float", DEFAULT_LOAN_RATE),
+        # Day of the month the EMI is due (None when not set)
+        ("due_day", "int", None),
+    )
+
+
+@record_class
+class UserProfile(Record):
+    """A user's profile with its current loans as Loan records"""
+
+    __slots__ = ("name", "birthdate", "monthly_income", "monthly_expense", "credit_score",
+                 "credit_utilization", "num_credit_cards", "card_due_days", "current_loans", "last_updated")
+    FIELDS = (
+        ("name", "text", ""),
+        ("birthdate", "any", None),
+        ("monthly_income", "number", 0),
+        ("monthly_expense", "number", 0),
+        ("credit_score", "int", DEFAULT_CREDIT_SCORE),
+        ("credit_utilization", "number", 0),
+        ("num_credit_cards", "int", 0),
+        # Day of the month each card's bill is due (None for a card without one)
+        ("card_due_days", "any", None),
+        ("current_loans", "any", None),
+        ("last_updated", "any", None),
+    )
+    _scalar_fields = tuple(field for field in FIELDS if field[0] not in ("card_due_days", "current_loans"))
+
+    def __init__(self, **values):
+        super().__init__(**values)
+        self.current_loans = [Loan.from_dict(loan) for loan in (self.current_loans or [])]
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        record = cls._load(cls, data)
+        record.current_loans = [Loan.from_dict(loan) for loan in (record.current_loans or [])]
+        return record
+
+    def to_dict(self):
+        data = self._dump()
+        data["current_loans"] = [loan._dump() for loan in self.current_loans]
+        return data
+
+    @property
+    def total_emi(self):
+        """Sum of the EMIs of all current loans"""
+        return sum(loan.emi for loan in self.current_loans)
+
+    @classmethod
+    def to_columns(cls, records):
+        """
+        Convert profiles to arrays, with all loans flattened into `loans`
+
+        Loans of profile i are rows loan_offsets[i]:loan_offsets[i + 1] of
+        the loan columns. Card due days are not carried over.
+        """
+        records = [cls.from_dict(record) for record in records]
+        columns = _to_columns(records, cls._scalar_fields)
+        counts = np.fromiter((len(record.current_loans) for record in records), dtype=np.int64, count=len(records))
+        columns["loan_offsets"] = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        columns["loans"] = Loan.to_columns([loan for record in records for loan in record.current_loans])
+        return columns
+
+    @classmethod
+    def from_columns(cls, columns):
+        loans = Loan.from_columns(columns.get("loans", {}))
+        offsets = columns.get("loan_offsets")
+        records = []
+        for index, row in enumerate(_rows(columns, cls._scalar_fields)):
+            row["current_loans"] = loans[offsets[index]:offsets[index + 1]] if offsets is not None else []
+            records.append(cls.from_dict(row))
+        return records
+
+
+@record_class
+class Alert(Record):
+    """An entry of alerts.json"""
+
+    __slots__ = ("type", "message", "priority", "timestamp", "seen")
+    FIELDS = (
+        ("type", "text", "info"),
+        ("message", "text", ""),
+        ("priority", "text", "low"),
+        ("timestamp", "any", None),
+        ("seen", "flag", False),
+    )
+
+
+@record_class
+class HistoryEntry(Record):
+    """An entry of the credit score history"""
+
+    __slots__ = ("date", "credit_score", "notes")
+    FIELDS = (
+        ("date", "any", None),
+        ("credit_score", "int", DEFAULT_CREDIT_SCORE),
+        ("notes", "text", ""),
+    )
+
+
+def measure_memory(count=1_000_000, loans_per_profile=2):
+    """
+    Measure memory held by `count` in-memory profiles in three forms:
+    JSON dictionaries, UserProfile records and UserProfile.to_columns arrays
+
+    Args:
+        count: Number of profiles
+        loans_per_profile: Loans attached to each profile
+
+    Returns:
+        dict: Bytes held and build time per form
+    """
+    def make_dict(i):
+        return {
+            "name": f"User {i}",
+            "birthdate": "1990-01-01",
+            "monthly_income": 50000 + i % 1000,
+            "monthly_expense": 30000,
+            "credit_score": 600 + i % 300,
+            "credit_utilization": i % 100,
+            "num_credit_cards": i % 5,
+            "current_loans": [{"amount": 100000 * (j + 1), "emi": 5000, "remaining_tenure": 24,
+                               "interest_rate": 12.0} for j in range(loans_per_profile)],
+            "last_updated": "2026-01-01T00:00:00",
+        }
+
+    def measure(build):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        value = build()
+        elapsed = time.perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return value, size, elapsed
+
+    results = {}
+    dicts, size, elapsed = measure(lambda: [make_dict(i) for i in range(count)])
+    results["dicts"] = {"bytes": size, "seconds": elapsed}
+
+    records, size, elapsed = measure(lambda: [UserProfile.from_dict(d) for d in dicts])
+    results["records"] = {"bytes": size, "seconds": elapsed}
+
+    start = time.perf_counter()
+    for record in records:
+        record.to_dict()
+    results["records"]["to_dict_seconds"] = time.perf_counter() - start
+    del dicts
+    gc.collect()
+
+    columns, size, elapsed = measure(lambda: UserProfile.to_columns(records))
+    results["columns"] = {"bytes": size, "seconds": elapsed}
+    del records, columns
+
+    for name, result in results.items():
+        print(f"{name:>8}: {result['bytes'] / count:7.1f} bytes/profile "
+              f"({result['bytes'] / 2 ** 20:8.1f} MiB), built in {result['seconds']:.2f} s")
+    return results
+
+
+if __name__ == "__main__":
+    measure_memory()
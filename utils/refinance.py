@@ -0,0 +1,204 @@
+import heapq
+import json
+import os
+import re
+
+from utils.calculators import calculate_emi
+from utils.debt_planner import get_loan_terms
+
+LOAN_OPTIONS_FILE = os.path.join("data", "loan_options.json")
+
+# Offer types that can absorb any kind of existing debt
+CONSOLIDATION_LOAN_TYPES = ["Personal Loan"]
+
+
+def load_loan_options():
+    """Load the loan catalog from JSON file"""
+    try:
+        with open(LOAN_OPTIONS_FILE, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading loan options: {e}")
+        return []
+
+
+def parse_processing_fee(fee):
+    """
+    Parse a catalog processing fee such as "2% of loan amount" or "₹5,000"
+
+    Args:
+        fee: Processing fee string or number from the loan catalog
+
+    Returns:
+        tuple: (fee_rate as a fraction of the amount, flat_fee)
+    """
+    if isinstance(fee, (int, float)):
+        return 0.0, float(fee)
+    if not fee:
+        return 0.0, 0.0
+
+    text = str(fee).replace(',', '')
+    match = re.search(r'(\d+(?:\.\d+)?)\s*%', text)
+    if match:
+        return float(match.group(1)) / 100, 0.0
+    match = re.search(r'(\d+(?:\.\d+)?)', text)
+    if match:
+        return 0.0, float(match.group(1))
+    return 0.0, 0.0
+
+
+def is_offer_eligible(offer, loans):
+    """Check whether a catalog offer can take over the given loans"""
+    if offer.get('type') in CONSOLIDATION_LOAN_TYPES:
+        return True
+    # Same-type offers work as a balance transfer for loans of that type
+    return all(loan.get('type') == offer.get('type') for loan in loans)
+
+
+def _build_plan(offer, tenure_years, indices, loans, terms):
+    """Price refinancing the selected loans into one offer with calculate_emi"""
+    principal = round(sum(terms[i][0] for i in indices), 2)
+    fee_rate, flat_fee = parse_processing_fee(offer.get('processing_fee'))
+    processing_fee = round(principal * fee_rate + flat_fee, 2)
+
+    new_emi, new_interest, new_total = calculate_emi(principal, offer['interest_rate'], tenure_years * 12)
+    current_emi = sum(terms[i][2] for i in indices)
+    current_cost = sum(terms[i][2] * int(loans[i].get('remaining_tenure', 0) or 0) for i in indices)
+    new_cost = new_total + processing_fee
+
+    return {
+        "bank": offer.get('bank'),
+        "type": offer.get('type'),
+        "interest_rate": offer['interest_rate'],
+        "tenure_years": tenure_years,
+        "loan_indices": sorted(indices),
+        "principal": principal,
+        "processing_fee": processing_fee,
+        "current_emi": round(current_emi, 2),
+        "new_emi": new_emi,
+        "monthly_relief": round(current_emi - new_emi, 2),
+        "current_remaining_cost": round(current_cost, 2),
+        "new_total_cost": round(new_cost, 2),
+        "net_savings": round(current_cost - new_cost, 2),
+    }
+
+
+def _search_subsets(weights, candidates, min_amount, max_amount, evaluate, results, top_n, slack):
+    """
+    Branch-and-bound over subsets of candidate loans for one offer and tenure
+
+    The objective is linear in the loans chosen, so `weights` give each loan's
+    contribution and the best any extension of a partial subset can reach is
+    its current total plus the remaining positive weights. Branches whose bound
+    cannot beat the current top-N are pruned.
+    """
+    order = sorted(candidates, key=lambda c: weights[c[0]], reverse=True)
+    suffix = [0.0] * (len(order) + 1)
+    for pos in range(len(order) - 1, -1, -1):
+        suffix[pos] = suffix[pos + 1] + max(weights[order[pos][0]], 0.0)
+
+    def threshold():
+        return results[0][0] if len(results) >= top_n else 0.0
+
+    def visit(pos, chosen, partial, principal):
+        if partial + suffix[pos] + slack <= threshold():
+            return
+        if chosen and min_amount <= principal <= max_amount:
+            evaluate(chosen, results, top_n)
+        for nxt in range(pos, len(order)):
+            index, balance = order[nxt]
+            if principal + balance > max_amount:
+                continue
+            visit(nxt + 1, chosen + [index], partial + weights[index], principal + balance)
+            if partial + suffix[nxt + 1] + slack <= threshold():
+                return
+
+    visit(0, [], 0.0, 0.0)
+
+
+def find_refinancing_plans(profile, loan_options=None, top_n=5):
+    """
+    Find the best ways to refinance or consolidate current loans
+
+    Every subset of the current loans is considered against every eligible
+    catalog offer and tenure, including processing fees. Plans are ranked by
+    net savings (remaining payments avoided minus the new loan's total cost)
+    and by monthly cash-flow relief among plans that do not cost more overall.
+
+    Args:
+        profile: User profile dictionary
+        loan_options: Loan catalog (defaults to data/loan_options.json)
+        top_n: Number of plans to return for each ranking
+
+    Returns:
+        dict: {'by_savings': [...], 'by_relief': [...]} lists of plan dictionaries
+    """
+    if loan_options is None:
+        loan_options = load_loan_options()
+
+    loans = profile.get('current_loans', [])
+    terms = [get_loan_terms(loan) for loan in loans]
+    candidates = [
+        (i, terms[i][0]) for i, loan in enumerate(loans)
+        if terms[i][0] > 0 and int(loan.get('remaining_tenure', 0) or 0) > 0
+    ]
+
+    by_savings = []
+    by_relief = []
+    counter = [0]
+
+    def push(results, score, plan):
+        counter[0] += 1
+        item = (score, counter[0], plan)
+        if len(results) < top_n:
+            heapq.heappush(results, item)
+        elif score > results[0][0]:
+            heapq.heapreplace(results, item)
+
+    for offer in loan_options:
+        rate = offer.get('interest_rate')
+        if rate is None:
+            continue
+        eligible = [c for c in candidates if is_offer_eligible(offer, [loans[c[0]]])]
+        if not eligible:
+            continue
+
+        fee_rate, flat_fee = parse_processing_fee(offer.get('processing_fee'))
+        min_amount = offer.get('min_amount', 0)
+        max_amount = offer.get('max_amount', float('inf'))
+
+        for tenure_years in range(int(offer.get('min_tenure', 1)), int(offer.get('max_tenure', 1)) + 1):
+            months = tenure_years * 12
+            # Cost of each rupee refinanced at this rate and tenure (EMI is linear in principal)
+            emi_per_rupee, _, _ = calculate_emi(1_000_000, rate, months)
+            emi_per_rupee /= 1_000_000
+            cost_per_rupee = emi_per_rupee * months + fee_rate
+            # calculate_emi rounds the EMI to paise, so allow for that in the bounds
+            slack = months * 0.01 + flat_fee
+
+            savings_weights = {}
+            relief_weights = {}
+            for i, balance in eligible:
+                remaining_cost = terms[i][2] * int(loans[i].get('remaining_tenure', 0) or 0)
+                savings_weights[i] = remaining_cost - balance * cost_per_rupee
+                relief_weights[i] = terms[i][2] - balance * emi_per_rupee
+
+            def evaluate_savings(chosen, results, top_n):
+                plan = _build_plan(offer, tenure_years, chosen, loans, terms)
+                if plan['net_savings'] > 0:
+                    push(results, plan['net_savings'], plan)
+
+            def evaluate_relief(chosen, results, top_n):
+                plan = _build_plan(offer, tenure_years, chosen, loans, terms)
+                if plan['monthly_relief'] > 0 and plan['net_savings'] >= 0:
+                    push(results, plan['monthly_relief'], plan)
+
+            _search_subsets(savings_weights, eligible, min_amount, max_amount,
+                            evaluate_savings, by_savings, top_n, slack)
+            _search_subsets(relief_weights, eligible, min_amount, max_amount,
+                            evaluate_relief, by_relief, top_n, 0.01)
+
+    return {
+        "by_savings": [item[2] for item in sorted(by_savings, reverse=True)],
+        "by_relief": [item[2] for item in sorted(by_relief, reverse=True)],
+    }
@@ -0,0 +1,393 @@
+import calendar
+import heapq
+import random
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from utils.alert_store import AlertStore
+from utils.data_handler import list_user_ids, load_user_profile
+from utils.records import UserProfile
+
+# Reminders fire this many days before the due date
+REMINDER_LEAD_DAYS = 3
+
+# Seconds between checks of the background tick
+REMINDER_TICK_SECONDS = 60
+
+# Rebuild the queue once more than this fraction of its entries are stale
+MAX_STALE_RATIO = 0.5
+
+REMINDER_MESSAGES = {
+    "loan": "EMI of ₹{amount:,} for Loan {number} is due on {due:%d %b %Y}.",
+    "card": "Credit card {number} bill is due on {due:%d %b %Y}.",
+}
+
+
+# Days in each (year, month), filled as months are first used
+_month_days = {}
+
+
+def _days_in_month(year, month):
+    days = _month_days.get((year, month))
+    if days is None:
+        days = _month_days[(year, month)] = calendar.monthrange(year, month)[1]
+    return days
+
+
+def next_due_date(due_day, on_or_after):
+    """
+    Next date falling on a day of the month
+
+    Months shorter than due_day use their last day (a loan due on the 31st is
+    due on 30 April and 28 or 29 February).
+
+    Args:
+        due_day: Day of the month (1-31)
+        on_or_after: Earliest date to return
+
+    Returns:
+        date: First due date on or after `on_or_after`
+    """
+    year, month = on_or_after.year, on_or_after.month
+    if due_day <= 28:
+        # Every month has the day, so no month lengths are needed
+        if on_or_after.day > due_day:
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return date(year, month, due_day)
+    while True:
+        due = date(year, month, min(due_day, _days_in_month(year, month)))
+        if due >= on_or_after:
+            return due
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+class Reminder:
+    """A monthly payment reminder for one loan or card of a user"""
+
+    __slots__ = ("user_id", "kind", "number", "due_day", "amount", "due", "active")
+
+    def __init__(self, user_id, kind, number, due_day, amount=None):
+        self.user_id = user_id
+        self.kind = kind
+        self.number = number
+        self.due_day = due_day
+        self.amount = amount
+        # Due date of the queued occurrence
+        self.due = None
+        # False once replaced or cancelled; its queue entry is then skipped
+        self.active = True
+
+    @property
+    def reminder_id(self):
+        """Id unique within the user, e.g. "loan:2" for the second loan"""
+        return f"{self.kind}:{self.number}"
+
+    def spec(self):
+        """Fields that define the reminder, to tell whether a profile change affects it"""
+        return (self.due_day, self.amount)
+
+    def to_alert(self, due, timestamp=None):
+        """
+        Build the alert for the occurrence due on `due`
+
+        The key includes the due date, so firing the same occurrence again
+        (e.g. after a restart) does not store a second alert.
+        """
+        message = REMINDER_MESSAGES[self.kind].format(amount=self.amount or 0, number=self.number, due=due)
+        return {
+            "type": "info",
+            "message": message,
+            "priority": "medium",
+            "timestamp": timestamp or datetime.now().isoformat(),
+            "seen": False,
+            "rule": f"{self.kind}_due:{self.number}",
+            "key": f"{self.kind}_due:{self.number}:{due.isoformat()}",
+        }
+
+
+def profile_reminders(profile, user_id):
+    """
+    Get the reminders of a profile's loans and cards that have a due day
+
+    Args:
+        profile: Profile dictionary or UserProfile
+        user_id: User the profile belongs to
+
+    Returns:
+        list: Reminder objects (not yet queued)
+    """
+    profile = UserProfile.from_dict(profile)
+    reminders = []
+    for number, loan in enumerate(profile.current_loans, 1):
+        if loan.due_day:
+            reminders.append(Reminder(user_id, "loan", number, loan.due_day, loan.emi))
+    card_due_days = profile.card_due_days or []
+    for number, due_day in enumerate(card_due_days[:profile.num_credit_cards], 1):
+        if due_day:
+            reminders.append(Reminder(user_id, "card", number, int(due_day)))
+    return reminders
+
+
+class ReminderScheduler:
+    """
+    Upcoming reminders of all users in one heap ordered by fire date
+
+    Firing only pops the entries that are due, so a tick costs O(k log n)
+    for k due reminders out of n queued, and a tick with nothing due is one
+    comparison against the top of the heap. A fired reminder is queued again
+    for its next due date. Replacing a user's reminders marks the old ones
+    inactive instead of searching the heap for them; their entries are
+    dropped when popped, or all at once when they make up most of the heap.
+    """
+
+    def __init__(self, lead_days=REMINDER_LEAD_DAYS):
+        self.lead_days = lead_days
+        self._heap = []
+        self._users = {}
+        self._sequence = 0
+        self._stale = 0
+        self._lock = threading.Lock()
+        self._stop = None
+
+    def __len__(self):
+        """Number of active reminders"""
+        return len(self._heap) - self._stale
+
+    def _entry(self, reminder, today):
+        """Queue entry for the reminder's next occurrence on or after `today`"""
+        reminder.due = next_due_date(reminder.due_day, today)
+        self._sequence += 1
+        return (reminder.due.toordinal() - self.lead_days, self._sequence, reminder)
+
+    def _push(self, reminder, today):
+        heapq.heappush(self._heap, self._entry(reminder, today))
+
+    def _cancel(self, reminder):
+        reminder.active = False
+        self._stale += 1
+
+    def schedule(self, user_id, reminders, today=None):
+        """
+        Replace a user's reminders
+
+        Reminders whose due day and amount are unchanged keep their queued
+        occurrence, so calling this on every page load queues nothing new.
+
+        Args:
+            user_id: User the reminders belong to
+            reminders: Reminder objects, e.g. from profile_reminders()
+            today: Date to schedule from (defaults to today)
+
+        Returns:
+            int: Number of reminders newly queued
+        """
+        today = today or date.today()
+        with self._lock:
+            current = self._users.get(user_id, {})
+            updated = {}
+            queued = 0
+            for reminder in reminders:
+                existing = current.get(reminder.reminder_id)
+                if existing is not None and existing.spec() == reminder.spec():
+                    updated[reminder.reminder_id] = existing
+                    continue
+                if existing is not None:
+                    self._cancel(existing)
+                self._push(reminder, today)
+                updated[reminder.reminder_id] = reminder
+                queued += 1
+            for reminder_id, reminder in current.items():
+                if reminder_id not in updated:
+                    self._cancel(reminder)
+            if updated:
+                self._users[user_id] = updated
+            else:
+                self._users.pop(user_id, None)
+            if self._stale > len(self._heap) * MAX_STALE_RATIO:
+                self._compact()
+        return queued
+
+    def sync_profile(self, profile, user_id, today=None):
+        """Schedule the reminders of a profile's loans and cards (see schedule)"""
+        return self.schedule(user_id, profile_reminders(profile, user_id), today)
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if entry[2].active]
+        heapq.heapify(self._heap)
+        self._stale = 0
+
+    def next_fire_date(self):
+        """Date the next reminder fires, or None when nothing is queued"""
+        with self._lock:
+            while self._heap and not self._heap[0][2].active:
+                heapq.heappop(self._heap)
+                self._stale -= 1
+            return date.fromordinal(self._heap[0][0]) if self._heap else None
+
+    def pop_due(self, today=None):
+        """
+        Take every reminder due to fire by `today`
+
+        Each taken reminder is queued again for its next due date. An
+        occurrence whose due date passed while nothing was checking (e.g.
+        the app was not running) is skipped instead of fired late, so a
+        catch-up after a long gap fires at most one reminder per loan or card.
+
+        Args:
+            today: Date to fire up to (defaults to today)
+
+        Returns:
+            list: (reminder, due date) pairs in fire order
+        """
+        today = today or date.today()
+        limit = today.toordinal()
+        fired = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= limit:
+                reminder = heap[0][2]
+                if not reminder.active:
+                    heapq.heappop(heap)
+                    self._stale -= 1
+                    continue
+                due = reminder.due
+                if due >= today:
+                    fired.append((reminder, due))
+                    entry = self._entry(reminder, due + timedelta(days=1))
+                else:
+                    entry = self._entry(reminder, today)
+                # Replacing the top sifts once instead of a pop plus a push
+                heapq.heapreplace(heap, entry)
+        return fired
+
+    def run_due(self, today=None):
+        """
+        Fire the due reminders and store them as alerts of their users
+
+        Returns:
+            int: Number of alerts stored
+        """
+        by_user = {}
+        timestamp = datetime.now().isoformat()
+        for reminder, due in self.pop_due(today):
+            by_user.setdefault(reminder.user_id, []).append(reminder.to_alert(due, timestamp))
+        stored = 0
+        for user_id, alerts in by_user.items():
+            stored += len(AlertStore(user_id).add(alerts) or [])
+        return stored
+
+    def start(self, interval=REMINDER_TICK_SECONDS):
+        """Fire due reminders from a background thread every `interval` seconds"""
+        with self._lock:
+            if self._stop is not None:
+                return
+            self._stop = threading.Event()
+        stop = self._stop
+
+        def tick():
+            while not stop.wait(interval):
+                try:
+                    self.run_due()
+                except Exception as e:
+                    print(f"Error firing reminders: {e}")
+
+        thread = threading.Thread(target=tick, name="reminder-tick", daemon=True)
+        thread.start()
+
+    def stop(self):
+        """Stop the background thread started by start()"""
+        with self._lock:
+            stop, self._stop = self._stop, None
+        if stop is not None:
+            stop.set()
+
+    def load_all_users(self, today=None):
+        """
+        Schedule the reminders of every stored user (e.g. when a job starts)
+
+        Returns:
+            int: Number of reminders queued
+        """
+        queued = 0
+        for user_id in list_user_ids():
+            profile = load_user_profile(user_id)
+            if profile:
+                queued += self.sync_profile(profile, user_id, today)
+        return queued
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_reminder_scheduler():
+    """Get the process-wide scheduler, creating it on first use"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ReminderScheduler()
+        return _scheduler
+
+
+def benchmark(users=100_000, loans_per_user=8, cards_per_user=2, days=31, seed=0):
+    """
+    Time queueing and firing reminders for many users
+
+    Every user gets `loans_per_user` loans and `cards_per_user` cards on
+    random due days; the scheduler is then ticked once per day for `days`
+    days, so every reminder fires and is queued again about once.
+
+    Args:
+        users: Number of users
+        loans_per_user: Loans with a due day per user
+        cards_per_user: Cards with a due day per user
+        days: Days to tick through
+        seed: Random seed for the due days
+
+    Returns:
+        dict: Reminder count, seconds and reminders per second for each phase
+    """
+    rng = random.Random(seed)
+    start_day = date(2026, 1, 1)
+    reminders = [
+        [Reminder(f"user{user}", "loan", number, rng.randint(1, 31), 5000) for number in range(1, loans_per_user + 1)]
+        + [Reminder(f"user{user}", "card", number, rng.randint(1, 31)) for number in range(1, cards_per_user + 1)]
+        for user in range(users)
+    ]
+    count = users * (loans_per_user + cards_per_user)
+    scheduler = ReminderScheduler()
+
+    start = time.perf_counter()
+    for user, user_reminders in enumerate(reminders):
+        scheduler.schedule(f"user{user}", user_reminders, start_day)
+    enqueue_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fired = 0
+    for offset in range(days):
+        fired += len(scheduler.pop_due(start_day + timedelta(days=offset)))
+    fire_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(100_000):
+        scheduler.pop_due(start_day + timedelta(days=days - 1))
+    idle_seconds = (time.perf_counter() - start) / 100_000
+
+    results = {
+        "reminders": count,
+        "enqueue_seconds": enqueue_seconds,
+        "enqueue_per_second": count / enqueue_seconds,
+        "fired": fired,
+        "fire_seconds": fire_seconds,
+        "fire_per_second": fired / fire_seconds,
+        "idle_tick_us": idle_seconds * 1e6,
+    }
+    print(f"Queued {count:,} reminders in {enqueue_seconds:.2f} s ({results['enqueue_per_second']:,.0f}/s)")
+    print(f"Fired {fired:,} over {days} daily ticks in {fire_seconds:.2f} s ({results['fire_per_second']:,.0f}/s)")
+    print(f"Tick with nothing due: {results['idle_tick_us']:.2f} us")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,261 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from utils.data_handler import get_user_shard, iter_profiles
+from utils.file_writer import atomic_write
+from utils.pdf_generator import count_pages, render_monthly_report
+
+# Profiles rendered per worker task
+BATCH_CHUNK_SIZE = 200
+
+# Chunks queued per worker ahead of the one being written, which bounds
+# memory (rendered PDFs are held until written) while keeping workers busy
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+def report_filename(month=None):
+    """File name of a user's statement for a month, e.g. monthly_report_2026_10.pdf"""
+    month = month or datetime.now()
+    return f"monthly_report_{month:%Y_%m}.pdf"
+
+
+def report_path(user_id, month=None):
+    """
+    Path of a user's statement relative to the output directory or archive
+
+    Users are spread over the same two-character shards as their data
+    files, so no directory holds more than a few thousand entries.
+    """
+    return "/".join([get_user_shard(user_id), user_id, report_filename(month)])
+
+
+def render_chunk(chunk):
+    """
+    Render the monthly report of every profile in a chunk
+
+    Args:
+        chunk: List of (user_id, profile) pairs
+
+    Returns:
+        tuple: (list of (user_id, PDF bytes or None, pages, error), seconds spent)
+    """
+    start = time.perf_counter()
+    rendered = []
+    for user_id, profile in chunk:
+        try:
+            pdf = render_monthly_report(profile)
+            rendered.append((user_id, pdf, count_pages(pdf), None))
+        except Exception as e:
+            rendered.append((user_id, None, 0, str(e)))
+    return rendered, time.perf_counter() - start
+
+
+class DirectoryOutput:
+    """Writes each statement to its own file under a directory"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def write(self, name, data):
+        path = os.path.join(self.directory, *name.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, data)
+
+    def close(self):
+        pass
+
+
+class ArchiveOutput:
+    """
+    Writes every statement into one zip archive
+
+    PDFs are stored without recompression: reportlab already compresses
+    page content, so deflating again costs time for almost no space.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED)
+
+    def write(self, name, data):
+        self._zip.writestr(name, data)
+
+    def close(self):
+        self._zip.close()
+
+
+def run_report_batch(output, profiles=None, month=None, chunk_size=BATCH_CHUNK_SIZE, workers=None, progress=None):
+    """
+    Render the monthly statement of every profile (e.g. at month end)
+
+    Profiles are streamed in chunks, each chunk is rendered to in-memory
+    PDFs in a worker process, and the PDFs are written by this process in
+    submission order while later chunks are still rendering. A profile
+    that fails to render is counted and skipped.
+
+    Args:
+        output: DirectoryOutput or ArchiveOutput to write to (closed at the end)
+        profiles: Iterable of chunks of (user_id, profile) pairs (defaults
+            to every stored profile)
+        month: Month the statements are for (defaults to the current month)
+        chunk_size: Profiles per chunk when reading stored profiles
+        workers: Worker processes (defaults to the CPU count; 1 renders
+            in this process)
+        progress: Optional function called with the running stats after each chunk
+
+    Returns:
+        dict: Counts (profiles, reports, pages, bytes, failed) and seconds
+        per stage: render (summed over workers), write, and total wall time
+    """
+    workers = workers or os.cpu_count() or 1
+    profiles = profiles if profiles is not None else iter_profiles(chunk_size)
+    stats = {"profiles": 0, "reports": 0, "pages": 0, "bytes": 0, "failed": 0, "chunks": 0,
+             "render_seconds": 0.0, "write_seconds": 0.0}
+    start = time.perf_counter()
+
+    def store(rendered, seconds):
+        stats["render_seconds"] += seconds
+        write_start = time.perf_counter()
+        for user_id, pdf, pages, error in rendered:
+            stats["profiles"] += 1
+            if pdf is None:
+                print(f"Error generating report for {user_id}: {error}")
+                stats["failed"] += 1
+                continue
+            output.write(report_path(user_id, month), pdf)
+            stats["reports"] += 1
+            stats["pages"] += pages
+            stats["bytes"] += len(pdf)
+        stats["write_seconds"] += time.perf_counter() - write_start
+        stats["chunks"] += 1
+        if progress:
+            progress(stats)
+
+    try:
+        if workers == 1:
+            for chunk in profiles:
+                store(*render_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in profiles:
+                    pending.append(pool.submit(render_chunk, chunk))
+                    while len(pending) >= workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                        store(*pending.popleft().result())
+                while pending:
+                    store(*pending.popleft().result())
+    finally:
+        write_start = time.perf_counter()
+        output.close()
+        stats["write_seconds"] += time.perf_counter() - write_start
+
+    stats["total_seconds"] = time.perf_counter() - start
+    stats["pages_per_second"] = stats["pages"] / stats["total_seconds"] if stats["total_seconds"] else 0.0
+    stats["reports_per_second"] = stats["reports"] / stats["total_seconds"] if stats["total_seconds"] else 0.0
+    return stats
+
+
+def format_report(stats):
+    """Describe a run_report_batch result in a few lines"""
+    return "\n".join([
+        f"Reports: {stats['reports']:,} of {stats['profiles']:,} profiles ({stats['failed']:,} failed), "
+        f"{stats['pages']:,} pages, {stats['bytes'] / 2 ** 20:,.1f} MB",
+        f"Throughput: {stats['pages_per_second']:,.0f} pages/s ({stats['reports_per_second']:,.0f} reports/s)",
+        f"Render: {stats['render_seconds']:.2f} s (summed over workers)  "
+        f"Write: {stats['write_seconds']:.2f} s  Total: {stats['total_seconds']:.2f} s",
+    ])
+
+
+def synthetic_profiles(count, chunk_size=BATCH_CHUNK_SIZE, seed=0):
+    """
+    Random profiles for benchmarking, in chunks like iter_profiles
+
+    Yields:
+        list: Up to chunk_size (user_id, profile) pairs
+    """
+    rng = random.Random(seed)
+    loan_types = ["Home Loan", "Car Loan", "Personal Loan", "Education Loan"]
+    for offset in range(0, count, chunk_size):
+        chunk = []
+        for number in range(offset, min(offset + chunk_size, count)):
+            income = rng.randrange(20_000, 300_000, 1000)
+            chunk.append((f"user{number}", {
+                "monthly_income": income,
+                "monthly_expense": rng.randrange(10_000, income + 1, 1000),
+                "credit_score": rng.randint(300, 900),
+                "num_credit_cards": rng.randint(0, 5),
+                "credit_utilization": rng.randint(0, 100),
+                "current_loans": [
+                    {"type": rng.choice(loan_types), "amount": rng.randrange(50_000, 5_000_000, 10_000),
+                     "emi": rng.randrange(1000, 60_000, 500)}
+                    for _ in range(rng.randint(0, 4))
+                ],
+            }))
+        yield chunk
+
+
+def benchmark(profiles=10_000, workers=None, chunk_size=BATCH_CHUNK_SIZE, archive=True):
+    """
+    Time rendering statements for synthetic profiles into a temporary output
+
+    Args:
+        profiles: Number of synthetic profiles
+        workers: Worker processes (defaults to the CPU count)
+        chunk_size: Profiles per chunk
+        archive: Write one zip archive instead of per-user files
+
+    Returns:
+        dict: run_report_batch stats
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        output = ArchiveOutput(os.path.join(directory, "reports.zip")) if archive else DirectoryOutput(directory)
+        stats = run_report_batch(output, synthetic_profiles(profiles, chunk_size), chunk_size=chunk_size,
+                                 workers=workers)
+    print(format_report(stats))
+    return stats
+
+
+def main(argv=None):
+    """Command line entry point: python -m utils.report_batch"""
+    parser = argparse.ArgumentParser(prog="python -m utils.report_batch",
+                                     description="Generate the monthly report of every stored profile")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--output", help="Directory to write one PDF per user into")
+    target.add_argument("--archive", help="Zip file to write every PDF into")
+    target.add_argument("--benchmark", type=int, metavar="PROFILES",
+                        help="Render this many synthetic profiles to a temporary output and report throughput")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--quiet", action="store_true", help="Only print the final report")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark(args.benchmark, args.workers, args.chunk_size)
+        return 0
+
+    start = time.perf_counter()
+
+    def progress(stats):
+        print(f"  {stats['reports']:,} reports, {stats['pages']:,} pages "
+              f"({time.perf_counter() - start:.1f} s)", flush=True)
+
+    output = ArchiveOutput(args.archive) if args.archive else DirectoryOutput(args.output)
+    stats = run_report_batch(output, chunk_size=args.chunk_size, workers=args.workers,
+                             progress=None if args.quiet else progress)
+    print(format_report(stats))
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from utils.file_writer import atomic_write
+from utils.pdf_generator import REPORT_TEMPLATE_VERSION, REPORTS_DIR
+from utils.records import UserProfile
+
+# Rendered reports, one file per cache key
+REPORT_CACHE_DIR = os.path.join(REPORTS_DIR, "cache")
+
+# Recently used reports are also kept as bytes in memory, up to this size
+REPORT_CACHE_MEMORY_BYTES = 32 * 2 ** 20
+
+# Least recently used reports are deleted once the cache directory holds
+# more than this, and any report unused for REPORT_CACHE_MAX_AGE_DAYS
+REPORT_CACHE_DISK_BYTES = 512 * 2 ** 20
+REPORT_CACHE_MAX_AGE_DAYS = 30
+
+# Profile fields that do not appear in the report
+IGNORED_PROFILE_FIELDS = ("last_updated",)
+
+
+def report_key(profile, generated_on=None, kind="monthly", extra=None):
+    """
+    Cache key of the report for a profile
+
+    A hash of the report kind, the profile content, the report date (printed
+    in the report), any other input of the report and REPORT_TEMPLATE_VERSION,
+    so an unchanged profile maps to the same report for the rest of the day
+    and a template change misses the cache.
+
+    Args:
+        profile: Profile dictionary or UserProfile
+        generated_on: Report date (defaults to today)
+        kind: "monthly" or "annual"
+        extra: Other JSON-serialisable input the report is drawn from (e.g.
+            the annual report's credit scores)
+
+    Returns:
+        str: Hex digest
+    """
+    data = UserProfile.from_dict(profile).to_dict()
+    for field in IGNORED_PROFILE_FIELDS:
+        data.pop(field, None)
+    generated_on = generated_on or datetime.now().date()
+    text = json.dumps([REPORT_TEMPLATE_VERSION, kind, generated_on.isoformat(), data, extra],
+                      sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ReportCache:
+    """
+    Two-tier LRU cache of rendered reports keyed by report_key()
+
+    Reports live as files in the cache directory and the most recently used
+    ones also as bytes in memory. A file's mtime is its last use (touched on
+    every hit), so the least recently used files go first when the
+    directory grows past max_disk_bytes, and files unused for max_age_days
+    go regardless. The file index is read from the directory once and then
+    kept in last-use order with a running total, so eviction only looks at
+    the entries it removes.
+    """
+
+    def __init__(self, cache_dir=REPORT_CACHE_DIR, max_memory_bytes=REPORT_CACHE_MEMORY_BYTES,
+                 max_disk_bytes=REPORT_CACHE_DISK_BYTES, max_age_days=REPORT_CACHE_MAX_AGE_DAYS):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_age_days = max_age_days
+        self._memory = {}
+        self._memory_bytes = 0
+        self._files = None
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evicted": 0}
+
+    def path(self, key):
+        """File a report is stored in"""
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def _index(self):
+        """key -> (size, last used), least recently used first; read from the directory on first use"""
+        if self._files is None:
+            entries = []
+            if os.path.isdir(self.cache_dir):
+                for name in os.listdir(self.cache_dir):
+                    if name.endswith(".pdf"):
+                        try:
+                            stat = os.stat(os.path.join(self.cache_dir, name))
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime, name[:-4], stat.st_size))
+            entries.sort()
+            self._files = {key: (size, used) for used, key, size in entries}
+            self._disk_bytes = sum(size for used, key, size in entries)
+        return self._files
+
+    def _touch(self, key, size, used):
+        """Record a file as used now, moving it to the most recent end"""
+        files = self._index()
+        old = files.pop(key, None)
+        if old is not None:
+            self._disk_bytes -= old[0]
+        files[key] = (size, used)
+        self._disk_bytes += size
+
+    def _forget(self, key):
+        old = self._index().pop(key, None)
+        if old is not None:
+            self._disk_bytes -= old[0]
+
+    def _remember(self, key, data):
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        if len(data) > self.max_memory_bytes:
+            return
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            oldest = next(iter(self._memory))
+            self._memory_bytes -= len(self._memory.pop(oldest))
+
+    def get(self, key):
+        """
+        Get a cached report
+
+        Returns:
+            bytes: The PDF, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            files = self._index()
+            data = self._memory.pop(key, None)
+            if data is not None:
+                self._memory[key] = data
+                self.stats["memory_hits"] += 1
+            if key in files:
+                self._touch(key, files[key][0], now)
+            elif data is None:
+                self.stats["misses"] += 1
+                return None
+        try:
+            if data is None:
+                with open(self.path(key), 'rb') as f:
+                    data = f.read()
+                with self._lock:
+                    self._remember(key, data)
+                    self.stats["disk_hits"] += 1
+            # Touched so the file counts as recently used for eviction
+            os.utime(self.path(key), (now, now))
+        except OSError:
+            # Deleted by another process; the memory copy (if any) is still good
+            with self._lock:
+                self._forget(key)
+                if data is None:
+                    self.stats["misses"] += 1
+        return data
+
+    def put(self, key, data):
+        """Store a rendered report and evict what no longer fits"""
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir, exist_ok=True)
+        atomic_write(self.path(key), data)
+        with self._lock:
+            self._remember(key, data)
+            self._touch(key, len(data), time.time())
+            self._evict()
+
+    def _evict(self):
+        files = self._index()
+        cutoff = time.time() - self.max_age_days * 86400
+        total = self._disk_bytes
+        drop = []
+        # Oldest first, so stop at the first file that is recent enough and fits
+        for key, (size, used) in files.items():
+            if used >= cutoff and total <= self.max_disk_bytes:
+                break
+            drop.append(key)
+            total -= size
+        for key in drop:
+            self._forget(key)
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old)
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+        self.stats["evicted"] += len(drop)
+
+    def evict(self):
+        """Apply the size and age limits now (e.g. from a cleanup job)"""
+        with self._lock:
+            self._evict()
+
+    def get_or_render(self, profile, render):
+        """
+        Get the report for a profile from the cache, rendering it on a miss
+
+        Args:
+            profile: Profile dictionary or UserProfile
+            render: Function taking the profile and returning PDF bytes
+
+        Returns:
+            tuple: (key, PDF bytes)
+        """
+        key = report_key(profile)
+        data = self.get(key)
+        if data is None:
+            data = render(profile)
+            self.put(key, data)
+        return key, data
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_report_cache():
+    """Get the process-wide report cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ReportCache()
+        return _cache
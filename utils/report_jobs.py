@@ -0,0 +1,211 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+
+from utils.annual_report import render_annual_report
+from utils.data_handler import resolve_user_id
+from utils.pdf_generator import render_monthly_report
+from utils.report_cache import get_report_cache, report_key
+
+# Reports rendered at once; further requests wait in the queue, so a burst
+# of clicks never runs more than this many renders next to the UI
+REPORT_WORKERS = int(os.environ.get("CREDO_REPORT_WORKERS", "1"))
+
+# Jobs waiting or running before new requests are turned away
+MAX_PENDING_REPORT_JOBS = 32
+
+# Finished jobs kept for status polling (oldest are forgotten first)
+MAX_FINISHED_REPORT_JOBS = 256
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+# Error of a queued job replaced by a newer request of the same user and kind
+SUPERSEDED = "Superseded by a newer request"
+
+
+class ReportQueue:
+    """
+    Background PDF rendering with job ids and status polling
+
+    Requests are queued to a small thread pool and return a job id at once;
+    the page polls get() until the job is done and then offers the PDF from
+    the report cache. A request whose report is already cached is done at
+    once without rendering, and a request for a report already queued or
+    running (same cache key, i.e. same profile contents) gets that job back
+    instead of a second one. A new request for different data supersedes
+    the user's queued job of the same kind, which then never renders.
+    """
+
+    def __init__(self, workers=REPORT_WORKERS, max_pending=MAX_PENDING_REPORT_JOBS, cache=None):
+        self.max_pending = max_pending
+        self.cache = cache or get_report_cache()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="report")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, profile, user_id=None, render=render_monthly_report, kind="monthly", key=None):
+        """
+        Queue a report for a profile
+
+        Args:
+            profile: Profile dictionary or UserProfile to report on
+            user_id: User the report is for
+            render: Function taking the profile and returning PDF bytes
+            kind: Report kind, "monthly" or "annual"
+            key: Cache key of the report (defaults to report_key(profile, kind=kind))
+
+        Returns:
+            str: Job id, or None if too many reports are already pending
+        """
+        user_id = resolve_user_id(user_id)
+        key = key or report_key(profile, kind=kind)
+        cached = self.cache.get(key) is not None
+        with self._lock:
+            pending = [job for job in self._jobs.values() if job["status"] in (QUEUED, RUNNING)]
+            if not cached:
+                for job in pending:
+                    if job["key"] == key:
+                        return job["id"]
+            # A queued report of older data is no longer wanted (one already
+            # running finishes, and its PDF is only cached under its own key)
+            for job in list(pending):
+                if (job["user_id"], job["kind"]) == (user_id, kind) and job["status"] == QUEUED:
+                    job.update(status=FAILED, error=SUPERSEDED, finished=time.time())
+                    pending.remove(job)
+            if not cached:
+                if len(pending) >= self.max_pending:
+                    print(f"Report queue is full ({len(pending)} pending); try again shortly")
+                    return None
+
+            job_id = uuid.uuid4().hex[:12]
+            now = time.time()
+            job = {
+                "id": job_id,
+                "user_id": user_id,
+                "kind": kind,
+                "key": key,
+                "status": DONE if cached else QUEUED,
+                "cached": cached,
+                "path": self.cache.path(key),
+                "filename": f"{kind}_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                "error": None,
+                "submitted": now,
+                "started": now if cached else None,
+                "finished": now if cached else None,
+            }
+            self._jobs[job_id] = job
+            self._forget_finished()
+        if not cached:
+            self._executor.submit(self._run, job_id, profile, render)
+        return job_id
+
+    def _run(self, job_id, profile, render):
+        with self._lock:
+            job = self._jobs[job_id]
+            if job["status"] != QUEUED:
+                return
+            job.update(status=RUNNING, started=time.time())
+            key = job["key"]
+        try:
+            self.cache.put(key, render(profile))
+            update = {"status": DONE}
+        except Exception as e:
+            print(f"Error generating report {job_id}: {e}")
+            update = {"status": FAILED, "error": str(e)}
+        with self._lock:
+            job.update(update, finished=time.time())
+
+    def _forget_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in (DONE, FAILED)]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_REPORT_JOBS)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        """
+        Get a job's current state
+
+        Returns:
+            dict: id, user_id, kind, cache key, status ("queued", "running",
+            "done" or "failed"), cached (served without rendering), path
+            of the cached file, download filename, error and
+            submitted/started/finished times; None for an unknown job
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def pdf(self, job_id):
+        """
+        Get the PDF of a finished job
+
+        Returns:
+            bytes: The report, or None if the job is unknown, not done, or
+            its report has since been evicted from the cache
+        """
+        job = self.get(job_id)
+        if job is None or job["status"] != DONE:
+            return None
+        return self.cache.get(job["key"])
+
+    def wait(self, job_id, timeout=None, interval=0.05):
+        """Block until a job finishes (for scripts); returns its state, or None on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] in (DONE, FAILED):
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(interval)
+
+    def pending_count(self):
+        """Number of jobs queued or running"""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job["status"] in (QUEUED, RUNNING))
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_report_queue():
+    """Get the process-wide report queue, starting it on first use"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ReportQueue()
+        return _queue
+
+
+def submit_report(profile, user_id=None):
+    """Queue a monthly report; returns the job id, or None if the queue is full"""
+    return get_report_queue().submit(profile, user_id)
+
+
+def submit_annual_report(profile, score_points=None, user_id=None):
+    """
+    Queue an annual report; returns the job id, or None if the queue is full
+
+    Args:
+        profile: Profile dictionary or UserProfile to report on
+        score_points: (timestamps, scores) of the year, e.g. from year_score_points()
+        user_id: User the report is for
+    """
+    extra = [list(map(int, score_points[0])), list(map(float, score_points[1]))] if score_points is not None else None
+    return get_report_queue().submit(
+        profile, user_id, render=partial(render_annual_report, score_points=score_points),
+        kind="annual", key=report_key(profile, kind="annual", extra=extra))
+
+
+def get_report_job(job_id):
+    """Get the state of a report job (see ReportQueue.get)"""
+    return get_report_queue().get(job_id)
+
+
+def get_report_pdf(job_id):
+    """Get the PDF bytes of a finished report job (see ReportQueue.pdf)"""
+    return get_report_queue().pdf(job_id)
@@ -0,0 +1,347 @@
+import json
+import os
+
+import numpy as np
+
+from utils.file_writer import atomic_write, file_lock
+
+# Number of observations the rolling aggregates cover
+ROLLING_WINDOW = 30
+
+# Columns of the rolling aggregate array
+ROLLING_COLUMNS = ["mean", "min", "max", "std"]
+
+INITIAL_CAPACITY = 64
+
+# Most points a chart is given; longer ranges are downsampled
+CHART_MAX_POINTS = 1000
+
+
+def parse_timestamp(value):
+    """
+    Convert an ISO date string to int64 microseconds since the epoch
+
+    Returns:
+        int or None: Timestamp, or None if the date cannot be parsed
+    """
+    try:
+        return int(np.datetime64(str(value).replace('Z', ''), 'us').astype(np.int64))
+    except (ValueError, TypeError):
+        return None
+
+
+def to_datetimes(timestamps):
+    """Convert int64 microsecond timestamps to numpy datetimes"""
+    return np.asarray(timestamps, dtype=np.int64).astype('datetime64[us]')
+
+
+def _window_stats(window):
+    return window.mean(), window.min(), window.max(), window.std()
+
+
+class ScoreSeries:
+    """
+    Columnar, memory-mapped store of credit score observations
+
+    Timestamps (int64 microseconds) and scores live in separate .npy files
+    kept sorted by time, preallocated with spare capacity so appends write one
+    slot instead of rewriting the arrays. A third array holds the rolling
+    mean/min/max/std over the last ROLLING_WINDOW observations, filled in for
+    each new point as it is appended.
+
+    meta.json holds the count and the generation of the array files. Growing
+    or rebuilding writes a new generation and then replaces meta.json, so a
+    file another session or process has mapped is never truncated; it is only
+    unlinked, and its mapping stays valid. Appends and rebuilds hold a file
+    lock on the directory and first catch up with what other writers did.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.count = 0
+        self.window = ROLLING_WINDOW
+        self.generation = None
+        self._timestamps = None
+        self._scores = None
+        self._rolling = None
+        if os.path.exists(self.meta_path):
+            self._open()
+
+    def exists(self):
+        return os.path.exists(self.meta_path)
+
+    def _path(self, name, generation):
+        # Generation 0 is the layout before generations were numbered
+        suffix = f".{generation}" if generation else ""
+        return os.path.join(self.directory, f"{name}{suffix}.npy")
+
+    def _read_meta(self):
+        with open(self.meta_path, 'r') as f:
+            return json.load(f)
+
+    def _open(self, attempts=3):
+        for attempt in range(attempts):
+            meta = self._read_meta()
+            generation = meta.get("generation", 0)
+            try:
+                if generation != self.generation:
+                    timestamps = np.load(self._path("timestamps", generation), mmap_mode='r+')
+                    scores = np.load(self._path("scores", generation), mmap_mode='r+')
+                    rolling = np.load(self._path("rolling", generation), mmap_mode='r+')
+                    self._timestamps, self._scores, self._rolling = timestamps, scores, rolling
+                    self.generation = generation
+            except FileNotFoundError:
+                # A writer published a newer generation between reading meta
+                # and opening the files; read meta again
+                if attempt == attempts - 1:
+                    raise
+                continue
+            self.count = meta.get("count", 0)
+            self.window = meta.get("window", ROLLING_WINDOW)
+            return
+
+    def _lock(self):
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory, exist_ok=True)
+        return file_lock(os.path.join(self.directory, "series"))
+
+    def _write_meta(self):
+        atomic_write(self.meta_path, json.dumps(
+            {"count": self.count, "window": self.window, "generation": self.generation}))
+
+    def _allocate(self, capacity):
+        """
+        Create memory-mapped arrays with room for `capacity` points as the
+        next generation; they are used by others once _write_meta runs
+        """
+        self._flush()
+        generation = (self.generation or 0) + 1
+        # Left over by a writer that crashed before publishing it
+        for name in ("timestamps", "scores", "rolling"):
+            if os.path.exists(self._path(name, generation)):
+                os.remove(self._path(name, generation))
+        self._timestamps = np.lib.format.open_memmap(
+            self._path("timestamps", generation), mode='w+', dtype=np.int64, shape=(capacity,))
+        self._scores = np.lib.format.open_memmap(
+            self._path("scores", generation), mode='w+', dtype=np.float64, shape=(capacity,))
+        self._rolling = np.lib.format.open_memmap(
+            self._path("rolling", generation), mode='w+', dtype=np.float64,
+            shape=(capacity, len(ROLLING_COLUMNS)))
+        self.generation = generation
+
+    def _remove_old_generations(self):
+        """Unlink array files of earlier generations (mappings of them stay valid)"""
+        current = {os.path.basename(self._path(name, self.generation)) for name in ("timestamps", "scores", "rolling")}
+        for name in os.listdir(self.directory):
+            if name.endswith(".npy") and name not in current:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def _flush(self):
+        for array in (self._timestamps, self._scores, self._rolling):
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def rebuild(self, timestamps, scores):
+        """
+        Replace the whole series
+
+        Args:
+            timestamps: Iterable of int64 microsecond timestamps
+            scores: Iterable of scores, same length as timestamps
+        """
+        with self._lock():
+            if os.path.exists(self.meta_path):
+                self._open()
+            self._rebuild(timestamps, scores)
+
+    def _rebuild(self, timestamps, scores):
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.float64)
+        order = np.argsort(timestamps, kind='stable')
+        timestamps = timestamps[order]
+        scores = scores[order]
+
+        count = len(timestamps)
+        self._allocate(max(INITIAL_CAPACITY, 1 << max(count - 1, 0).bit_length()))
+        self._timestamps[:count] = timestamps
+        self._scores[:count] = scores
+        self._rolling[:count] = self._rolling_aggregates(scores)
+        self.count = count
+        self._flush()
+        self._write_meta()
+        self._remove_old_generations()
+
+    def _rolling_aggregates(self, scores):
+        """Rolling mean/min/max/std for every position of a score array"""
+        count = len(scores)
+        result = np.empty((count, len(ROLLING_COLUMNS)))
+        if count == 0:
+            return result
+
+        # Mean and std from running sums; window length grows to ROLLING_WINDOW
+        positions = np.arange(count)
+        lengths = np.minimum(positions + 1, self.window)
+        sums = np.concatenate([[0.0], np.cumsum(scores)])
+        squares = np.concatenate([[0.0], np.cumsum(scores * scores)])
+        window_sums = sums[positions + 1] - sums[positions + 1 - lengths]
+        window_squares = squares[positions + 1] - squares[positions + 1 - lengths]
+        result[:, 0] = window_sums / lengths
+        result[:, 3] = np.sqrt(np.maximum(window_squares / lengths - result[:, 0] ** 2, 0))
+
+        # Min and max: growing windows at the start, then full sliding windows
+        head = min(count, self.window - 1)
+        result[:head, 1] = np.minimum.accumulate(scores[:head])
+        result[:head, 2] = np.maximum.accumulate(scores[:head])
+        if count >= self.window:
+            windows = np.lib.stride_tricks.sliding_window_view(scores, self.window)
+            result[head:, 1] = windows.min(axis=1)
+            result[head:, 2] = windows.max(axis=1)
+        return result
+
+    def append(self, timestamp, score):
+        """
+        Add one observation
+
+        In-order appends (the normal case) write one slot of each array and
+        compute the new rolling aggregates from the last ROLLING_WINDOW
+        points. An out-of-order timestamp falls back to a full rebuild.
+        A full series grows into a new generation of files. Nothing is
+        written if the series was dropped in the meantime.
+        """
+        with self._lock():
+            if not self.exists():
+                return
+            self._open()
+            self._append(timestamp, score)
+
+    def drop(self):
+        """Mark the series stale so the next load rebuilds it"""
+        with self._lock():
+            if os.path.exists(self.meta_path):
+                os.remove(self.meta_path)
+
+    def _append(self, timestamp, score):
+        if self.count and timestamp < self._timestamps[self.count - 1]:
+            timestamps, scores = self.range()
+            self._rebuild(np.append(timestamps, timestamp), np.append(scores, score))
+            return
+
+        if self._timestamps is None or self.count >= len(self._timestamps):
+            old = (self._timestamps, self._scores, self._rolling)
+            self._allocate(max(INITIAL_CAPACITY, 2 * self.count))
+            if self.count:
+                self._timestamps[:self.count] = old[0][:self.count]
+                self._scores[:self.count] = old[1][:self.count]
+                self._rolling[:self.count] = old[2][:self.count]
+            grown = True
+        else:
+            grown = False
+
+        index = self.count
+        self._timestamps[index] = timestamp
+        self._scores[index] = score
+        window = self._scores[max(0, index - self.window + 1):index + 1]
+        self._rolling[index] = _window_stats(window)
+        self.count += 1
+        # The arrays are written back by the OS page cache; only the count
+        # has to land atomically, and the series can be rebuilt from history
+        if grown:
+            self._flush()
+        self._write_meta()
+        if grown:
+            self._remove_old_generations()
+
+    def last_timestamp(self):
+        return int(self._timestamps[self.count - 1]) if self.count else None
+
+    def _bounds(self, start=None, end=None):
+        """Binary-search the slice of points with start <= timestamp < end"""
+        timestamps = self._timestamps[:self.count]
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        hi = self.count if end is None else int(np.searchsorted(timestamps, end, side='left'))
+        return lo, max(lo, hi)
+
+    def range(self, start=None, end=None):
+        """
+        Get the observations between two timestamps
+
+        Args:
+            start: First timestamp to include (None for the beginning)
+            end: Timestamp to stop before (None for the end)
+
+        Returns:
+            tuple: (timestamps, scores) arrays, views onto the memory map
+        """
+        if not self.count:
+            return np.empty(0, np.int64), np.empty(0)
+        lo, hi = self._bounds(start, end)
+        return self._timestamps[lo:hi], self._scores[lo:hi]
+
+    def rolling(self, start=None, end=None):
+        """
+        Get the precomputed rolling aggregates between two timestamps
+
+        Returns:
+            tuple: (timestamps, aggregates) where aggregates has ROLLING_COLUMNS
+        """
+        if not self.count:
+            return np.empty(0, np.int64), np.empty((0, len(ROLLING_COLUMNS)))
+        lo, hi = self._bounds(start, end)
+        return self._timestamps[lo:hi], self._rolling[lo:hi]
+
+    def downsample(self, max_points, start=None, end=None):
+        """
+        Reduce a range to at most `max_points` points for charting
+
+        The range is split into max_points // 2 buckets of equal point count and
+        each bucket keeps its lowest and highest score (in time order), so
+        spikes and dips survive however many points are dropped.
+
+        Returns:
+            tuple: (timestamps, scores) arrays
+        """
+        timestamps, scores = self.range(start, end)
+        count = len(timestamps)
+        if count <= max_points or max_points < 2:
+            return np.array(timestamps), np.array(scores)
+
+        buckets = max_points // 2
+        size = -(-count // buckets)
+        # Pad the last bucket by repeating the final score; a pick that lands
+        # in the padding is clipped back to the final point itself
+        padded = np.empty(buckets * size)
+        padded[:count] = scores
+        padded[count:] = scores[-1]
+        grid = padded.reshape(buckets, size)
+        offsets = np.arange(buckets) * size
+        keep = np.concatenate([offsets + grid.argmin(axis=1), offsets + grid.argmax(axis=1)])
+        keep = np.unique(np.minimum(keep, count - 1))
+        return np.array(timestamps[keep]), np.array(scores[keep])
+
+    def stats(self):
+        """
+        Summary statistics over the whole series
+
+        Returns:
+            dict: count, first, last, mean, min, max and std of the scores
+        """
+        if not self.count:
+            return {"count": 0}
+        scores = self._scores[:self.count]
+        return {
+            "count": self.count,
+            "first": float(scores[0]),
+            "last": float(scores[-1]),
+            "mean": float(scores.mean()),
+            "min": float(scores.min()),
+            "max": float(scores.max()),
+            "std": float(scores.std(ddof=1)) if self.count > 1 else 0.0,
+        }
+
+    def changes(self):
+        """Score change between each consecutive pair of observations"""
+        return np.diff(self._scores[:self.count]) if self.count > 1 else np.empty(0)
@@ -0,0 +1,317 @@
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+# Format used for saves: "json" (default) or "binary". Loads detect the
+# format of each file, so the setting can change on an existing data directory
+DATA_FORMAT = os.environ.get("CREDO_DATA_FORMAT", "json")
+
+# First bytes of every binary file. A NUL byte never starts a JSON document,
+# so files of both formats can share a name and be told apart on load
+BINARY_MAGIC = b"\x00CREDO\x01\n"
+
+# Buffers in a binary file start on multiples of this many bytes, so numpy
+# can read them in place
+ALIGNMENT = 8
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+# Text columns with at most this fraction of distinct values are stored as
+# one copy of each distinct string plus an int32 code per row
+CATEGORY_RATIO = 0.5
+
+# numpy dtype of each fixed-width column kind
+KIND_DTYPES = {"int": "<i8", "float": "<f8", "bool": "?"}
+
+
+class JSONSerializer:
+    """Pretty-printed JSON, the original format of the data files"""
+
+    name = "json"
+
+    def dumps(self, data):
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
+    def loads(self, raw):
+        return json.loads(raw)
+
+
+def _column_kind(values):
+    """Pick the narrowest column kind that stores every value unchanged"""
+    types = {type(value) for value in values}
+    if types == {int}:
+        if INT64_MIN <= min(values) and max(values) <= INT64_MAX:
+            return "int"
+    elif types == {float}:
+        return "float"
+    elif types == {bool}:
+        return "bool"
+    elif types == {str}:
+        return "text"
+    return "json"
+
+
+def _encode_text(values):
+    """Encode strings as one UTF-8 blob plus end offsets"""
+    encoded = [value.encode('utf-8') for value in values]
+    ends = np.cumsum([len(value) for value in encoded], dtype=np.int64) if encoded else np.empty(0, np.int64)
+    return ends.astype('<i8').tobytes() + b"".join(encoded)
+
+
+def _decode_text(buffer, count):
+    ends = np.frombuffer(buffer, dtype='<i8', count=count).tolist()
+    blob = bytes(buffer[count * 8:])
+    text = blob.decode('utf-8')
+    # ASCII-only text (the common case) can be sliced as a str directly
+    source = text if len(text) == len(blob) else blob
+    starts = [0] + ends[:-1]
+    values = [source[start:end] for start, end in zip(starts, ends)]
+    if source is blob:
+        values = [value.decode('utf-8') for value in values]
+    return values
+
+
+def _encode_column(kind, values):
+    if kind in KIND_DTYPES:
+        return np.array(values, dtype=KIND_DTYPES[kind]).tobytes()
+    if kind == "text":
+        return _encode_text(values)
+    return json.dumps(values, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _decode_column(kind, buffer, count):
+    if kind in KIND_DTYPES:
+        return np.frombuffer(buffer, dtype=KIND_DTYPES[kind], count=count).tolist()
+    if kind == "text":
+        return _decode_text(buffer, count)
+    return json.loads(bytes(buffer))
+
+
+class BinarySerializer:
+    """
+    Compact columnar binary format
+
+    A list of dictionaries (credit history, alerts) is stored column by
+    column: numbers and flags as packed int64/float64/bool arrays, strings as
+    one UTF-8 blob with offsets (or, for repetitive columns such as alert
+    types, each distinct string once plus a code per row), and anything else
+    (None, nested lists, mixed types) as a compact JSON array. Key names are
+    written once instead of once per entry, and loading reads each column
+    with a single numpy call instead of parsing every value. Other data (the
+    profile, an empty list) is small and stored as compact JSON in the header.
+
+    Layout: BINARY_MAGIC, a 4-byte header length, a JSON header listing each
+    column's name, kind and buffers (values, plus a presence mask when some
+    rows lack the key), then the buffers. Round trips are exact: an int stays an int, a missing key stays missing.
+    """
+
+    name = "binary"
+
+    def dumps(self, data):
+        if not (isinstance(data, list) and data and all(isinstance(row, dict) for row in data)):
+            return self._pack({"shape": "value", "value": data}, [])
+        rows = data
+
+        names = {}
+        for row in rows:
+            for name in row:
+                names.setdefault(name, None)
+
+        columns = []
+        buffers = []
+        for name in names:
+            present = [name in row for row in rows]
+            values = [row[name] for row in rows if name in row]
+            kind = _column_kind(values) if values else "json"
+            column = {"name": name, "kind": kind, "count": len(values), "values": len(buffers)}
+            if kind == "text":
+                codes = {}
+                indexes = [codes.setdefault(value, len(codes)) for value in values]
+                if len(codes) <= len(values) * CATEGORY_RATIO:
+                    column.update(kind="category", categories=len(buffers) + 1, category_count=len(codes))
+                    buffers.append(np.array(indexes, dtype='<i4').tobytes())
+                    buffers.append(_encode_text(list(codes)))
+            if column["kind"] != "category":
+                buffers.append(_encode_column(kind, values))
+            if len(values) < len(rows):
+                column["mask"] = len(buffers)
+                buffers.append(np.array(present, dtype=np.bool_).tobytes())
+            columns.append(column)
+
+        return self._pack({"shape": "rows", "count": len(rows), "columns": columns}, buffers)
+
+    def _pack(self, header, buffers):
+        offsets = []
+        position = 0
+        for buffer in buffers:
+            offsets.append([position, len(buffer)])
+            position += -(-len(buffer) // ALIGNMENT) * ALIGNMENT
+        header["buffers"] = offsets
+        header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        prefix = BINARY_MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes
+        prefix += b"\x00" * (-len(prefix) % ALIGNMENT)
+
+        parts = [prefix]
+        for buffer in buffers:
+            parts.append(buffer)
+            parts.append(b"\x00" * (-len(buffer) % ALIGNMENT))
+        return b"".join(parts)
+
+    def loads(self, raw):
+        view = memoryview(raw)
+        start = len(BINARY_MAGIC)
+        (header_size,) = struct.unpack_from('<I', view, start)
+        header = json.loads(bytes(view[start + 4:start + 4 + header_size]))
+        if header["shape"] == "value":
+            return header["value"]
+
+        base = start + 4 + header_size
+        base += -base % ALIGNMENT
+        end = base + max((offset + size for offset, size in header["buffers"]), default=0)
+        if len(view) < end:
+            raise ValueError(f"Truncated binary data: {len(view)} of {end} bytes")
+        buffers = [view[base + offset:base + offset + size] for offset, size in header["buffers"]]
+        count = header["count"]
+
+        names = []
+        columns = []
+        masked = False
+        for column in header["columns"]:
+            if column["kind"] == "category":
+                categories = np.array(_decode_text(buffers[column["categories"]], column["category_count"]),
+                                      dtype=object)
+                codes = np.frombuffer(buffers[column["values"]], dtype='<i4', count=column["count"])
+                values = categories[codes].tolist()
+            else:
+                values = _decode_column(column["kind"], buffers[column["values"]], column["count"])
+            mask = None
+            if "mask" in column:
+                mask = np.frombuffer(buffers[column["mask"]], dtype=np.bool_, count=count).tolist()
+                masked = True
+            names.append(column["name"])
+            columns.append((values, mask))
+
+        if not masked and names:
+            rows = [dict(zip(names, row)) for row in zip(*(values for values, mask in columns))]
+        else:
+            rows = [{} for _ in range(count)]
+            for name, (values, mask) in zip(names, columns):
+                if mask is None:
+                    for row, value in zip(rows, values):
+                        row[name] = value
+                else:
+                    source = iter(values)
+                    for row, present in zip(rows, mask):
+                        if present:
+                            row[name] = next(source)
+
+        return rows
+
+
+SERIALIZERS = {"json": JSONSerializer(), "binary": BinarySerializer()}
+
+
+def get_serializer(name=None):
+    """
+    Get a serializer by name
+
+    Args:
+        name: "json" or "binary" (defaults to DATA_FORMAT)
+
+    Returns:
+        Serializer with dumps(data) and loads(raw) methods
+    """
+    name = name or DATA_FORMAT
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown data format: {name!r} (expected one of {', '.join(SERIALIZERS)})")
+    return SERIALIZERS[name]
+
+
+def detect_format(raw):
+    """Tell which serializer wrote `raw` (bytes) from its first bytes"""
+    return "binary" if raw[:len(BINARY_MAGIC)] == BINARY_MAGIC else "json"
+
+
+def loads(raw):
+    """Parse file contents written by any serializer"""
+    return SERIALIZERS[detect_format(raw)].loads(raw)
+
+
+def dumps(data, name=None):
+    """Serialize data in the configured format (str for JSON, bytes for binary)"""
+    return get_serializer(name).dumps(data)
+
+
+def _sample_data(scale=1):
+    """Profile, credit history and alerts of a typical user, times `scale`"""
+    profile = {
+        "name": "Benchmark User",
+        "birthdate": "1990-01-01",
+        "monthly_income": 85000,
+        "monthly_expense": 42000,
+        "credit_score": 712,
+        "credit_utilization": 34.5,
+        "num_credit_cards": 3,
+        "current_loans": [{"amount": 500000 + 1000 * i, "emi": 12000, "remaining_tenure": 36,
+                           "interest_rate": 10.5} for i in range(3 * scale)],
+        "last_updated": "2026-01-01T10:00:00.000000",
+    }
+    history = [{"date": f"20{10 + i // 365 % 90:02d}-{i % 12 + 1:02d}-{i % 28 + 1:02d}T09:30:00.000000",
+                "credit_score": 600 + (i * 37) % 250,
+                "notes": "Monthly update" if i % 4 else ""} for i in range(120 * scale)]
+    alerts = [{"type": "warning" if i % 3 else "info",
+               "message": f"Credit utilization is {30 + i % 50}%, above the recommended 30%",
+               "priority": ("high", "medium", "low")[i % 3],
+               "timestamp": "2026-01-01T10:00:00.000000",
+               "seen": bool(i % 2)} for i in range(50 * scale)]
+    return {"profile": profile, "history": history, "alerts": alerts}
+
+
+def benchmark(scales=(1, 100), repeat=20):
+    """
+    Compare save time, load time and size of each format
+
+    Sizes at scale 1 match a typical user (3 loans, 10 years of monthly
+    history, 50 alerts); scale 100 multiplies every list by 100.
+
+    Args:
+        scales: Data sizes to measure
+        repeat: Timed runs per measurement (the best is kept)
+
+    Returns:
+        dict: (scale, record, format) -> {"bytes", "save_ms", "load_ms"}
+    """
+    def best(function):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+        return min(times) * 1000
+
+    results = {}
+    for scale in scales:
+        for record, data in _sample_data(scale).items():
+            for name, serializer in SERIALIZERS.items():
+                raw = serializer.dumps(data)
+                raw = raw.encode('utf-8') if isinstance(raw, str) else raw
+                assert loads(raw) == data
+                results[(scale, record, name)] = {
+                    "bytes": len(raw),
+                    "save_ms": best(lambda: serializer.dumps(data)),
+                    "load_ms": best(lambda: loads(raw)),
+                }
+
+    print(f"{'scale':>5} {'record':>8} {'format':>7} {'bytes':>10} {'save ms':>9} {'load ms':>9}")
+    for (scale, record, name), result in results.items():
+        print(f"{scale:>5} {record:>8} {name:>7} {result['bytes']:>10,} "
+              f"{result['save_ms']:>9.3f} {result['load_ms']:>9.3f}")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
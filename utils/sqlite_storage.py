@@ -0,0 +1,547 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from utils.data_handler import StorageBackend, DEFAULT_USER_ID, PROFILE_CHUNK_SIZE
+
+# Most connections a SQLiteStorage keeps open; callers beyond that wait up to
+# POOL_TIMEOUT seconds for one to be returned
+SQLITE_POOL_SIZE = int(os.environ.get("CREDO_SQLITE_POOL_SIZE", "8"))
+POOL_TIMEOUT = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS credit_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    date TEXT,
+    credit_score INTEGER,
+    notes TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_user_date ON credit_history (user_id, date);
+CREATE INDEX IF NOT EXISTS idx_history_user_id ON credit_history (user_id, id);
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    type TEXT,
+    message TEXT,
+    priority TEXT,
+    timestamp TEXT,
+    seen INTEGER NOT NULL DEFAULT 0,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_alerts_user_seen_priority ON alerts (user_id, seen, priority);
+CREATE TABLE IF NOT EXISTS record_versions (
+    user_id TEXT NOT NULL,
+    record TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (user_id, record)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Statements are kept as constants so sqlite3's per-connection statement
+# cache reuses the prepared form on every call
+SELECT_USER_IDS = "SELECT user_id FROM profiles ORDER BY user_id"
+SELECT_PROFILE = "SELECT data FROM profiles WHERE user_id = ?"
+SELECT_PROFILE_PAGE = "SELECT user_id, data FROM profiles WHERE user_id > ? ORDER BY user_id LIMIT ?"
+UPSERT_PROFILE = ("INSERT INTO profiles (user_id, data, updated_at) VALUES (?, ?, ?) "
+                  "ON CONFLICT(user_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at")
+SELECT_HISTORY = "SELECT date, credit_score, notes, extra FROM credit_history WHERE user_id = ? ORDER BY id"
+SELECT_HISTORY_TAIL = ("SELECT date, credit_score, notes, extra FROM credit_history "
+                       "WHERE user_id = ? ORDER BY id DESC LIMIT ?")
+SELECT_HISTORY_RANGE = ("SELECT date, credit_score, notes, extra FROM credit_history "
+                        "WHERE user_id = ? AND date >= ? AND date < ? ORDER BY date")
+DELETE_HISTORY = "DELETE FROM credit_history WHERE user_id = ?"
+INSERT_HISTORY = "INSERT INTO credit_history (user_id, date, credit_score, notes, extra) VALUES (?, ?, ?, ?, ?)"
+SELECT_ALERTS = "SELECT type, message, priority, timestamp, seen, extra FROM alerts WHERE user_id = ? ORDER BY id"
+SELECT_ALERT_ROWS = ("SELECT id, type, message, priority, timestamp, seen, extra FROM alerts "
+                     "WHERE user_id = ? ORDER BY id")
+UPDATE_ALERT_SEEN = "UPDATE alerts SET seen = ? WHERE id = ?"
+DELETE_ALERT = "DELETE FROM alerts WHERE id = ?"
+INSERT_ALERT = ("INSERT INTO alerts (user_id, type, message, priority, timestamp, seen, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)")
+COUNT_UNSEEN_ALERTS = "SELECT COUNT(*) FROM alerts WHERE user_id = ? AND seen = 0"
+SELECT_VERSION = "SELECT version FROM record_versions WHERE user_id = ? AND record = ?"
+BUMP_VERSION = ("INSERT INTO record_versions (user_id, record, version) VALUES (?, ?, 1) "
+                "ON CONFLICT(user_id, record) DO UPDATE SET version = version + 1")
+SELECT_META = "SELECT value FROM meta WHERE key = ?"
+UPSERT_META = "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+
+HISTORY_FIELDS = ("date", "credit_score", "notes")
+ALERT_FIELDS = ("type", "message", "priority", "timestamp", "seen")
+
+
+def _extra(record, fields):
+    """JSON-encode any keys a record has beyond the indexed columns"""
+    extra = {key: value for key, value in record.items() if key not in fields}
+    return json.dumps(extra, ensure_ascii=False) if extra else None
+
+
+def _history_row(row):
+    date, credit_score, notes, extra = row
+    entry = {"date": date, "credit_score": credit_score, "notes": notes}
+    if extra:
+        entry.update(json.loads(extra))
+    return entry
+
+
+def _alert_row(row):
+    alert_type, message, priority, timestamp, seen, extra = row
+    alert = {
+        "type": alert_type,
+        "message": message,
+        "priority": priority,
+        "timestamp": timestamp,
+        "seen": bool(seen)
+    }
+    if extra:
+        alert.update(json.loads(extra))
+    return alert
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Stores the profile, history and alerts in a SQLite database
+
+    The database runs in WAL mode so readers never block the writer. Calls
+    borrow a connection from a bounded pool of at most SQLITE_POOL_SIZE and
+    return it when done, so the number of open connections does not grow
+    with the number of threads (Streamlit runs each session's script on its
+    own thread). Every table is keyed by user_id first, so per-user reads and
+    writes are index lookups regardless of how many users share the database.
+    """
+
+    def __init__(self, db_path, pool_size=None):
+        self.db_path = db_path
+        self.pool_size = pool_size or SQLITE_POOL_SIZE
+        self._pool = queue.LifoQueue()
+        self._pool_lock = threading.Lock()
+        self._opened = 0
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    @property
+    def location(self):
+        return f"sqlite:{os.path.abspath(self.db_path)}"
+
+    def _open(self):
+        # Pooled connections move between threads, but only one uses each at a time
+        conn = sqlite3.connect(self.db_path, timeout=30, cached_statements=256, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """
+        Borrow a pooled connection for one operation
+
+        A new connection is opened while fewer than pool_size exist;
+        otherwise this waits up to POOL_TIMEOUT seconds for one to be
+        returned. A transaction left open is rolled back on return.
+        """
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._pool_lock:
+                if self._opened < self.pool_size:
+                    self._opened += 1
+                    opening = True
+                else:
+                    opening = False
+            if opening:
+                try:
+                    conn = self._open()
+                except Exception:
+                    with self._pool_lock:
+                        self._opened -= 1
+                    raise
+            else:
+                try:
+                    conn = self._pool.get(timeout=POOL_TIMEOUT)
+                except queue.Empty:
+                    raise sqlite3.OperationalError(
+                        f"No database connection free after {POOL_TIMEOUT} s") from None
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put(conn)
+
+    def close(self):
+        """Close the pooled connections that are not in use"""
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+            with self._pool_lock:
+                self._opened -= 1
+
+    def get_meta(self, key):
+        with self._connection() as conn:
+            row = conn.execute(SELECT_META, (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self._connection() as conn, conn:
+            conn.execute(UPSERT_META, (key, value))
+
+    def list_user_ids(self):
+        with self._connection() as conn:
+            return [row[0] for row in conn.execute(SELECT_USER_IDS)]
+
+    def _read_profile(self, conn, user_id):
+        row = conn.execute(SELECT_PROFILE, (user_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def load_user_profile(self, user_id):
+        try:
+            with self._connection() as conn:
+                return self._read_profile(conn, user_id)
+        except Exception as e:
+            print(f"Error loading user profile: {e}")
+            return None
+
+    def _write_profile(self, conn, profile, user_id):
+        conn.execute(UPSERT_PROFILE, (
+            user_id,
+            json.dumps(profile, ensure_ascii=False),
+            profile.get('last_updated')
+        ))
+        conn.execute(BUMP_VERSION, (user_id, "profile"))
+
+    def save_user_profile(self, profile, user_id):
+        try:
+            with self._connection() as conn, conn:
+                self._write_profile(conn, profile, user_id)
+            return True
+        except Exception as e:
+            print(f"Error saving user profile: {e}")
+            return False
+
+    def save_profiles_bulk(self, profiles):
+        try:
+            with self._connection() as conn, conn:
+                for user_id, profile in profiles:
+                    self._write_profile(conn, profile, user_id)
+            return True
+        except Exception as e:
+            print(f"Error saving user profiles: {e}")
+            return False
+
+    def iter_profiles(self, chunk_size=PROFILE_CHUNK_SIZE):
+        # Keyset paging: each page is one short read, so writes made while
+        # the chunks are processed never wait on an open cursor, and no
+        # connection is held between pages
+        last_user_id = ""
+        while True:
+            try:
+                with self._connection() as conn:
+                    rows = conn.execute(SELECT_PROFILE_PAGE, (last_user_id, chunk_size)).fetchall()
+            except Exception as e:
+                print(f"Error loading user profiles: {e}")
+                return
+            if not rows:
+                return
+            yield [(user_id, json.loads(data)) for user_id, data in rows]
+            last_user_id = rows[-1][0]
+
+    def _read_history(self, query, params):
+        with self._connection() as conn:
+            return [_history_row(row) for row in conn.execute(query, params).fetchall()]
+
+    def load_credit_history(self, user_id):
+        try:
+            return self._read_history(SELECT_HISTORY, (user_id,))
+        except Exception as e:
+            print(f"Error loading credit history: {e}")
+            return []
+
+    def tail_credit_history(self, n, user_id):
+        try:
+            return self._read_history(SELECT_HISTORY_TAIL, (user_id, max(n, 0)))[::-1]
+        except Exception as e:
+            print(f"Error loading credit history: {e}")
+            return []
+
+    def load_credit_history_range(self, start, end, user_id):
+        """
+        Load history entries with start <= date < end using the date index
+
+        Args:
+            start: ISO date string (inclusive)
+            end: ISO date string (exclusive)
+            user_id: User whose history to read
+
+        Returns:
+            list: History entries ordered by date
+        """
+        try:
+            return self._read_history(SELECT_HISTORY_RANGE, (user_id, start, end))
+        except Exception as e:
+            print(f"Error loading credit history: {e}")
+            return []
+
+    def _history_params(self, entry, user_id):
+        return (
+            user_id,
+            entry.get('date'),
+            entry.get('credit_score'),
+            entry.get('notes'),
+            _extra(entry, HISTORY_FIELDS)
+        )
+
+    def save_credit_history(self, history, user_id):
+        try:
+            with self._connection() as conn, conn:
+                conn.execute(DELETE_HISTORY, (user_id,))
+                conn.executemany(INSERT_HISTORY, (self._history_params(entry, user_id) for entry in history))
+            return True
+        except Exception as e:
+            print(f"Error saving credit history: {e}")
+            return False
+
+    def append_credit_history(self, entry, user_id):
+        try:
+            with self._connection() as conn, conn:
+                conn.execute(INSERT_HISTORY, self._history_params(entry, user_id))
+            return True
+        except Exception as e:
+            print(f"Error saving credit history: {e}")
+            return False
+
+    def append_credit_history_bulk(self, entries):
+        try:
+            with self._connection() as conn, conn:
+                conn.executemany(INSERT_HISTORY, (self._history_params(entry, user_id) for user_id, entry in entries))
+            return True
+        except Exception as e:
+            print(f"Error saving credit history: {e}")
+            return False
+
+    def _read_alerts(self, conn, user_id):
+        return [_alert_row(row) for row in conn.execute(SELECT_ALERTS, (user_id,))]
+
+    def load_alerts(self, user_id):
+        try:
+            with self._connection() as conn:
+                return self._read_alerts(conn, user_id)
+        except Exception as e:
+            print(f"Error loading alerts: {e}")
+            return []
+
+    def _alert_params(self, alert, user_id):
+        return (
+            user_id,
+            alert.get('type'),
+            alert.get('message'),
+            alert.get('priority'),
+            alert.get('timestamp'),
+            1 if alert.get('seen', False) else 0,
+            _extra(alert, ALERT_FIELDS)
+        )
+
+    def _write_alerts(self, conn, alerts, user_id):
+        """
+        Store a user's alert list by changing only the rows that differ
+
+        Stored rows are matched to the alerts on every column but `seen`, in
+        list order. A matched row is kept (one UPDATE if only `seen` changed),
+        unmatched rows are deleted and new alerts inserted, so marking one
+        alert seen writes one row and adding alerts writes only those. Rows
+        are read in id order, so an alert that moves ahead of one that is
+        kept is reinserted.
+        """
+        stored = {}
+        for row in conn.execute(SELECT_ALERT_ROWS, (user_id,)):
+            stored.setdefault(row[1:5] + row[6:], deque()).append((row[0], row[5]))
+        updates = []
+        inserts = []
+        last_id = 0
+        for alert in alerts:
+            params = self._alert_params(alert, user_id)
+            rows = stored.get(params[1:5] + params[6:])
+            # Inserted rows sort last, so everything after an insert is one too
+            if rows and not inserts and rows[0][0] > last_id:
+                row_id, seen = rows.popleft()
+                last_id = row_id
+                if seen != params[5]:
+                    updates.append((params[5], row_id))
+            else:
+                inserts.append(params)
+        # Rows left unmatched are no longer listed
+        deletes = [(row_id,) for rows in stored.values() for row_id, seen in rows]
+        conn.executemany(DELETE_ALERT, deletes)
+        conn.executemany(UPDATE_ALERT_SEEN, updates)
+        conn.executemany(INSERT_ALERT, inserts)
+        conn.execute(BUMP_VERSION, (user_id, "alerts"))
+
+    def save_alerts(self, alerts, user_id):
+        try:
+            with self._connection() as conn, conn:
+                self._write_alerts(conn, alerts, user_id)
+            return True
+        except Exception as e:
+            print(f"Error saving alerts: {e}")
+            return False
+
+    def update_alerts_bulk(self, updates):
+        results = {}
+        try:
+            with self._connection() as conn, conn:
+                # One write transaction for the whole batch; holding the write
+                # lock throughout means no update can conflict
+                conn.execute("BEGIN IMMEDIATE")
+                for user_id, update in updates:
+                    current = self._read_alerts(conn, user_id)
+                    alerts = update(current)
+                    if alerts is None:
+                        alerts = current
+                    else:
+                        self._write_alerts(conn, alerts, user_id)
+                    row = conn.execute(SELECT_VERSION, (user_id, "alerts")).fetchone()
+                    results[user_id] = (alerts, row[0] if row else None)
+            return results
+        except Exception as e:
+            print(f"Error saving alerts: {e}")
+            return {user_id: (None, None) for user_id, update in updates}
+
+    def load_versioned(self, record, user_id):
+        try:
+            with self._connection() as conn, conn:
+                # One read transaction so the data and version come from the same snapshot
+                conn.execute("BEGIN")
+                row = conn.execute(SELECT_VERSION, (user_id, record)).fetchone()
+                data = self._read_profile(conn, user_id) if record == "profile" else self._read_alerts(conn, user_id)
+            if record == "profile" and data is None:
+                return None, None
+            return data, row[0] if row else None
+        except Exception as e:
+            print(f"Error loading {record}: {e}")
+            return None, None
+
+    def save_if_version(self, record, data, version, user_id):
+        try:
+            with self._connection() as conn, conn:
+                # BEGIN IMMEDIATE takes the write lock before the version is read
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(SELECT_VERSION, (user_id, record)).fetchone()
+                if (row[0] if row else None) != version:
+                    return False
+                if record == "profile":
+                    self._write_profile(conn, data, user_id)
+                else:
+                    self._write_alerts(conn, data, user_id)
+                return conn.execute(SELECT_VERSION, (user_id, record)).fetchone()[0]
+        except Exception as e:
+            print(f"Error saving {record}: {e}")
+            return False
+
+    def record_version(self, record, user_id):
+        try:
+            with self._connection() as conn:
+                row = conn.execute(SELECT_VERSION, (user_id, record)).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            print(f"Error loading {record}: {e}")
+            return None
+
+    def count_unseen_alerts(self, user_id):
+        try:
+            with self._connection() as conn:
+                return conn.execute(COUNT_UNSEEN_ALERTS, (user_id,)).fetchone()[0]
+        except Exception as e:
+            print(f"Error loading alerts: {e}")
+            return 0
+
+
+def _time_per_op(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def benchmark(sizes=(10_000, 1_000_000), work_dir="benchmark_data"):
+    """
+    Compare per-operation cost of the JSON and SQLite backends
+
+    For each size the history and alert tables are filled with that many rows,
+    then appending a history entry, counting unseen alerts and loading the
+    profile are timed on both backends.
+
+    Args:
+        sizes: Row counts to benchmark
+        work_dir: Scratch directory for the generated files
+
+    Returns:
+        list: One result dictionary per (backend, size)
+    """
+    from utils.data_handler import JSONStorage
+
+    profile = {"monthly_income": 50000, "monthly_expense": 30000, "credit_score": 700,
+               "credit_utilization": 30, "num_credit_cards": 1, "current_loans": []}
+    results = []
+
+    for size in sizes:
+        history = [{"date": f"2020-01-01T00:00:{i:08d}", "credit_score": 600 + i % 200, "notes": ""}
+                   for i in range(size)]
+        alerts = [{"type": "info", "message": f"Alert {i}", "priority": "low",
+                   "timestamp": f"2020-01-01T00:00:{i:08d}", "seen": i % 10 != 0}
+                  for i in range(size)]
+
+        size_dir = os.path.join(work_dir, str(size))
+        db_path = os.path.join(size_dir, "bench.db")
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+        backends = [("json", JSONStorage(size_dir)), ("sqlite", SQLiteStorage(db_path))]
+        for name, backend in backends:
+            backend.save_user_profile(profile, DEFAULT_USER_ID)
+            backend.save_credit_history(history, DEFAULT_USER_ID)
+            backend.save_alerts(alerts, DEFAULT_USER_ID)
+            # Whole-file JSON operations are slow at large sizes, so repeat less
+            repeat = 3 if name == "json" else 200
+            entry = {"date": "2030-01-01T00:00:00", "credit_score": 700, "notes": "bench"}
+            results.append({
+                "backend": name,
+                "rows": size,
+                "append_history_ms": _time_per_op(
+                    lambda: backend.append_credit_history(entry, DEFAULT_USER_ID), repeat) * 1000,
+                "count_unseen_alerts_ms": _time_per_op(
+                    lambda: backend.count_unseen_alerts(DEFAULT_USER_ID), repeat) * 1000,
+                "load_profile_ms": _time_per_op(
+                    lambda: backend.load_user_profile(DEFAULT_USER_ID), repeat) * 1000,
+            })
+
+    for result in results:
+        print(f"{result['backend']:>6} {result['rows']:>9,} rows: "
+              f"append history {result['append_history_ms']:9.3f} ms, "
+              f"count unseen alerts {result['count_unseen_alerts_ms']:9.3f} ms, "
+              f"load profile {result['load_profile_ms']:7.3f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()